@@ -160,8 +160,10 @@ class BaseMeta(ABCMeta):
             (key, value) for key, value in namespace.items()
             if isinstance(value, Property))
         for name in list(cls._properties):
-            # Remove items which are no longer properties
-            if name in namespace and not isinstance(namespace[name], Property):
+            # Remove items which are no longer properties, including those
+            # replaced in a base class (e.g. by a mixin's attribute)
+            if not isinstance(inspect.getattr_static(cls, name, None),
+                              Property):
                 del cls._properties[name]
                 continue
             # Optional arguments must follow mandatory
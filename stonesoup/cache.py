@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Caching of predictions made by Stone Soup components.
+
+Predictors and updaters are frequently asked for the same prediction more
+than once, e.g. a hypothesiser predicting a track to the time of each
+detection in a scan. The :func:`prediction_cache` decorator memoises such
+methods per component instance, keyed on the state being predicted and the
+remaining arguments.
+
+Unlike :func:`functools.lru_cache`, states are held by weak reference, so
+entries are discarded as soon as the state (e.g. the last state of a deleted
+track) is no longer referenced elsewhere. The cache is bounded, its eviction
+policy is configurable, and hit/miss/eviction statistics are available:
+
+.. code-block:: python
+
+    predictor = KalmanPredictor(transition_model)
+    predictor.predict.cache.maxsize = 1024
+    prediction = predictor.predict(prior, timestamp=timestamp)
+    print(predictor.predict.cache_info())
+
+    # Model has changed, so cached predictions are no longer valid
+    predictor.predict.cache_clear()
+"""
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class PredictionCache:
+    """Bounded cache of values keyed on a state and hashable arguments.
+
+    States are weakly referenced, and all entries for a state are removed
+    when that state is garbage collected.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries held. `None` for unbounded. Default 128.
+    policy : str, optional
+        Eviction policy once :attr:`maxsize` is reached: ``'lru'`` to evict
+        the least recently used entry, or ``'fifo'`` to evict the oldest
+        entry. Default ``'lru'``.
+    """
+    policies = frozenset({'lru', 'fifo'})
+
+    def __init__(self, maxsize=128, policy='lru'):
+        if policy not in self.policies:
+            raise ValueError("policy must be one of {}".format(
+                ", ".join(sorted(self.policies))))
+        self._lock = threading.RLock()
+        self._policy = policy
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._state_keys = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self):
+        """Maximum number of entries held, or `None` if unbounded"""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    @property
+    def policy(self):
+        """Eviction policy, ``'lru'`` or ``'fifo'``"""
+        return self._policy
+
+    @policy.setter
+    def policy(self, value):
+        if value not in self.policies:
+            raise ValueError("policy must be one of {}".format(
+                ", ".join(sorted(self.policies))))
+        self._policy = value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def info(self):
+        """Cache statistics
+
+        Returns
+        -------
+        : :class:`CacheInfo`
+            Named tuple of hits, misses, evictions, maxsize and currsize.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self._maxsize, len(self._entries))
+
+    def get(self, state, key):
+        """Return cached value for `state` and `key`
+
+        Raises
+        ------
+        KeyError
+            If no value is cached.
+        """
+        with self._lock:
+            try:
+                _, value = self._entries[id(state), key]
+            except KeyError:
+                self.misses += 1
+                raise
+            if self._policy == 'lru':
+                self._entries.move_to_end((id(state), key))
+            self.hits += 1
+            return value
+
+    def put(self, state, key, value):
+        """Cache `value` for `state` and `key`
+
+        Returns
+        -------
+        bool
+            `False` if the state can't be weakly referenced, in which case
+            nothing is cached.
+        """
+        state_id = id(state)
+        try:
+            ref = weakref.ref(state, self._make_callback(state_id))
+        except TypeError:
+            return False
+        with self._lock:
+            self._entries[state_id, key] = (ref, value)
+            self._state_keys.setdefault(state_id, set()).add(key)
+            self._evict()
+        return True
+
+    def invalidate(self, state):
+        """Remove all entries for `state`"""
+        with self._lock:
+            self._remove_state(id(state))
+
+    def clear(self):
+        """Remove all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._state_keys.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def _make_callback(self, state_id):
+        self_ref = weakref.ref(self)
+
+        def callback(_):
+            cache = self_ref()
+            if cache is not None:
+                with cache._lock:
+                    cache._remove_state(state_id)
+        return callback
+
+    def _remove_state(self, state_id):
+        for key in self._state_keys.pop(state_id, ()):
+            self._entries.pop((state_id, key), None)
+
+    def _evict(self):
+        if self._maxsize is None:
+            return
+        while len(self._entries) > max(self._maxsize, 0):
+            (state_id, key), _ = self._entries.popitem(last=False)
+            keys = self._state_keys[state_id]
+            keys.discard(key)
+            if not keys:
+                del self._state_keys[state_id]
+            self.evictions += 1
+
+    def __getstate__(self):
+        # Entries hold weak references and so aren't transferable
+        return {'maxsize': self._maxsize, 'policy': self._policy}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class _CachedMethod:
+    """Descriptor providing a per instance :class:`PredictionCache`"""
+
+    def __init__(self, method, maxsize, policy):
+        self.method = method
+        self.maxsize = maxsize
+        self.policy = policy
+        self.argname = method.__code__.co_varnames[1]
+        self.attrname = "_cache_{}".format(
+            method.__qualname__.replace('.', '_'))
+        update_wrapper(self, method)
+
+    def cache(self, instance):
+        try:
+            return instance.__dict__[self.attrname]
+        except KeyError:
+            return instance.__dict__.setdefault(
+                self.attrname, PredictionCache(self.maxsize, self.policy))
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return _BoundCachedMethod(self, instance)
+
+
+class _BoundCachedMethod:
+    """Cached method bound to an instance"""
+
+    def __init__(self, cached_method, instance):
+        self._cached_method = cached_method
+        self.__self__ = instance
+        self.__func__ = cached_method.method
+        self.__doc__ = cached_method.method.__doc__
+        self.__name__ = cached_method.method.__name__
+
+    @property
+    def cache(self):
+        """The :class:`PredictionCache` for this instance"""
+        return self._cached_method.cache(self.__self__)
+
+    def cache_info(self):
+        """Cache statistics, see :meth:`PredictionCache.info`"""
+        return self.cache.info()
+
+    def cache_clear(self):
+        """Remove all cached entries, e.g. as a model has changed"""
+        self.cache.clear()
+
+    def cache_invalidate(self, state):
+        """Remove cached entries for `state`, e.g. as it has changed"""
+        self.cache.invalidate(state)
+
+    def __call__(self, *args, **kwargs):
+        method = self.__func__
+        if args:
+            state, args = args[0], args[1:]
+        else:
+            state = kwargs.pop(self._cached_method.argname)
+        try:
+            key = (args, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            # Unhashable arguments, so can't be cached
+            return method(self.__self__, state, *args, **kwargs)
+
+        cache = self.cache
+        try:
+            return cache.get(state, key)
+        except KeyError:
+            pass
+        value = method(self.__self__, state, *args, **kwargs)
+        cache.put(state, key, value)
+        return value
+
+
+def prediction_cache(maxsize=128, policy='lru'):
+    """Decorator to cache a method's return value per component instance.
+
+    The first argument of the decorated method (after `self`) is the state
+    the cache is keyed on, which is held by weak reference. All other
+    arguments must be hashable for the result to be cached.
+
+    The decorated method gains :attr:`cache`, :meth:`cache_info`,
+    :meth:`cache_clear` and :meth:`cache_invalidate` when accessed on an
+    instance.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Default maximum number of entries per instance. `None` for unbounded.
+        Default 128.
+    policy : str, optional
+        Default eviction policy, ``'lru'`` or ``'fifo'``. Default ``'lru'``.
+    """
+    if policy not in PredictionCache.policies:
+        raise ValueError("policy must be one of {}".format(
+            ", ".join(sorted(PredictionCache.policies))))
+
+    def decorator(method):
+        return _CachedMethod(method, maxsize, policy)
+    return decorator
@@ -2,6 +2,7 @@
 import itertools
 from abc import abstractmethod
 
+from .executor import SerialExecutor
 from ..base import Base, Property
 from ..types.hypothesis import JointHypothesis
 from ..hypothesiser import Hypothesiser
@@ -32,6 +33,11 @@ class DataAssociator(Base):
             Detections to be associated to tracks.
         timestamp : :class:`datetime.datetime`
             Timestamp to be used for missed detections.
+        hypotheses : dict of :class:`~.Track`: :class:`~.MultipleHypothesis`, \
+        optional
+            Hypotheses already generated for each track, e.g. by
+            :class:`~.ClusterAssociator`, which are used in place of
+            :attr:`hypothesiser`. Default `None`.
 
         Returns
         -------
@@ -40,6 +46,46 @@ class DataAssociator(Base):
         """
         raise NotImplementedError
 
+    def generate_hypotheses(self, tracks, detections, timestamp,
+                            hypothesiser=None, hypotheses=None):
+        """Generate hypotheses for each track with an executor
+
+        Associators declare an ``executor`` property (an :class:`~.Executor`)
+        after their own properties, so as not to change their positional
+        arguments. Where this isn't declared, or is `None`, a
+        :class:`~.SerialExecutor` is used.
+
+        Parameters
+        ----------
+        tracks : set of :class:`~.Track`
+            Tracks to generate hypotheses for.
+        detections : set of :class:`~.Detection`
+            Detections to hypothesise with each track.
+        timestamp : :class:`datetime.datetime`
+            Timestamp to be used for missed detections.
+        hypothesiser : :class:`~.Hypothesiser`, optional
+            Hypothesiser to use. Default `None`, where :attr:`hypothesiser`
+            is used.
+        hypotheses : dict of :class:`~.Track`: \
+        :class:`~.MultipleHypothesis`, optional
+            Hypotheses already generated for each track, which are returned
+            rather than generating them again. Default `None`.
+
+        Returns
+        -------
+        : dict of :class:`~.Track`: :class:`~.MultipleHypothesis`
+            Hypotheses for each track, in the order of `tracks`
+        """
+        if hypotheses is not None:
+            return {track: hypotheses[track] for track in tracks}
+        executor = getattr(self, 'executor', None)
+        if executor is None:
+            executor = SerialExecutor()
+        if hypothesiser is None:
+            hypothesiser = self.hypothesiser
+        return executor.hypothesise(
+            hypothesiser, tracks, detections, timestamp)
+
     @staticmethod
     def isvalid(joint_hypothesis):
         """Determine whether a joint_hypothesis is valid.
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .base import DataAssociator
+from .executor import Executor
+from ..base import Property
+from ..hypothesiser import Hypothesiser
+from ..types.hypothesis import SingleProbabilityHypothesis
+from ..types.multihypothesis import MultipleHypothesis
+
+
+class ClusterAssociator(DataAssociator):
+    """Gating graph clustering associator
+
+    Splits association into independent sub-problems, by forming a bipartite
+    gating graph of tracks and detections from the output of
+    :attr:`hypothesiser`, where a track and detection are linked if there is
+    a hypothesis associating them. Each connected component (cluster) of the
+    graph is then associated independently by :attr:`associator`, and the
+    results merged into a single mapping of tracks to hypotheses. Where
+    :attr:`hypothesiser` is that of :attr:`associator`, the hypotheses used
+    to form the graph are passed on to :attr:`associator`, restricted to
+    each cluster's detections, so they are only generated once.
+
+    As no association is possible between clusters, joint association
+    methods (e.g. :class:`~.GlobalNearestNeighbour` and :class:`~.JPDA`) give
+    equivalent results at far lower cost when targets are well separated.
+
+    Note
+    ----
+    Hypothesisers which hypothesise every detection (e.g.
+    :class:`~.PDAHypothesiser`) will produce a single cluster, unless
+    :attr:`gate_ratio` is set, or a gating :attr:`hypothesiser` (e.g.
+    :class:`~.DistanceHypothesiser` with a finite
+    :attr:`~.DistanceHypothesiser.missed_distance`) is used.
+    """
+
+    associator = Property(
+        DataAssociator,
+        doc="Associator used to associate tracks and detections in each "
+            "cluster")
+    gate_ratio = Property(
+        float,
+        default=None,
+        doc="If set, probability hypotheses whose probability is less than "
+            "this many times less than the probability of missed detection "
+            "don't link a track and detection, as per :class:`~.JPDA`. "
+            "Default `None`, where all hypotheses link.")
+    hypothesiser = Property(
+        Hypothesiser,
+        default=None,
+        doc="Hypothesiser used to generate the gating graph. Default `None`, "
+            "where :attr:`associator`'s hypothesiser is used.")
+    executor = Property(
+        Executor,
+        default=None,
+        doc="Executor used to generate hypotheses for each track, e.g. "
+            ":class:`~.ThreadExecutor` to do so concurrently. Default "
+            "`None`, where :class:`~.SerialExecutor` is used.")
+
+    def associate(self, tracks, detections, time, hypotheses=None):
+        """Associate detections with predicted states.
+
+        Parameters
+        ----------
+        tracks : set of :class:`Track`
+            Current tracked objects
+        detections : set of :class:`Detection`
+            Retrieved measurements
+        time : datetime
+            Detection time to predict to
+        hypotheses : dict of :class:`~.Track`: \
+        :class:`~.MultipleHypothesis`, optional
+            Hypotheses already generated for each track, which are used
+            rather than generating them again. Default `None`.
+
+        Returns
+        -------
+        dict
+            Key value pair of tracks with associated detection
+        """
+        clusters, hypotheses = self._clusters(
+            tracks, detections, time, hypotheses)
+        reuse_hypotheses = self.hypothesiser is None \
+            or self.hypothesiser is self.associator.hypothesiser
+
+        associations = {}
+        for cluster_tracks, cluster_detections in clusters:
+            if reuse_hypotheses:
+                cluster_hypotheses = {
+                    track: MultipleHypothesis([
+                        hypothesis
+                        for hypothesis in hypotheses[track]
+                        if not hypothesis
+                        or hypothesis.measurement in cluster_detections])
+                    for track in cluster_tracks}
+                associations.update(self.associator.associate(
+                    cluster_tracks, cluster_detections, time,
+                    hypotheses=cluster_hypotheses))
+            else:
+                associations.update(self.associator.associate(
+                    cluster_tracks, cluster_detections, time))
+        return associations
+
+    def clusters(self, tracks, detections, time):
+        """Split tracks and detections into independent clusters
+
+        Parameters
+        ----------
+        tracks : set of :class:`Track`
+            Current tracked objects
+        detections : set of :class:`Detection`
+            Retrieved measurements
+        time : datetime
+            Detection time to predict to
+
+        Returns
+        -------
+        list of (set of :class:`Track`, set of :class:`Detection`)
+            Tracks and detections of each cluster. Every track is in one
+            cluster, but detections not linked to any track are omitted.
+        """
+        return self._clusters(tracks, detections, time)[0]
+
+    def _clusters(self, tracks, detections, time, hypotheses=None):
+        """As :meth:`clusters`, also returning the hypotheses of each track
+        used to form the gating graph"""
+        hypothesiser = self.hypothesiser
+        if hypothesiser is None:
+            hypothesiser = self.associator.hypothesiser
+
+        tracks = list(tracks)
+        detections = list(detections)
+        detection_indices = {
+            detection: index
+            for index, detection in enumerate(detections, len(tracks))}
+
+        # Edges of bipartite graph; tracks are nodes 0 to T-1, and detections
+        # nodes T to T+D-1.
+        rows = []
+        columns = []
+        hypotheses = self.generate_hypotheses(
+            tracks, detections, time, hypothesiser, hypotheses)
+        for track_index, track in enumerate(tracks):
+            for hypothesis in self._gated(hypotheses[track]):
+                rows.append(track_index)
+                columns.append(detection_indices[hypothesis.measurement])
+
+        n_nodes = len(tracks) + len(detections)
+        graph = coo_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(n_nodes, n_nodes))
+        n_clusters, labels = connected_components(graph, directed=False)
+
+        clusters = [(set(), set()) for _ in range(n_clusters)]
+        for track, label in zip(tracks, labels):
+            clusters[label][0].add(track)
+        for detection, label in zip(detections, labels[len(tracks):]):
+            clusters[label][1].add(detection)
+        # Detections with no links form clusters with no tracks
+        return [cluster for cluster in clusters if cluster[0]], hypotheses
+
+    def _gated(self, hypotheses):
+        """Hypotheses which link a track to a detection"""
+        hypotheses = list(hypotheses)
+        if self.gate_ratio is not None:
+            missed_probabilities = [
+                hypothesis.probability
+                for hypothesis in hypotheses
+                if not hypothesis
+                and isinstance(hypothesis, SingleProbabilityHypothesis)]
+            if missed_probabilities:
+                missed_gate = max(missed_probabilities) / self.gate_ratio
+                hypotheses = [
+                    hypothesis
+                    for hypothesis in hypotheses
+                    if not isinstance(hypothesis, SingleProbabilityHypothesis)
+                    or hypothesis.probability >= missed_gate]
+        return [hypothesis for hypothesis in hypotheses if hypothesis]
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Executors for generating hypotheses across tracks.
+
+Hypotheses for each track are independent of other tracks, so a data
+associator's :attr:`~.DataAssociator.executor` can generate them
+concurrently. Results are always returned in the order of the tracks
+given, such that association is deterministic regardless of executor.
+
+.. code-block:: python
+
+    data_associator = GlobalNearestNeighbour(
+        hypothesiser, executor=ThreadExecutor(max_workers=8))
+"""
+import concurrent.futures
+import math
+import os
+import threading
+from abc import abstractmethod
+
+from ..base import Base, Property
+
+
+class Executor(Base):
+    """Executor base class
+
+    Generates hypotheses for each of a set of tracks with a
+    :class:`~.Hypothesiser`.
+    """
+
+    @abstractmethod
+    def hypothesise(self, hypothesiser, tracks, detections, timestamp):
+        """Generate hypotheses for each track
+
+        Parameters
+        ----------
+        hypothesiser : :class:`~.Hypothesiser`
+            Hypothesiser used to generate hypotheses
+        tracks : iterable of :class:`~.Track`
+            Tracks to generate hypotheses for
+        detections : set of :class:`~.Detection`
+            Detections to hypothesise with each track
+        timestamp : :class:`datetime.datetime`
+            Timestamp to be used for missed detections
+
+        Returns
+        -------
+        dict
+            Hypotheses for each track, in the order of `tracks`
+        """
+        raise NotImplementedError
+
+
+class SerialExecutor(Executor):
+    """Serial executor
+
+    Generates hypotheses for each track in turn, in the calling thread.
+    """
+
+    def hypothesise(self, hypothesiser, tracks, detections, timestamp):
+        return {
+            track: hypothesiser.hypothesise(track, detections, timestamp)
+            for track in tracks}
+
+
+class _PoolExecutor(Executor):
+    """Base class for executors using a :mod:`concurrent.futures` pool
+
+    The pool is created on first use and reused for subsequent calls, until
+    :meth:`shutdown` is called.
+    """
+
+    max_workers = Property(
+        int,
+        default=None,
+        doc="Maximum number of workers. Default `None`, where the number of "
+            "CPUs is used.")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @abstractmethod
+    def _create_pool(self):
+        raise NotImplementedError
+
+    @property
+    def pool(self):
+        """The :class:`concurrent.futures.Executor` pool of workers"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = self._create_pool()
+            return self._pool
+
+    @property
+    def workers(self):
+        """Number of workers in the pool"""
+        if self.max_workers is not None:
+            return self.max_workers
+        return os.cpu_count() or 1
+
+    def shutdown(self, wait=True):
+        """Shutdown the pool of workers, freeing its resources
+
+        A new pool will be created if the executor is used again.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Pools and locks can't be transferred
+        state['_pool'] = None
+        del state['_pool_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pool_lock = threading.Lock()
+
+
+class ThreadExecutor(_PoolExecutor):
+    """Thread pool executor
+
+    Generates hypotheses for tracks concurrently in a pool of threads. This
+    is suited to hypothesisers whose cost is dominated by NumPy/BLAS
+    operations, which release the GIL. As tracks share the hypothesiser,
+    its predictor and updater's prediction caches are shared too.
+    """
+
+    def _create_pool(self):
+        return concurrent.futures.ThreadPoolExecutor(self.max_workers)
+
+    def hypothesise(self, hypothesiser, tracks, detections, timestamp):
+        tracks = list(tracks)
+        if len(tracks) <= 1:
+            return SerialExecutor().hypothesise(
+                hypothesiser, tracks, detections, timestamp)
+        results = self.pool.map(
+            lambda track: hypothesiser.hypothesise(
+                track, detections, timestamp),
+            tracks)
+        return dict(zip(tracks, results))
+
+
+class ProcessExecutor(_PoolExecutor):
+    """Process pool executor
+
+    Generates hypotheses for chunks of tracks concurrently in a pool of
+    processes, which avoids the GIL at the cost of pickling the
+    hypothesiser, tracks and detections to each worker for each chunk.
+    Hypotheses returned from workers have their measurements replaced with
+    the original detections, such that they can be compared with those
+    passed to the associator. Prediction caches aren't shared between
+    processes.
+    """
+
+    chunksize = Property(
+        int,
+        default=None,
+        doc="Number of tracks sent to a worker at once. Default `None`, "
+            "where tracks are split into four chunks per worker.")
+
+    def _create_pool(self):
+        return concurrent.futures.ProcessPoolExecutor(self.max_workers)
+
+    def hypothesise(self, hypothesiser, tracks, detections, timestamp):
+        tracks = list(tracks)
+        if len(tracks) <= 1:
+            return SerialExecutor().hypothesise(
+                hypothesiser, tracks, detections, timestamp)
+        detections = list(detections)
+
+        chunksize = self.chunksize
+        if chunksize is None:
+            chunksize = math.ceil(len(tracks) / (4 * self.workers))
+        chunks = [tracks[index:index + chunksize]
+                  for index in range(0, len(tracks), chunksize)]
+
+        futures = [
+            self.pool.submit(
+                _hypothesise_chunk, hypothesiser, chunk, detections,
+                timestamp)
+            for chunk in chunks]
+
+        hypotheses = {}
+        for chunk, future in zip(chunks, futures):
+            for track, track_hypotheses in zip(chunk, future.result()):
+                for hypothesis in track_hypotheses:
+                    if hypothesis:
+                        hypothesis.measurement = \
+                            detections[hypothesis.measurement]
+                hypotheses[track] = track_hypotheses
+        return hypotheses
+
+
+def _hypothesise_chunk(hypothesiser, tracks, detections, timestamp):
+    """Generate hypotheses for chunk of tracks in worker process
+
+    Measurements of hypotheses are replaced by their index in `detections`,
+    to be restored to the original detections in the parent process."""
+    detection_indices = {
+        id(detection): index for index, detection in enumerate(detections)}
+    results = []
+    for track in tracks:
+        track_hypotheses = hypothesiser.hypothesise(
+            track, detections, timestamp)
+        for hypothesis in track_hypotheses:
+            if hypothesis:
+                hypothesis.measurement = detection_indices[
+                    id(hypothesis.measurement)]
+        results.append(track_hypotheses)
+    return results
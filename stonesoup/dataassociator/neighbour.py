@@ -1,8 +1,16 @@
 # -*- coding: utf-8 -*-
+from operator import itemgetter
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
 
 from .base import DataAssociator
+from .executor import Executor
 from ..base import Property
 from ..hypothesiser import Hypothesiser
+from ..types.hypothesis import JointHypothesis, SingleDistanceHypothesis, \
+    SingleProbabilityHypothesis
+from ..types.numeric import Probability
 
 
 class NearestNeighbour(DataAssociator):
@@ -10,13 +18,24 @@ class NearestNeighbour(DataAssociator):
 
     Scores and associates detections to a predicted state using the Nearest
     Neighbour method.
+
+    Association is greedy: the best hypothesis over all tracks is taken, and
+    then the best of those remaining whose track and detection haven't been
+    associated, and so on. This is done with a single sort of all hypotheses,
+    in :math:`O(H \\log H)` for :math:`H` hypotheses.
     """
 
     hypothesiser = Property(
         Hypothesiser,
         doc="Generate a set of hypotheses for each prediction-detection pair")
-
-    def associate(self, tracks, detections, time):
+    executor = Property(
+        Executor,
+        default=None,
+        doc="Executor used to generate hypotheses for each track, e.g. "
+            ":class:`~.ThreadExecutor` to do so concurrently. Default "
+            "`None`, where :class:`~.SerialExecutor` is used.")
+
+    def associate(self, tracks, detections, time, hypotheses=None):
         """Associate detections with predicted states.
 
         Parameters
@@ -27,6 +46,10 @@ class NearestNeighbour(DataAssociator):
             Retrieved measurements
         time : datetime
             Detection time to predict to
+        hypotheses : dict of :class:`~.Track`: \
+        :class:`~.MultipleHypothesis`, optional
+            Hypotheses already generated for each track, which are used
+            rather than generating them again. Default `None`.
 
         Returns
         -------
@@ -35,34 +58,36 @@ class NearestNeighbour(DataAssociator):
         """
 
         # Generate a set of hypotheses for each track on each detection
-        hypotheses = {
-            track: self.hypothesiser.hypothesise(track, detections, time)
-            for track in tracks}
+        hypotheses = self.generate_hypotheses(
+            tracks, detections, time, hypotheses=hypotheses)
 
         # Only associate tracks with one or more hypotheses
         associate_tracks = {track
                             for track, track_hypotheses in hypotheses.items()
                             if track_hypotheses}
 
+        # All hypotheses, best first; stable sort, so equal hypotheses keep
+        # the order they were generated in, as with a linear scan for the best
+        candidates = sorted(
+            ((hypothesis, track)
+             for track in associate_tracks
+             for hypothesis in hypotheses[track]),
+            key=itemgetter(0), reverse=True)
+
+        # Greedy association, taking each best remaining hypothesis and
+        # lazily skipping those whose track or measurement is already used
         associations = {}
         associated_measurements = set()
-        while associate_tracks > associations.keys():
-            # Define a 'greedy' association
-            best_hypothesis = None
-            for track in associate_tracks - associations.keys():
-                for hypothesis in hypotheses[track]:
-                    # A measurement may only be associated with a single track
-                    if hypothesis.measurement in associated_measurements:
-                        continue
-                    # best_hypothesis is 'greater than' other
-                    if (best_hypothesis is None
-                            or hypothesis > best_hypothesis):
-                        best_hypothesis = hypothesis
-                        best_hypothesis_track = track
-
-            associations[best_hypothesis_track] = best_hypothesis
-            if best_hypothesis:
-                associated_measurements.add(best_hypothesis.measurement)
+        for hypothesis, track in candidates:
+            if len(associations) == len(associate_tracks):
+                break
+            # A measurement may only be associated with a single track
+            if track in associations \
+                    or hypothesis.measurement in associated_measurements:
+                continue
+            associations[track] = hypothesis
+            if hypothesis:
+                associated_measurements.add(hypothesis.measurement)
 
         return associations
 
@@ -72,13 +97,27 @@ class GlobalNearestNeighbour(DataAssociator):
 
     Scores and associates detections to a predicted state using the Global
     Nearest Neighbour method, assuming a distance-based hypothesis score.
+
+    Rather than enumerating all joint hypotheses, the optimal joint
+    hypothesis is found by solving an assignment problem on a cost matrix of
+    tracks against detections and missed detections, using
+    :func:`scipy.optimize.linear_sum_assignment`. Costs are the hypothesis
+    distance, or negative log probability for probability-based hypotheses,
+    such that the total cost is minimised where the joint hypothesis
+    distance is minimised or probability maximised.
     """
 
     hypothesiser = Property(
         Hypothesiser,
         doc="Generate a set of hypotheses for each prediction-detection pair")
-
-    def associate(self, tracks, detections, time):
+    executor = Property(
+        Executor,
+        default=None,
+        doc="Executor used to generate hypotheses for each track, e.g. "
+            ":class:`~.ThreadExecutor` to do so concurrently. Default "
+            "`None`, where :class:`~.SerialExecutor` is used.")
+
+    def associate(self, tracks, detections, time, hypotheses=None):
         """Associate a set of detections with predicted states.
 
         Parameters
@@ -89,6 +128,10 @@ class GlobalNearestNeighbour(DataAssociator):
             Retrieved measurements
         time : datetime
             Detection time to predict to
+        hypotheses : dict of :class:`~.Track`: \
+        :class:`~.MultipleHypothesis`, optional
+            Hypotheses already generated for each track, which are used
+            rather than generating them again. Default `None`.
 
         Returns
         -------
@@ -97,12 +140,83 @@ class GlobalNearestNeighbour(DataAssociator):
         """
 
         # Generate a set of hypotheses for each track on each detection
-        hypotheses = {
-            track: self.hypothesiser.hypothesise(track, detections, time)
-            for track in tracks}
+        hypotheses = self.generate_hypotheses(
+            tracks, detections, time, hypotheses=hypotheses)
 
-        # Link hypotheses into a set of joint_hypotheses and evaluate
-        joint_hypotheses = self.enumerate_joint_hypotheses(hypotheses)
-        associations = max(joint_hypotheses)
+        return self.optimal_joint_hypothesis(hypotheses)
 
-        return associations
+    @classmethod
+    def optimal_joint_hypothesis(cls, hypotheses):
+        """Find the best joint hypothesis by linear assignment.
+
+        Parameters
+        ----------
+        hypotheses : dict of :class:`~.Track`: :class:`~.MultipleHypothesis`
+            Hypotheses for each track, including missed detections
+
+        Returns
+        -------
+        : :class:`~.JointHypothesis`
+            Joint hypothesis with highest score, mapping each track with one
+            or more valid hypotheses to a hypothesis
+        """
+        tracks = [track for track, track_hypotheses in hypotheses.items()
+                  if track_hypotheses]
+        if not tracks:
+            return JointHypothesis({})
+        detections = list({
+            hypothesis.measurement
+            for track in tracks
+            for hypothesis in hypotheses[track]
+            if hypothesis})
+        detection_columns = {
+            detection: column for column, detection in enumerate(detections)}
+
+        # Columns for each detection, followed by a missed detection column
+        # for each track; NaN where no hypothesis is available.
+        cost_matrix = np.full(
+            (len(tracks), len(detections) + len(tracks)), np.nan)
+        hypothesis_matrix = {}
+        for row, track in enumerate(tracks):
+            for hypothesis in hypotheses[track]:
+                if hypothesis:
+                    column = detection_columns[hypothesis.measurement]
+                else:
+                    column = len(detections) + row
+                cost = cls._hypothesis_cost(hypothesis)
+                if not cost >= cost_matrix[row, column]:  # Also true for NaN
+                    cost_matrix[row, column] = cost
+                    hypothesis_matrix[row, column] = hypothesis
+
+        row_indices, column_indices = linear_sum_assignment(
+            cls._finite_cost_matrix(cost_matrix))
+
+        return JointHypothesis({
+            tracks[row]: hypothesis_matrix[row, column]
+            for row, column in zip(row_indices, column_indices)
+            if (row, column) in hypothesis_matrix})
+
+    @staticmethod
+    def _hypothesis_cost(hypothesis):
+        if isinstance(hypothesis, SingleDistanceHypothesis):
+            return float(hypothesis.distance)
+        elif isinstance(hypothesis, SingleProbabilityHypothesis):
+            return -Probability(hypothesis.probability).log_value
+        else:
+            raise NotImplementedError
+
+    @staticmethod
+    def _finite_cost_matrix(cost_matrix):
+        """Replace infinite and unavailable costs with large finite costs.
+
+        Costs are tiered such that the assignment first minimises the number
+        of unavailable hypotheses, then those with infinite cost (equal
+        joint hypotheses when comparing), and then the sum of finite costs.
+        """
+        finite = np.isfinite(cost_matrix)
+        infinite_cost = 2*np.abs(cost_matrix[finite]).sum() + 1
+        unavailable_cost = 2*(cost_matrix.shape[0] + 1)*infinite_cost
+        cost_matrix = cost_matrix.copy()
+        cost_matrix[np.isposinf(cost_matrix)] = infinite_cost
+        cost_matrix[np.isnan(cost_matrix)] = unavailable_cost
+        return cost_matrix
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
+import heapq
+import itertools
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.special import logsumexp
 
 from .base import DataAssociator
+from .executor import Executor
 from ..base import Property
 from ..hypothesiser import Hypothesiser
 from ..hypothesiser.probability import PDAHypothesiser
@@ -9,7 +16,6 @@ from ..types.hypothesis import (
     SingleProbabilityHypothesis, ProbabilityJointHypothesis)
 from ..types.multihypothesis import MultipleHypothesis
 from ..types.numeric import Probability
-import itertools
 
 
 class SimplePDA(DataAssociator):
@@ -28,8 +34,14 @@ class SimplePDA(DataAssociator):
     hypothesiser = Property(
         Hypothesiser,
         doc="Generate a set of hypotheses for each prediction-detection pair")
-
-    def associate(self, tracks, detections, time):
+    executor = Property(
+        Executor,
+        default=None,
+        doc="Executor used to generate hypotheses for each track, e.g. "
+            ":class:`~.ThreadExecutor` to do so concurrently. Default "
+            "`None`, where :class:`~.SerialExecutor` is used.")
+
+    def associate(self, tracks, detections, time, hypotheses=None):
         """Associate detections with predicted states.
 
         Parameters
@@ -40,6 +52,10 @@ class SimplePDA(DataAssociator):
             Retrieved measurements
         time : datetime
             Detection time to predict to
+        hypotheses : dict of :class:`~.Track`: \
+        :class:`~.MultipleHypothesis`, optional
+            Hypotheses already generated for each track, which are used
+            rather than generating them again. Default `None`.
 
         Returns
         -------
@@ -48,9 +64,8 @@ class SimplePDA(DataAssociator):
         """
 
         # Generate a set of hypotheses for each track on each detection
-        hypotheses = {
-            track: self.hypothesiser.hypothesise(track, detections, time)
-            for track in tracks}
+        hypotheses = self.generate_hypotheses(
+            tracks, detections, time, hypotheses=hypotheses)
 
         return associate_highest_probability_hypotheses(tracks, hypotheses)
 
@@ -71,8 +86,15 @@ class JPDA(DataAssociator):
           \frac{prob_{association(MissedDetection, Track)}}{gate\ ratio}
 
     then Detection is assumed to be outside Track's gate, and the probability
-    of association is dropped from the Gaussian Mixture.  This calculation
-    takes place in the function :meth:`enumerate_JPDA_hypotheses`.
+    of association is dropped from the Gaussian Mixture.
+
+    The marginal association probabilities are calculated from a matrix of
+    track/detection log probabilities, rather than forming each joint
+    hypothesis (as in :meth:`enumerate_JPDA_hypotheses`). By default this is
+    exact, summing over joint hypotheses by recursion over tracks, grouping
+    partial joint hypotheses which use the same detections. Alternatively,
+    if :attr:`k_best` is set, marginals are approximated from the `k` most
+    probable joint hypotheses, found using Murty's algorithm.
     """
 
     hypothesiser = Property(
@@ -84,8 +106,20 @@ class JPDA(DataAssociator):
             "many times less than probability of MissedDetection, treat "
             "probability of association as 0."
     )
-
-    def associate(self, tracks, detections, time):
+    k_best = Property(
+        int,
+        default=None,
+        doc="Number of most probable joint hypotheses used to approximate "
+            "marginal association probabilities. Default `None`, where "
+            "marginal probabilities are calculated exactly.")
+    executor = Property(
+        Executor,
+        default=None,
+        doc="Executor used to generate hypotheses for each track, e.g. "
+            ":class:`~.ThreadExecutor` to do so concurrently. Default "
+            "`None`, where :class:`~.SerialExecutor` is used.")
+
+    def associate(self, tracks, detections, time, hypotheses=None):
         """Associate detections with predicted states.
 
         Parameters
@@ -96,6 +130,10 @@ class JPDA(DataAssociator):
             Retrieved measurements
         time : datetime
             Detection time to predict to
+        hypotheses : dict of :class:`~.Track`: \
+        :class:`~.MultipleHypothesis`, optional
+            Hypotheses already generated for each track, which are used
+            rather than generating them again. Default `None`.
 
         Returns
         -------
@@ -105,52 +143,44 @@ class JPDA(DataAssociator):
 
         # Calculate MultipleHypothesis for each Track over all
         # available Detections
-        hypotheses = {
-            track: self.hypothesiser.hypothesise(track, detections, time)
-            for track in tracks}
-
-        # enumerate the Joint Hypotheses of track/detection associations
-        joint_hypotheses = \
-            self.enumerate_JPDA_hypotheses(tracks, hypotheses, self.gate_ratio)
+        hypotheses = self.generate_hypotheses(
+            tracks, detections, time, hypotheses=hypotheses)
+
+        tracks = list(tracks)
+        detections = list(detections)
+
+        # Marginal log probabilities of missed detection (column 0) and each
+        # detection for each track
+        log_marginals = self.log_probability_matrix(
+            tracks, detections, hypotheses, self.gate_ratio)
+        if self.k_best is None:
+            log_marginals = self.exact_log_marginals(log_marginals)
+        else:
+            log_marginals = self.k_best_log_marginals(
+                log_marginals, self.k_best)
 
         # Calculate MultiMeasurementHypothesis for each Track over all
         # available Detections with probabilities drawn from JointHypotheses
         new_hypotheses = dict()
 
-        for track in tracks:
+        for track, track_log_marginals in zip(tracks, log_marginals):
 
-            single_measurement_hypotheses = list()
+            prediction = hypotheses[track][0].prediction
+            measurement_prediction = \
+                hypotheses[track][0].measurement_prediction
 
-            # record the MissedDetection hypothesis for this track
-            prob_misdetect = Probability.sum(
-                joint_hypothesis.probability
-                for joint_hypothesis in joint_hypotheses
-                if not joint_hypothesis.hypotheses[track].measurement)
-
-            single_measurement_hypotheses.append(
-                SingleProbabilityHypothesis(
-                    hypotheses[track][0].prediction,
-                    MissedDetection(timestamp=time),
-                    measurement_prediction=hypotheses[track][0]
-                    .measurement_prediction,
-                    probability=prob_misdetect))
-
-            # record hypothesis for any given Detection being associated with
+            # record the MissedDetection hypothesis for this track, and
+            # hypothesis for any given Detection being associated with
             # this track
-            for detection in detections:
-                pro_detect_assoc = Probability.sum(
-                    joint_hypothesis.probability
-                    for joint_hypothesis in joint_hypotheses
-                    if joint_hypothesis.
-                    hypotheses[track].measurement is detection)
-
-                single_measurement_hypotheses.append(
-                    SingleProbabilityHypothesis(
-                        hypotheses[track][0].prediction,
-                        detection,
-                        measurement_prediction=hypotheses[track][0].
-                        measurement_prediction,
-                        probability=pro_detect_assoc))
+            single_measurement_hypotheses = [
+                SingleProbabilityHypothesis(
+                    prediction,
+                    measurement,
+                    measurement_prediction=measurement_prediction,
+                    probability=Probability(log_marginal, log_value=True))
+                for measurement, log_marginal in zip(
+                    [MissedDetection(timestamp=time)] + detections,
+                    track_log_marginals)]
 
             result = MultipleHypothesis(single_measurement_hypotheses, True, 1)
 
@@ -158,6 +188,206 @@ class JPDA(DataAssociator):
 
         return new_hypotheses
 
+    @staticmethod
+    def log_probability_matrix(tracks, detections, multihypths, gate_ratio):
+        """Matrix of gated hypothesis log probabilities
+
+        Parameters
+        ----------
+        tracks : list of :class:`~.Track`
+            Tracks, corresponding to rows
+        detections : list of :class:`~.Detection`
+            Detections, corresponding to columns 1 to D
+        multihypths : dict of :class:`~.Track`: :class:`~.MultipleHypothesis`
+            Probability hypotheses for each track
+        gate_ratio : float
+            See :attr:`gate_ratio`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (T, D+1)
+            Log probabilities of missed detection (column 0) and each
+            detection, with `-inf` where association isn't possible.
+        """
+        detection_columns = {
+            detection: column
+            for column, detection in enumerate(detections, 1)}
+        log_probabilities = np.full((len(tracks), len(detections) + 1),
+                                    -np.inf)
+        for row, track in enumerate(tracks):
+            missed_probability = \
+                multihypths[track].get_missed_detection_probability()
+            missed_gate = missed_probability/gate_ratio
+            for hypothesis in multihypths[track]:
+                # Always include missed detection (gate ratio < 1)
+                if not hypothesis:
+                    column = 0
+                elif hypothesis.probability >= missed_gate \
+                        and hypothesis.measurement in detection_columns:
+                    column = detection_columns[hypothesis.measurement]
+                else:
+                    continue
+                log_probabilities[row, column] = \
+                    Probability(hypothesis.probability).log_value
+        return log_probabilities
+
+    @staticmethod
+    def exact_log_marginals(log_probabilities):
+        """Exact marginal association log probabilities
+
+        Sums over all valid joint hypotheses, recursing over tracks and
+        combining partial joint hypotheses which have used the same set of
+        detections, in both a forward and backward pass.
+
+        Parameters
+        ----------
+        log_probabilities : :class:`numpy.ndarray` of shape (T, D+1)
+            Log probabilities of missed detection (column 0) and each
+            detection for each track, as from :meth:`log_probability_matrix`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (T, D+1)
+            Normalised marginal log probabilities
+        """
+        n_tracks = log_probabilities.shape[0]
+        options = [np.flatnonzero(row > -np.inf) for row in log_probabilities]
+
+        def transitions(track, mask):
+            # Columns and resulting sets of used detections (as bit masks)
+            for column in options[track]:
+                if column == 0:
+                    yield column, mask
+                elif not mask >> int(column) & 1:
+                    yield column, mask | 1 << int(column)
+
+        # Log probability sums of partial joint hypotheses up to each track,
+        # by the detections used
+        forward = [{0: 0.}]
+        for track in range(n_tracks):
+            layer = {}
+            for mask, log_sum in forward[track].items():
+                for column, new_mask in transitions(track, mask):
+                    value = log_sum + log_probabilities[track, column]
+                    layer[new_mask] = np.logaddexp(
+                        layer.get(new_mask, -np.inf), value)
+            forward.append(layer)
+
+        # Log probability sums of completing joint hypotheses from each track,
+        # given detections already used
+        backward = [None]*n_tracks + [dict.fromkeys(forward[-1], 0.)]
+        for track in reversed(range(n_tracks)):
+            backward[track] = {
+                mask: logsumexp([
+                    log_probabilities[track, column]
+                    + backward[track + 1][new_mask]
+                    for column, new_mask in transitions(track, mask)]
+                    or [-np.inf])
+                for mask in forward[track]}
+
+        log_marginals = np.full(log_probabilities.shape, -np.inf)
+        for track in range(n_tracks):
+            for mask, log_sum in forward[track].items():
+                for column, new_mask in transitions(track, mask):
+                    log_marginals[track, column] = np.logaddexp(
+                        log_marginals[track, column],
+                        log_sum + log_probabilities[track, column]
+                        + backward[track + 1][new_mask])
+        if n_tracks and backward[0][0] > -np.inf:
+            log_marginals -= backward[0][0]
+        return log_marginals
+
+    @classmethod
+    def k_best_log_marginals(cls, log_probabilities, k):
+        """Approximate marginal association log probabilities
+
+        Sums over the `k` most probable valid joint hypotheses, found using
+        Murty's algorithm.
+
+        Parameters
+        ----------
+        log_probabilities : :class:`numpy.ndarray` of shape (T, D+1)
+            Log probabilities of missed detection (column 0) and each
+            detection for each track, as from :meth:`log_probability_matrix`
+        k : int
+            Number of joint hypotheses
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (T, D+1)
+            Normalised marginal log probabilities
+        """
+        n_tracks, n_columns = log_probabilities.shape
+        n_detections = n_columns - 1
+
+        # Assignment costs of each detection, followed by missed detection
+        # for each track.
+        cost_matrix = np.full((n_tracks, n_detections + n_tracks), np.inf)
+        cost_matrix[:, :n_detections] = -log_probabilities[:, 1:]
+        cost_matrix[np.arange(n_tracks), n_detections + np.arange(n_tracks)] \
+            = -log_probabilities[:, 0]
+
+        log_marginals = np.full(log_probabilities.shape, -np.inf)
+        joint_hypotheses = cls._murty(cost_matrix, k)
+        if not joint_hypotheses:
+            return log_marginals
+        costs, assignments = zip(*joint_hypotheses)
+        log_weights = -np.array(costs)
+        log_weights -= logsumexp(log_weights)
+        for log_weight, columns in zip(log_weights, assignments):
+            # Map assignment columns back to probability matrix columns
+            columns = np.where(columns < n_detections, columns + 1, 0)
+            log_marginals[np.arange(n_tracks), columns] = np.logaddexp(
+                log_marginals[np.arange(n_tracks), columns], log_weight)
+        return log_marginals
+
+    @staticmethod
+    def _murty(cost_matrix, k):
+        """The `k` lowest cost assignments of rows to columns
+
+        Infinite costs are treated as forbidden assignments. Returns list of
+        tuples of total cost and assigned column of each row, lowest cost
+        first.
+        """
+        finite = np.isfinite(cost_matrix)
+        forbidden_cost = 2*np.abs(cost_matrix[finite]).sum() + 1
+
+        def solve(matrix):
+            rows, columns = linear_sum_assignment(
+                np.where(np.isfinite(matrix), matrix, forbidden_cost))
+            costs = matrix[rows, columns]
+            if np.all(np.isfinite(costs)):
+                return costs.sum(), columns
+            return None  # No valid assignment
+
+        solution = solve(cost_matrix)
+        if solution is None:
+            return []
+        counter = itertools.count()  # Tie break, avoiding comparing arrays
+        queue = [(solution[0], next(counter), solution[1], cost_matrix)]
+        solutions = []
+        while queue and len(solutions) < k:
+            cost, _, columns, matrix = heapq.heappop(queue)
+            solutions.append((cost, columns))
+
+            # Partition remaining solutions of this problem: for each row,
+            # forbid this solution's assignment of that row, whilst forcing
+            # the assignments of previous rows.
+            matrix = matrix.copy()
+            for row, column in enumerate(columns):
+                sub_matrix = matrix.copy()
+                sub_matrix[row, column] = np.inf
+                sub_solution = solve(sub_matrix)
+                if sub_solution is not None:
+                    heapq.heappush(queue, (
+                        sub_solution[0], next(counter), sub_solution[1],
+                        sub_matrix))
+                value = matrix[row, column]
+                matrix[row, :] = np.inf
+                matrix[:, column] = np.inf
+                matrix[row, column] = value
+        return solutions
+
     @classmethod
     def enumerate_JPDA_hypotheses(cls, tracks, multihypths, gate_ratio):
 
@@ -254,30 +484,26 @@ def associate_highest_probability_hypotheses(tracks, hypotheses):
     if not tracks or not hypotheses:
         return associations
 
+    # All hypotheses, most probable first; stable sort, so equally probable
+    # hypotheses keep the order they were generated in
+    candidates = sorted(
+        ((hypothesis, track)
+         for track in tracks
+         for hypothesis in hypotheses[track]),
+        key=lambda candidate: candidate[0].probability, reverse=True)
+
+    # Greedy association, taking each most probable remaining hypothesis and
+    # lazily skipping those whose track or measurement is already used
     associated_measurements = set()
-    while tracks > associations.keys():
-        # Define a 'greedy' association
-        highest_probability_hypothesis = None
-
-        for track in tracks - associations.keys():
-            for hypothesis in hypotheses[track]:
-                # A measurement may only be associated with a single track
-                current_probability = hypothesis.probability
-                if hypothesis.measurement in \
-                        associated_measurements:
-                    continue
-                # best_hypothesis is 'greater than' other
-                if (highest_probability_hypothesis is None
-                        or current_probability >
-                        highest_probability_hypothesis.probability):
-                    highest_probability_hypothesis = \
-                        hypothesis
-                    highest_probability_track = track
-
-        associations[highest_probability_track] = \
-            hypotheses[highest_probability_track]
-        if highest_probability_hypothesis:
-            associated_measurements.add(
-                highest_probability_hypothesis.measurement)
+    for hypothesis, track in candidates:
+        if len(associations) == len(tracks):
+            break
+        # A measurement may only be associated with a single track
+        if track in associations \
+                or hypothesis.measurement in associated_measurements:
+            continue
+        associations[track] = hypotheses[track]
+        if hypothesis:
+            associated_measurements.add(hypothesis.measurement)
 
     return associations
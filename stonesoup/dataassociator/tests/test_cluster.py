@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import numpy as np
+import pytest
+
+from ..cluster import ClusterAssociator
+from ..neighbour import GlobalNearestNeighbour
+from ..probability import JPDA
+from ...types.detection import Detection
+from ...types.state import GaussianState
+from ...types.track import Track
+
+
+@pytest.fixture()
+def tracks_detections():
+    timestamp = datetime.datetime.now()
+    tracks = [
+        Track([GaussianState(np.array([[x]]), np.array([[1]]), timestamp)])
+        for x in (0, 3, 100, 200)]
+    detections = [Detection(np.array([[x]]), timestamp)
+                  for x in (1, 5, 101, 300)]
+    return tracks, detections, timestamp
+
+
+def test_clusters(probability_hypothesiser, tracks_detections):
+    tracks, detections, timestamp = tracks_detections
+    associator = ClusterAssociator(
+        JPDA(probability_hypothesiser, 5), gate_ratio=5)
+
+    clusters = associator.clusters(set(tracks), set(detections), timestamp)
+    assert len(clusters) == 3
+    assert ({tracks[0], tracks[1]}, {detections[0], detections[1]}) \
+        in clusters
+    assert ({tracks[2]}, {detections[2]}) in clusters
+    assert ({tracks[3]}, set()) in clusters
+
+    # Without gating, all linked
+    associator = ClusterAssociator(JPDA(probability_hypothesiser, 5))
+    clusters = associator.clusters(set(tracks), set(detections), timestamp)
+    assert clusters == [(set(tracks), set(detections))]
+
+
+def test_cluster_jpda(probability_hypothesiser, tracks_detections):
+    tracks, detections, timestamp = tracks_detections
+    jpda = JPDA(probability_hypothesiser, 5)
+    associator = ClusterAssociator(jpda, gate_ratio=5)
+
+    associations = associator.associate(
+        set(tracks), set(detections), timestamp)
+    full_associations = jpda.associate(
+        set(tracks), set(detections), timestamp)
+
+    assert associations.keys() == set(tracks)
+    for track in tracks:
+        full_probabilities = {
+            hypothesis.measurement: hypothesis.probability
+            for hypothesis in full_associations[track]}
+        probabilities = {
+            hypothesis.measurement: hypothesis.probability
+            for hypothesis in associations[track]}
+        for measurement, probability in full_probabilities.items():
+            if measurement:
+                expected = probabilities.get(measurement, 0)
+            else:
+                # Missed detections aren't the same object
+                expected = next(probability
+                                for measurement, probability
+                                in probabilities.items()
+                                if not measurement)
+            assert float(probability) == pytest.approx(float(expected))
+
+
+def test_cluster_gnn(hypothesiser, tracks_detections):
+    tracks, detections, timestamp = tracks_detections
+
+    class GatingHypothesiser:
+        def hypothesise(self, track, detections, timestamp):
+            return [hypothesis
+                    for hypothesis in hypothesiser.hypothesise(
+                        track, detections, timestamp)
+                    if hypothesis.distance < 10]
+
+    gnn = GlobalNearestNeighbour(hypothesiser)
+    associator = ClusterAssociator(
+        gnn, hypothesiser=GatingHypothesiser())
+    assert len(associator.clusters(tracks, detections, timestamp)) == 3
+
+    associations = associator.associate(
+        set(tracks), set(detections), timestamp)
+    full_associations = gnn.associate(set(tracks), set(detections), timestamp)
+    assert associations.keys() == full_associations.keys()
+    assert all(
+        associations[track].measurement is full_associations[track].measurement
+        for track in tracks
+        if full_associations[track])
+
+
+def test_cluster_hypothesise_once(probability_hypothesiser,
+                                  tracks_detections):
+    tracks, detections, timestamp = tracks_detections
+    calls = []
+
+    class CountingHypothesiser:
+        def hypothesise(self, track, detections, timestamp):
+            calls.append(track)
+            return probability_hypothesiser.hypothesise(
+                track, detections, timestamp)
+
+    associator = ClusterAssociator(
+        JPDA(CountingHypothesiser(), 5), gate_ratio=5)
+    associations = associator.associate(
+        set(tracks), set(detections), timestamp)
+
+    # Hypotheses for gating graph reused by associator for each cluster
+    assert sorted(calls, key=tracks.index) == tracks
+    assert associations.keys() == set(tracks)
+    # Only the cluster's detections hypothesised with each track
+    assert {hypothesis.measurement
+            for hypothesis in associations[tracks[2]] if hypothesis} \
+        == {detections[2]}
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import datetime
+import pickle
+
+import numpy as np
+import pytest
+
+from ..executor import SerialExecutor, ThreadExecutor, ProcessExecutor
+from ..cluster import ClusterAssociator
+from ..neighbour import NearestNeighbour, GlobalNearestNeighbour
+from ..probability import SimplePDA, JPDA
+from ...hypothesiser.distance import DistanceHypothesiser
+from ...measures import Mahalanobis
+from ...models.measurement.linear import LinearGaussian
+from ...models.transition.linear import (
+    CombinedLinearGaussianTransitionModel, ConstantVelocity)
+from ...predictor.kalman import KalmanPredictor
+from ...types.detection import Detection
+from ...types.state import GaussianState
+from ...types.track import Track
+from ...updater.kalman import KalmanUpdater
+
+
+@pytest.fixture()
+def kalman_hypothesiser():
+    transition_model = CombinedLinearGaussianTransitionModel(
+        [ConstantVelocity(0.05), ConstantVelocity(0.05)])
+    measurement_model = LinearGaussian(4, [0, 2], np.eye(2))
+    return DistanceHypothesiser(
+        KalmanPredictor(transition_model), KalmanUpdater(measurement_model),
+        Mahalanobis(), missed_distance=5)
+
+
+@pytest.mark.parametrize('executor', [
+    SerialExecutor(),
+    ThreadExecutor(max_workers=2),
+    ProcessExecutor(max_workers=2),
+    ProcessExecutor(max_workers=2, chunksize=1)])
+def test_executor(kalman_hypothesiser, executor):
+    np.random.seed(2020)
+    timestamp = datetime.datetime.now()
+    tracks = [
+        Track([GaussianState(
+            np.array([[x], [1], [y], [0]]), np.diag([1, 0.5, 1, 0.5]),
+            timestamp)])
+        for x, y in np.random.uniform(0, 20, (10, 2))]
+    scan_time = timestamp + datetime.timedelta(seconds=1)
+    detections = {
+        Detection(np.array([[x], [y]]), timestamp=scan_time)
+        for x, y in np.random.uniform(0, 20, (10, 2))}
+
+    expected = SerialExecutor().hypothesise(
+        kalman_hypothesiser, tracks, detections, scan_time)
+    try:
+        hypotheses = executor.hypothesise(
+            kalman_hypothesiser, tracks, detections, scan_time)
+    finally:
+        if hasattr(executor, 'shutdown'):
+            executor.shutdown()
+
+    # Same track order, and hypotheses referring to original detections
+    assert list(hypotheses) == tracks
+    for track in tracks:
+        assert len(hypotheses[track]) == len(expected[track])
+        for hypothesis, expected_hypothesis in zip(
+                hypotheses[track], expected[track]):
+            if expected_hypothesis:
+                assert hypothesis.measurement is \
+                    expected_hypothesis.measurement
+            assert hypothesis.distance \
+                == pytest.approx(expected_hypothesis.distance)
+
+    associator = GlobalNearestNeighbour(
+        kalman_hypothesiser, executor=executor)
+    try:
+        associations = associator.associate(tracks, detections, scan_time)
+    finally:
+        if hasattr(executor, 'shutdown'):
+            executor.shutdown()
+    expected_associations = GlobalNearestNeighbour(
+        kalman_hypothesiser).associate(tracks, detections, scan_time)
+    assert {track: hypothesis.measurement if hypothesis else None
+            for track, hypothesis in associations.items()} \
+        == {track: hypothesis.measurement if hypothesis else None
+            for track, hypothesis in expected_associations.items()}
+
+
+def test_executor_pickle():
+    executor = ThreadExecutor(max_workers=2)
+    assert executor.pool is executor.pool
+    executor = pickle.loads(pickle.dumps(executor))
+    assert executor.max_workers == 2
+    try:
+        assert executor.pool is not None
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.parametrize('associator_class', [
+    NearestNeighbour, GlobalNearestNeighbour, SimplePDA, JPDA,
+    ClusterAssociator])
+def test_executor_property_last(associator_class):
+    # Executor mustn't shift existing positional arguments
+    assert list(associator_class.properties)[-1] == 'executor'
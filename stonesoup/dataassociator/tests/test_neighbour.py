@@ -53,3 +53,76 @@ def test_missed_detection_nearest_neighbour(associator):
     # Best hypothesis should be missed detection hypothesis
     assert all(not hypothesis.measurement
                for hypothesis in associations.values())
+
+
+@pytest.mark.parametrize(
+    'hypothesiser_name', ['hypothesiser', 'probability_hypothesiser'])
+def test_global_nearest_neighbour_optimal(hypothesiser_name, request):
+    hypothesiser = request.getfixturevalue(hypothesiser_name)
+    associator = GlobalNearestNeighbour(hypothesiser)
+    np.random.seed(1990)
+    timestamp = datetime.datetime.now()
+    for _ in range(10):
+        tracks = [Track([GaussianState(np.random.uniform(0, 10, (1, 1)),
+                                       np.array([[1]]), timestamp)])
+                  for _ in range(4)]
+        detections = {Detection(np.random.uniform(0, 10, (1, 1)), timestamp)
+                      for _ in range(np.random.randint(1, 5))}
+
+        hypotheses = {
+            track: hypothesiser.hypothesise(track, detections, timestamp)
+            for track in tracks}
+        associations = associator.optimal_joint_hypothesis(hypotheses)
+
+        assert associations.keys() == set(tracks)
+        assert all(associations[track] in hypotheses[track]
+                   for track in tracks)
+        assert associator.isvalid(associations.values())
+
+        # Compare score with exhaustive search over all joint hypotheses
+        # (equal scoring joint hypotheses are possible in one dimension)
+        best_joint_hypothesis = max(
+            associator.enumerate_joint_hypotheses(hypotheses))
+        if hypothesiser_name == 'hypothesiser':
+            assert float(associations.distance) \
+                == pytest.approx(float(best_joint_hypothesis.distance))
+        else:
+            assert associations.probability.log_value == pytest.approx(
+                best_joint_hypothesis.probability.log_value)
+
+
+def test_nearest_neighbour_greedy(hypothesiser):
+    np.random.seed(2021)
+    timestamp = datetime.datetime.now()
+    tracks = {
+        Track([GaussianState(np.random.uniform(0, 20, (1, 1)),
+                             np.array([[1]]), timestamp)])
+        for _ in range(10)}
+    detections = {Detection(np.random.uniform(0, 20, (1, 1)), timestamp)
+                  for _ in range(8)}
+
+    associations = NearestNeighbour(hypothesiser).associate(
+        tracks, detections, timestamp)
+
+    # Reference greedy association, by repeated scan for best hypothesis
+    hypotheses = {track: hypothesiser.hypothesise(
+                      track, detections, timestamp)
+                  for track in tracks}
+    expected = {}
+    while tracks > expected.keys():
+        best_hypothesis = None
+        for track in tracks - expected.keys():
+            for hypothesis in hypotheses[track]:
+                if hypothesis and hypothesis.measurement in {
+                        hyp.measurement for hyp in expected.values() if hyp}:
+                    continue
+                if best_hypothesis is None or hypothesis > best_hypothesis:
+                    best_hypothesis, best_track = hypothesis, track
+        expected[best_track] = best_hypothesis
+
+    assert associations.keys() == tracks
+    for track in tracks:
+        assert bool(associations[track]) == bool(expected[track])
+        if expected[track]:
+            assert associations[track].measurement \
+                is expected[track].measurement
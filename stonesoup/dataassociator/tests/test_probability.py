@@ -6,6 +6,7 @@ import numpy as np
 
 from ..probability import SimplePDA, JPDA
 from ...types.detection import Detection, MissedDetection
+from ...types.numeric import Probability
 from ...types.state import GaussianState
 from ...types.track import Track
 
@@ -105,3 +106,66 @@ def test_no_tracks_probability(associator):
 
     # Since no Tracks went in, there should be no associations
     assert not associations
+
+
+@pytest.mark.parametrize('k_best', [None, 1000])
+def test_jpda_marginals(probability_hypothesiser, k_best):
+    associator = JPDA(probability_hypothesiser, 100, k_best)
+    np.random.seed(1990)
+    timestamp = datetime.datetime.now()
+    tracks = {
+        Track([GaussianState(np.random.uniform(0, 5, (1, 1)),
+                             np.array([[1]]), timestamp)])
+        for _ in range(4)}
+    detections = {Detection(np.random.uniform(0, 5, (1, 1)), timestamp)
+                  for _ in range(4)}
+
+    associations = associator.associate(tracks, detections, timestamp)
+
+    # Compare with marginals summed over enumerated joint hypotheses
+    hypotheses = {
+        track: probability_hypothesiser.hypothesise(
+            track, detections, timestamp)
+        for track in tracks}
+    joint_hypotheses = associator.enumerate_JPDA_hypotheses(
+        tracks, hypotheses, associator.gate_ratio)
+    assert len(joint_hypotheses) > 50
+    for track in tracks:
+        for hypothesis in associations[track]:
+            measurement = hypothesis.measurement
+            expected = Probability.sum(
+                joint_hypothesis.probability
+                for joint_hypothesis in joint_hypotheses
+                if joint_hypothesis[track].measurement is measurement
+                or not (joint_hypothesis[track] or measurement))
+            assert float(hypothesis.probability) \
+                == pytest.approx(float(expected))
+
+
+def test_jpda_k_best(probability_hypothesiser):
+    timestamp = datetime.datetime.now()
+    t1 = Track([GaussianState(np.array([[0]]), np.array([[1]]), timestamp)])
+    t2 = Track([GaussianState(np.array([[3]]), np.array([[1]]), timestamp)])
+    d1 = Detection(np.array([[1]]))
+    d2 = Detection(np.array([[5]]))
+
+    # Single best joint hypothesis is GNN solution
+    associator = JPDA(probability_hypothesiser, 5, k_best=1)
+    associations = associator.associate({t1, t2}, {d1, d2}, timestamp)
+    assert float(associations[t1][d1].probability) == pytest.approx(1)
+    assert float(associations[t2][d2].probability) == pytest.approx(1)
+
+    log_probabilities = np.log(np.array([[0.1, 0.5, 0.4],
+                                         [0.2, 0.4, 0.4],
+                                         [0.5, 1., 0.5]]))
+    log_probabilities[2, 1] = -np.inf  # Gated out
+    exact = JPDA.exact_log_marginals(log_probabilities)
+    assert np.allclose(np.exp(exact).sum(axis=1), 1)
+    # There are 7 + 3 = 10 valid joint hypotheses, with the third track
+    # missed or not
+    assert np.allclose(JPDA.k_best_log_marginals(log_probabilities, 10),
+                       exact)
+    assert np.allclose(JPDA.k_best_log_marginals(log_probabilities, 100),
+                       exact)
+    assert not np.allclose(JPDA.k_best_log_marginals(log_probabilities, 9),
+                           exact)
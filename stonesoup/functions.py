@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 """Mathematical functions used within Stone Soup"""
+from functools import lru_cache, partial
 
 import numpy as np
+from scipy.linalg import solve_triangular
+from scipy.special import logsumexp
 
 from .types.numeric import Probability
 from .types.array import Matrix
@@ -35,9 +38,138 @@ def tria(matrix):
     return lower_triangular
 
 
+def lower_sqrt(covar):
+    """Lower-triangular square root of a covariance matrix
+
+    The Cholesky factor is used where the matrix is positive definite.
+    Otherwise, e.g. for noise covariances with zero variance in some
+    dimensions, the square root is formed from the eigendecomposition, with
+    negative eigenvalues from rounding errors set to zero, and triangularised
+    with :func:`tria`.
+
+    Parameters
+    ----------
+    covar : numpy.ndarray
+        A `n` by `n` symmetric positive semi-definite matrix.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `n` by `n` lower-triangular matrix `L`, such that `L @ L.T` is
+        `covar`.
+    """
+    covar = np.asfarray(covar)
+    try:
+        return np.linalg.cholesky(covar)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covar)
+        return tria(eigenvectors * np.sqrt(np.maximum(eigenvalues, 0)))
+
+
+def state_sqrt_covar(state):
+    """Lower-triangular square root of the covariance of a state
+
+    Square root states, e.g. :class:`~.SqrtGaussianState`, hold this
+    directly. Otherwise it is formed from the state's covariance with
+    :func:`lower_sqrt`.
+
+    Parameters
+    ----------
+    state : :class:`~.SqrtGaussianState` or :class:`~.GaussianState`
+        A Gaussian state
+
+    Returns
+    -------
+    numpy.ndarray
+        A `n` by `n` lower-triangular matrix `L`, such that `L @ L.T` is the
+        covariance of `state`.
+    """
+    try:
+        return np.asfarray(state.sqrt_covar)
+    except AttributeError:
+        return lower_sqrt(state.covar)
+
+
+def state_information_form(state):
+    r"""Information vector and matrix of a state
+
+    Information states, e.g. :class:`~.InformationState`, hold these
+    directly. Otherwise the state's covariance is inverted to form them.
+
+    Parameters
+    ----------
+    state : :class:`~.InformationState` or :class:`~.GaussianState`
+        A Gaussian state
+
+    Returns
+    -------
+    numpy.ndarray
+        The information vector :math:`\mathbf{y} = P^{-1} \mathbf{x}`
+    numpy.ndarray
+        The information matrix :math:`Y = P^{-1}`
+    """
+    try:
+        return (np.asfarray(state.information_vector),
+                np.asfarray(state.precision))
+    except AttributeError:
+        precision = np.linalg.inv(state.covar)
+        return precision @ np.asfarray(state.state_vector), precision
+
+
+def cholesky_update(lower, vector, downdate=False):
+    """Rank one update of a lower-triangular Cholesky factor
+
+    Parameters
+    ----------
+    lower : numpy.ndarray
+        A `n` by `n` lower-triangular matrix `L`.
+    vector : numpy.ndarray
+        Vector `v` of length `n`, or of shape `(n, 1)`.
+    downdate : bool, optional
+        Whether to downdate rather than update. Default `False`.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `n` by `n` lower-triangular matrix `L'`, such that
+        `L' @ L'.T` is `L @ L.T + v @ v.T` (or `L @ L.T - v @ v.T` if
+        downdating).
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If the updated matrix is not positive definite, which may occur
+        when downdating.
+    """
+    dtype = np.result_type(lower, np.float32)
+    lower = np.array(lower, dtype=dtype)
+    vector = np.array(vector, dtype=dtype).ravel()
+    sign = -1 if downdate else 1
+
+    for k in range(len(vector)):
+        radius2 = lower[k, k]**2 + sign*vector[k]**2
+        if radius2 <= 0:
+            raise np.linalg.LinAlgError(
+                "Updated matrix is not positive definite")
+        radius = np.sqrt(radius2)
+        cos = radius / lower[k, k]
+        sin = vector[k] / lower[k, k]
+        lower[k, k] = radius
+        lower[k+1:, k] = (lower[k+1:, k] + sign*sin*vector[k+1:]) / cos
+        vector[k+1:] = cos*vector[k+1:] - sin*lower[k+1:, k]
+
+    return lower
+
+
 def jacobian(fun, x):
     """Compute Jacobian through finite difference calculation
 
+    Central differences are used, with a step size relative to the
+    magnitude of each element of `x`. All perturbations of `x` are passed
+    to f at once, as an array of shape `(Ns, 2*Ns)`, where f is marked as
+    supporting this (see :func:`~.models.base.vectorised`); otherwise f is
+    evaluated for each in turn.
+
     Parameters
     ----------
     fun : function handle
@@ -54,30 +186,24 @@ def jacobian(fun, x):
     """
 
     if isinstance(x, (int, float)):
-        ndim = 1
-    else:
-        ndim = np.shape(x)[0]
+        x = np.array([[x]])
+    ndim = np.shape(x)[0]
 
-    # For numerical reasons the step size needs to large enough
-    delta = 1.e-8  # 100*ndim*np.finfo(float).eps
-
-    f1 = fun(x)
-    if isinstance(f1, (int, float)):
-        nrows = 1
-    else:
-        nrows = f1.size
+    # Step size balancing truncation and rounding error, for central
+    # difference
+    delta = np.cbrt(np.finfo(np.float_).eps) \
+        * np.maximum(np.abs(np.asfarray(x)), 1).ravel()
+    steps = np.diag(delta)
+    points = np.hstack((x + steps, x - steps))
 
-    F2 = np.empty((nrows, ndim))
-    X1 = np.tile(x, ndim)+np.eye(ndim)*delta
+    points_t = _apply_to_columns(fun, points)
 
-    for col in range(0, X1.shape[1]):
-        F2[:, [col]] = fun(X1[:, [col]])
+    # Difference taken before conversion to float, such that angles wrap
+    jac = np.asfarray(points_t[:, :ndim] - points_t[:, ndim:]) / (2*delta)
+    return jac
 
-    jac = np.divide(F2-f1, delta)
-    return jac.astype(np.float_)
 
-
-def gauss2sigma(mean, covar, alpha=1.0, beta=2.0, kappa=None):
+def gauss2sigma(mean, covar, alpha=1.0, beta=2.0, kappa=None, sqrt=False):
     """Approximate a given distribution to a Gaussian, using a
     deterministically selected set of sigma points.
 
@@ -97,6 +223,10 @@ def gauss2sigma(mean, covar, alpha=1.0, beta=2.0, kappa=None):
     kappa : float, optional
         Secondary spread scaling parameter
         (default is calculated as `3-Ns`)
+    sqrt : bool, optional
+        Whether `covar` is a lower-triangular square root of the covariance,
+        which is then used in place of its Cholesky decomposition.
+        (default is `False`)
 
     Returns
     -------
@@ -110,30 +240,78 @@ def gauss2sigma(mean, covar, alpha=1.0, beta=2.0, kappa=None):
 
     ndim_state = np.shape(mean)[0]
 
+    # Compute Square Root matrix via Colesky decomp.
+    if sqrt:
+        sqrt_sigma = np.asfarray(covar)
+    else:
+        sqrt_sigma = np.linalg.cholesky(covar)
+
+    # Scaling factor for all off-center points, and weights
+    scale, mean_weights, covar_weights = _sigma_point_weights(
+        *_sigma_point_parameters(ndim_state, alpha, beta, kappa))
+
+    # Calculate sigma point locations
+    sigma_points = np.tile(mean, (1, 2 * ndim_state + 1))
+    sigma_points[:, 1:(ndim_state + 1)] += sqrt_sigma * scale
+    sigma_points[:, (ndim_state + 1):] -= sqrt_sigma * scale
+
+    return sigma_points, mean_weights, covar_weights
+
+
+def sigma_point_weights(ndim_state, alpha=1.0, beta=2.0, kappa=None):
+    """Sigma point mean and covariance weights
+
+    Weights depend only on the number of dimensions and the parameters, so
+    are cached for each set of these, and returned as read-only arrays.
+
+    Parameters
+    ----------
+    ndim_state : int
+        Number of dimensions, `Ns`, of the Gaussian
+    alpha : float, optional
+        Spread of the sigma points. (default is 1)
+    beta : float, optional
+        Used to incorporate prior knowledge of the distribution.
+        (default is 2)
+    kappa : float, optional
+        Secondary spread scaling parameter
+        (default is calculated as `3-Ns`)
+
+    Returns
+    -------
+    : :class:`numpy.ndarray` of shape `(2*Ns+1,)`
+        An array containing the sigma point mean weights
+    : :class:`numpy.ndarray` of shape `(2*Ns+1,)`
+        An array containing the sigma point covariance weights
+    """
+    _, mean_weights, covar_weights = _sigma_point_weights(
+        *_sigma_point_parameters(ndim_state, alpha, beta, kappa))
+    return mean_weights, covar_weights
+
+
+def _sigma_point_parameters(ndim_state, alpha, beta, kappa):
+    """Parameters normalised to hashable floats, as cache key"""
     if kappa is None:
         kappa = 3.0 - ndim_state
+    return int(ndim_state), float(alpha), float(beta), float(kappa)
 
-    # Compute Square Root matrix via Colesky decomp.
-    sqrt_sigma = np.linalg.cholesky(covar)
 
-    # Calculate scaling factor for all off-center points
+@lru_cache(maxsize=128)
+def _sigma_point_weights(ndim_state, alpha, beta, kappa):
+    """Sigma point spread scale, and read-only mean and covariance weights"""
     alpha2 = np.power(alpha, 2)
     lamda = alpha2 * (ndim_state + kappa) - ndim_state
     c = ndim_state + lamda
 
-    # Calculate sigma point locations
-    sigma_points = np.tile(mean, (1, 2 * ndim_state + 1))
-    sigma_points[:, 1:(ndim_state + 1)] += sqrt_sigma * np.sqrt(c)
-    sigma_points[:, (ndim_state + 1):] -= sqrt_sigma * np.sqrt(c)
-
-    # Calculate weights
     mean_weights = np.ones(2 * ndim_state + 1)
     mean_weights[0] = lamda / c
     mean_weights[1:] = 0.5 / c
     covar_weights = np.copy(mean_weights)
     covar_weights[0] = lamda / c + (1 - alpha2 + beta)
 
-    return sigma_points, mean_weights, covar_weights
+    mean_weights.flags.writeable = False
+    covar_weights.flags.writeable = False
+    return np.sqrt(c), mean_weights, covar_weights
 
 
 def sigma2gauss(sigma_points, mean_weights, covar_weights, covar_noise=None):
@@ -161,9 +339,11 @@ def sigma2gauss(sigma_points, mean_weights, covar_weights, covar_noise=None):
 
     mean = sigma_points@mean_weights[:, np.newaxis]
 
-    points_diff = sigma_points - mean
+    # Difference taken before conversion to float, such that angles wrap
+    points_diff = np.asfarray(sigma_points - mean)
 
-    covar = points_diff@(np.diag(covar_weights))@(points_diff.T)
+    # Weight columns by broadcasting, rather than dense diagonal matrix
+    covar = Matrix((points_diff*covar_weights) @ points_diff.T)
     if covar_noise is not None:
         covar = covar + covar_noise
     return mean, covar
@@ -188,7 +368,11 @@ def unscented_transform(sigma_points, mean_weights, covar_weights,
     fun : function handle
         A (non-linear) transition function
         Must be of the form "y = fun(x,w)", where y can be a scalar or \
-        :class:`numpy.ndarray` of shape `(Ns, 1)` or `(Ns,)`
+        :class:`numpy.ndarray` of shape `(Ns, 1)` or `(Ns,)`. Where f is
+        marked as accepting all points at once (see
+        :func:`~.models.base.vectorised`), with x (and w) of shape
+        `(Ns, 2*Ns+1)`, returning y of shape `(Nm, 2*Ns+1)`, it is called
+        once; otherwise f is applied to each point in turn.
     covar_noise : :class:`~.CovarianceMatrix` of shape `(Ns, Ns)`, optional
         Additive noise covariance matrix
         (default is `None`)
@@ -212,18 +396,11 @@ def unscented_transform(sigma_points, mean_weights, covar_weights,
         An array containing the transformed sigma point covariance weights
     """
 
-    ndim_state, n_points = sigma_points.shape
-
     # Transform points through f
-    sigma_points_t = np.zeros((ndim_state, n_points))
     if points_noise is None:
-        sigma_points_t = np.asarray(
-            [fun(sigma_points[:, i:i+1])
-             for i in range(n_points)]).squeeze(2).T
+        sigma_points_t = _apply_to_columns(fun, sigma_points)
     else:
-        sigma_points_t = np.asarray(
-            [fun(sigma_points[:, i:i+1], points_noise[:, i:i+1])
-             for i in range(n_points)]).squeeze(2).T
+        sigma_points_t = _apply_to_columns(fun, sigma_points, points_noise)
     sigma_points_t = sigma_points_t.view(Matrix)
 
     # Calculate mean and covariance approximation
@@ -231,16 +408,93 @@ def unscented_transform(sigma_points, mean_weights, covar_weights,
         sigma_points_t, mean_weights, covar_weights, covar_noise)
 
     # Calculate cross-covariance
-    cross_covar = (
-        (sigma_points-sigma_points[:, 0:1])
-        @np.diag(mean_weights)
-        @(sigma_points_t-mean).T
-    )
+    cross_covar = Matrix(
+        (np.asfarray(sigma_points - sigma_points[:, 0:1])*mean_weights)
+        @ np.asfarray(sigma_points_t - mean).T)
 
     return mean, covar, cross_covar,\
         sigma_points_t, mean_weights, covar_weights
 
 
+def sqrt_unscented_transform(sigma_points, mean_weights, covar_weights,
+                             fun, sqrt_covar_noise=None):
+    """Apply the Unscented Transform to a set of sigma points, in square root
+    form
+
+    As :func:`unscented_transform`, but the covariance is returned as a
+    lower-triangular square root, formed by triangularisation of the
+    weighted sigma point deviations (see :func:`tria`) and a rank one update
+    (or downdate, where its weight is negative) for the central sigma point
+    (see :func:`cholesky_update`), such that the full covariance isn't
+    formed.
+
+    Parameters
+    ----------
+    sigma_points : :class:`numpy.ndarray` of shape `(Ns, 2*Ns+1)`
+        An array containing the locations of the sigma points
+    mean_weights : :class:`numpy.ndarray` of shape `(2*Ns+1,)`
+        An array containing the sigma point mean weights
+    covar_weights : :class:`numpy.ndarray` of shape `(2*Ns+1,)`
+        An array containing the sigma point covariance weights. All but the
+        first must be non-negative.
+    fun : function handle
+        A (non-linear) transition function, as for
+        :func:`unscented_transform`
+    sqrt_covar_noise : :class:`numpy.ndarray` of shape `(Nm, Nm)`, optional
+        Lower-triangular square root of additive noise covariance matrix
+        (default is `None`)
+
+    Returns
+    -------
+    : :class:`numpy.ndarray` of shape `(Nm, 1)`
+        Transformed mean
+    : :class:`numpy.ndarray` of shape `(Nm, Nm)`
+        Lower-triangular square root of transformed covariance
+    : :class:`~.Matrix` of shape `(Ns, Nm)`
+        Calculated cross-covariance matrix
+    : :class:`numpy.ndarray` of shape `(Nm, 2*Ns+1)`
+        An array containing the locations of the transformed sigma points
+    """
+
+    sigma_points_t = _apply_to_columns(fun, sigma_points).view(Matrix)
+    mean = sigma_points_t @ mean_weights[:, np.newaxis]
+
+    # Difference taken before conversion to float, such that angles wrap
+    points_diff = np.asfarray(sigma_points_t - mean)
+
+    weighted_diff = points_diff[:, 1:] * np.sqrt(covar_weights[1:])
+    if sqrt_covar_noise is not None:
+        weighted_diff = np.hstack(
+            (weighted_diff, np.asfarray(sqrt_covar_noise)))
+    sqrt_covar = cholesky_update(
+        tria(weighted_diff),
+        np.sqrt(np.abs(covar_weights[0])) * points_diff[:, 0],
+        downdate=covar_weights[0] < 0)
+
+    cross_covar = Matrix(
+        (np.asfarray(sigma_points - sigma_points[:, 0:1])*mean_weights)
+        @ points_diff.T)
+
+    return mean, sqrt_covar, cross_covar, sigma_points_t
+
+
+def _apply_to_columns(fun, *arrays):
+    """Apply f to each column of arrays, returning results as columns
+
+    All columns are passed to f at once if f, or the function it is a
+    :func:`functools.partial` of, has a true `vectorised` attribute.
+    Otherwise f is applied to each column in turn."""
+    vectorised_fun = fun
+    while isinstance(vectorised_fun, partial):
+        vectorised_fun = vectorised_fun.func
+    if getattr(vectorised_fun, 'vectorised', False):
+        return np.asarray(fun(*arrays))
+
+    return np.hstack([
+        np.reshape(fun(*(array[:, i:i+1] for array in arrays)), (-1, 1))
+        for i in range(np.shape(arrays[0])[1])])
+
+
 def cart2pol(x, y):
     """Convert Cartesian coordinates to Polar
 
@@ -471,7 +725,8 @@ def gm_reduce_single(means, covars, weights):
     covars : np.array of shape (num_components, num_dims, num_dims)
         The covariance matrices of the GM components
     weights : np.array of shape (num_components,)
-        The weights of the GM components
+        The weights of the GM components, which may be
+        :class:`~.Probability` objects
 
     Returns
     -------
@@ -480,26 +735,137 @@ def gm_reduce_single(means, covars, weights):
     np.array of shape (num_dims, num_dims)
         The covariance of the reduced/single Gaussian
     """
+    means, covars = gm_reduce_batch(
+        np.asarray(means)[np.newaxis, ...],
+        np.asarray(covars)[np.newaxis, ...],
+        _log_weights(weights)[np.newaxis, :])
+    return means[0], covars[0]
 
-    # Compute dimensionality variables
-    num_components, num_dims = np.shape(means)
 
-    # Normalise weights such that they sum to 1
-    weights = weights/Probability.sum(weights)
+def gm_reduce_batch(means, covars, log_weights, counts=None):
+    """Reduce many mixtures of multi-variate Gaussians to single Gaussians
 
-    # Calculate mean
-    mean = np.average(means, axis=0, weights=weights).astype(np.float_)
-    mean.shape = (1, num_dims)
+    Mixtures are moment matched in a single vectorised operation, with
+    weights normalised in log space, and the spread of means term formed by
+    :func:`numpy.einsum`. Mixtures may either be padded to the same number
+    of components, with padding components given log weight of `-inf`, or
+    be ragged, concatenated with the number of components of each given by
+    `counts`.
 
-    # Calculate covar
-    covar = np.zeros((num_dims, num_dims))
-    for i in range(num_components):
-        v = means[i, :] - mean
-        a = np.add(covars[i], v.T@v)
-        b = weights[i]
-        covar = np.add(covar, b*a)
+    Parameters
+    ----------
+    means : np.array of shape (num_mixtures, num_components, num_dims) or \
+    (total_components, num_dims)
+        The means of the GM components, padded or ragged.
+    covars : np.array of shape \
+    (num_mixtures, num_components, num_dims, num_dims) or \
+    (total_components, num_dims, num_dims)
+        The covariance matrices of the GM components, padded or ragged.
+    log_weights : np.array of shape (num_mixtures, num_components) or \
+    (total_components, )
+        The natural log of the (unnormalised) weights of the GM components,
+        padded or ragged.
+    counts : sequence of int, optional
+        Number of components of each mixture, where ragged. Each must be at
+        least one. Default `None`, where padded.
 
-    return mean.transpose(), covar
+    Returns
+    -------
+    np.array of shape (num_mixtures, num_dims, 1)
+        The means of the reduced Gaussians
+    np.array of shape (num_mixtures, num_dims, num_dims)
+        The covariances of the reduced Gaussians
+    """
+    means = np.asarray(means, dtype=np.float_)
+    covars = np.asarray(covars, dtype=np.float_)
+    log_weights = np.asarray(log_weights, dtype=np.float_)
+
+    if counts is None:
+        # Padded: normalise along components axis
+        weights = np.exp(
+            log_weights - logsumexp(log_weights, axis=1, keepdims=True))
+        mean = np.einsum('bn,bni->bi', weights, means)
+        differences = means - mean[:, np.newaxis, :]
+        covar = np.einsum('bn,bnij->bij', weights, covars) \
+            + np.einsum('bn,bni,bnj->bij', weights, differences, differences)
+        return mean[..., np.newaxis], covar
+
+    counts = np.asarray(counts, dtype=np.int_)
+    if np.any(counts < 1):
+        raise ValueError("Each mixture must have at least one component")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    segments = np.repeat(np.arange(len(counts)), counts)
+
+    # Ragged: normalise within each segment, shifting by segment maximum
+    max_log_weights = np.maximum.reduceat(log_weights, starts)
+    weights = np.exp(log_weights - max_log_weights[segments])
+    weights /= np.add.reduceat(weights, starts)[segments]
+
+    mean = np.add.reduceat(weights[:, np.newaxis] * means, starts)
+    differences = means - mean[segments]
+    covar = np.add.reduceat(
+        weights[:, np.newaxis, np.newaxis] * covars
+        + np.einsum('n,ni,nj->nij', weights, differences, differences),
+        starts)
+    return mean[..., np.newaxis], covar
+
+
+def _log_weights(weights):
+    """Natural log of weights, which may be :class:`~.Probability`"""
+    weights = np.asarray(weights)
+    if weights.dtype == object:
+        return np.array([
+            weight.log_value if isinstance(weight, Probability)
+            else Probability(weight).log_value
+            for weight in weights], dtype=np.float_)
+    with np.errstate(divide='ignore'):
+        return np.log(weights.astype(np.float_))
+
+
+def gauss_innovation_scores(state_vectors, mean, covar, cholesky=None):
+    """Log likelihoods and Mahalanobis distances of many vectors under a
+    single Gaussian
+
+    The covariance is factorised once by Cholesky decomposition, and the
+    innovations of all vectors whitened with a single triangular solve,
+    rather than re-factorising the covariance for each vector.
+
+    Parameters
+    ----------
+    state_vectors : np.array of shape (num_dims, num_vectors)
+        Vectors to score, one per column
+    mean : np.array of shape (num_dims, 1)
+        The mean of the Gaussian
+    covar : np.array of shape (num_dims, num_dims)
+        The (positive definite) covariance of the Gaussian
+    cholesky : np.array of shape (num_dims, num_dims), optional
+        Lower-triangular Cholesky factor of `covar`, where already computed
+        (e.g. to also solve for a Kalman gain). Default `None`, where
+        `covar` is factorised.
+
+    Returns
+    -------
+    np.array of shape (num_vectors,)
+        Natural log of the Gaussian probability density of each vector
+    np.array of shape (num_vectors,)
+        Mahalanobis distance of each vector from the mean
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If the covariance isn't positive definite.
+    """
+    innovations = np.asarray(state_vectors - mean, dtype=np.float_)
+    if cholesky is None:
+        cholesky = np.linalg.cholesky(np.asarray(covar, dtype=np.float_))
+    whitened = solve_triangular(cholesky, innovations, lower=True)
+    squared_distances = np.sum(whitened**2, axis=0)
+
+    num_dims = cholesky.shape[0]
+    log_det = 2 * np.sum(np.log(np.diag(cholesky)))
+    log_likelihoods = -0.5 * (
+        squared_distances + num_dims*np.log(2*np.pi) + log_det)
+    return log_likelihoods, np.sqrt(squared_distances)
 
 
 def mod_bearing(x):
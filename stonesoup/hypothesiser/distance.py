@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
+import numpy as np
+
 from .base import Hypothesiser
+from .spatial import (
+    DetectionIndex, group_detections, max_covariance_radius)
 from ..base import Property
-from ..measures import Measure
+from ..measures import Measure, Euclidean, Mahalanobis
 from ..predictor import Predictor
 from ..types.multihypothesis import \
     MultipleHypothesis
@@ -16,6 +20,13 @@ class DistanceHypothesiser(Hypothesiser):
     Generate track predictions at detection times and score each hypothesised
     prediction-detection pair using the distance of the supplied
     :class:`Measure` class.
+
+    With :attr:`spatial_index` enabled, detections are first looked up in a
+    :class:`~.DetectionIndex`, within a radius guaranteed to contain all
+    detections under :attr:`missed_distance`, such that distant detections
+    aren't predicted and measured. This applies to :class:`~.Euclidean` and
+    :class:`~.Mahalanobis` measures, where for the latter the radius is
+    derived from the largest eigenvalue of the innovation covariance.
     """
 
     predictor = Property(
@@ -36,6 +47,14 @@ class DistanceHypothesiser(Hypothesiser):
         default=False,
         doc="If `True`, hypotheses beyond missed distance will be returned. "
             "Default `False`")
+    spatial_index = Property(
+        bool,
+        default=False,
+        doc="If `True`, use a spatial index of detections to skip those "
+            "beyond missed distance. Has no effect if :attr:`include_all` "
+            "is `True`, :attr:`missed_distance` is infinite or "
+            ":attr:`measure` isn't a :class:`~.Euclidean` or "
+            ":class:`~.Mahalanobis` measure. Default `False`")
 
     def hypothesise(self, track, detections, timestamp):
         """ Evaluate and return all track association hypotheses.
@@ -78,25 +97,64 @@ class DistanceHypothesiser(Hypothesiser):
                 self.missed_distance,
                 measurement_prediction))
 
-        # True detection hypotheses
-        for detection in detections:
+        radius = self._gate_radius()
+        if radius is not None and not isinstance(detections, DetectionIndex):
+            detections = DetectionIndex(detections)
+
+        # True detection hypotheses, with a single prediction for each group
+        # of detections with the same measurement model and timestamp
+        for group, candidates in group_detections(detections).items():
+            measurement_model, detection_timestamp = group
 
             # Re-evaluate prediction
             prediction = self.predictor.predict(
-                track.state, timestamp=detection.timestamp)
+                track.state, timestamp=detection_timestamp)
 
-            # Compute measurement prediction and distance measure
+            # Compute measurement prediction and distance measures
             measurement_prediction = self.updater.predict_measurement(
-                prediction, detection.measurement_model)
-            distance = self.measure(measurement_prediction, detection)
-
-            if self.include_all or distance < self.missed_distance:
-                # True detection hypothesis
-                hypotheses.append(
-                    SingleDistanceHypothesis(
-                        prediction,
-                        detection,
-                        distance,
-                        measurement_prediction))
+                prediction, measurement_model)
+            if radius is not None:
+                candidates = detections.query(
+                    group,
+                    self._mapped(measurement_prediction.state_vector),
+                    radius(measurement_prediction),
+                    self.measure.mapping)
+            distances = self.measure.distances(
+                measurement_prediction, candidates)
+
+            for detection, distance in zip(candidates, distances):
+                if self.include_all or distance < self.missed_distance:
+                    # True detection hypothesis
+                    hypotheses.append(
+                        SingleDistanceHypothesis(
+                            prediction,
+                            detection,
+                            distance,
+                            measurement_prediction))
 
         return MultipleHypothesis(sorted(hypotheses, reverse=True))
+
+    def _gate_radius(self):
+        """Function of measurement prediction giving radius containing all
+        detections within missed distance, or `None` if not gating"""
+        if not self.spatial_index or self.include_all:
+            return None
+        missed_distance = float(self.missed_distance)
+        mapping = self.measure.mapping
+        if not np.isfinite(missed_distance):
+            return None
+        elif isinstance(self.measure, Mahalanobis):
+            def radius(measurement_prediction):
+                return max_covariance_radius(
+                    measurement_prediction.covar, missed_distance, mapping)
+        elif isinstance(self.measure, Euclidean):
+            def radius(_):
+                return missed_distance
+        else:
+            return None
+        return radius
+
+    def _mapped(self, state_vector):
+        if self.measure.mapping is None:
+            return state_vector
+        return state_vector[self.measure.mapping, :]
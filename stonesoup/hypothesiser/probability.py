@@ -1,7 +1,11 @@
-from scipy.stats import multivariate_normal as mn
+import numpy as np
+from scipy.stats import chi2
 
 from .base import Hypothesiser
+from .spatial import (
+    DetectionIndex, group_detections, max_covariance_radius)
 from ..base import Property
+from ..functions import gauss_innovation_scores
 from ..types.detection import MissedDetection
 from ..types.hypothesis import SingleProbabilityHypothesis
 from ..types.multihypothesis import MultipleHypothesis
@@ -16,6 +20,11 @@ class PDAHypothesiser(Hypothesiser):
     Generate track predictions at detection times and calculate probabilities
     for all prediction-detection pairs for single prediction and multiple
     detections.
+
+    With :attr:`spatial_index` enabled, only detections within the
+    chi-square gate of probability :attr:`prob_gate` are hypothesised, which
+    are found using a :class:`~.DetectionIndex`, such that distant detections
+    aren't predicted and scored.
     """
 
     predictor = Property(
@@ -37,6 +46,12 @@ class PDAHypothesiser(Hypothesiser):
         default=Probability(0.95),
         doc="Gate Probability - prob. gate contains true measurement "
             "if detected")
+    spatial_index = Property(
+        bool,
+        default=False,
+        doc="If `True`, detections outside the gate are excluded, using a "
+            "spatial index of detections to skip distant detections. "
+            "Default `False`, where all detections are hypothesised.")
 
     def hypothesise(self, track, detections, timestamp):
         r"""Evaluate and return all track association hypotheses.
@@ -129,28 +144,54 @@ class PDAHypothesiser(Hypothesiser):
                 probability,
                 measurement_prediction))
 
-        # True detection hypotheses
-        for detection in detections:
+        if self.spatial_index and not isinstance(detections, DetectionIndex):
+            detections = DetectionIndex(detections)
+
+        # True detection hypotheses, with a single prediction for each group
+        # of detections with the same measurement model and timestamp
+        for group, candidates in group_detections(detections).items():
+            measurement_model, detection_timestamp = group
 
             # Re-evaluate prediction
             prediction = self.predictor.predict(
-                track.state, timestamp=detection.timestamp)
+                track.state, timestamp=detection_timestamp)
 
-            # Compute measurement prediction and probability measure
+            # Compute measurement prediction and probability measures
             measurement_prediction = self.updater.predict_measurement(
-                prediction, detection.measurement_model)
-            log_pdf = mn.logpdf(detection.state_vector.ravel(),
-                                measurement_prediction.state_vector.ravel(),
-                                measurement_prediction.covar)
-            pdf = Probability(log_pdf, log_value=True)
-            probability = (pdf * self.prob_detect)/self.clutter_spatial_density
-
-            # True detection hypothesis
-            hypotheses.append(
-                SingleProbabilityHypothesis(
-                    prediction,
-                    detection,
-                    probability,
-                    measurement_prediction))
+                prediction, measurement_model)
+            if self.spatial_index:
+                gate = self._gate_threshold(measurement_prediction.ndim)
+                candidates = detections.query(
+                    group,
+                    measurement_prediction.state_vector,
+                    max_covariance_radius(
+                        measurement_prediction.covar, np.sqrt(gate)))
+            if not candidates:
+                continue
+            log_pdfs, distances = gauss_innovation_scores(
+                np.hstack([detection.state_vector
+                           for detection in candidates]),
+                measurement_prediction.state_vector,
+                measurement_prediction.covar)
+
+            for detection, log_pdf, distance in zip(
+                    candidates, log_pdfs, distances):
+                if self.spatial_index and distance**2 > gate:
+                    continue
+                pdf = Probability(log_pdf, log_value=True)
+                probability = \
+                    (pdf * self.prob_detect)/self.clutter_spatial_density
+
+                # True detection hypothesis
+                hypotheses.append(
+                    SingleProbabilityHypothesis(
+                        prediction,
+                        detection,
+                        probability,
+                        measurement_prediction))
 
         return MultipleHypothesis(hypotheses, normalise=True, total_weight=1)
+
+    def _gate_threshold(self, ndim):
+        """Squared Mahalanobis distance of gate"""
+        return chi2.ppf(float(self.prob_gate), ndim)
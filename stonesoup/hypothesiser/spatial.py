@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+r"""Grouping and spatial indexing of detections, for hypothesisers.
+
+Detections are grouped by measurement model and timestamp, as each group
+shares a single state and measurement prediction of a track, which
+hypothesisers compute once per group (see :func:`group_detections`).
+
+Rather than each hypothesiser scoring every detection against every track,
+a :class:`DetectionIndex` holds a KD-tree (:class:`scipy.spatial.cKDTree`)
+of detection state vectors, which a hypothesiser can query with a bound
+derived from a track's measurement prediction, such that only nearby
+detections are scored. :class:`~.Bearing` elements are indexed as a point
+on the unit circle, :math:`(\cos\theta, \sin\theta)`, whose (chord)
+distance is never more than the wrapped difference in bearing, so
+detections either side of :math:`\pm\pi` are still found. Other wrapping
+angles (e.g. :class:`~.Elevation`) aren't indexed, so don't exclude any
+detections.
+
+An index is built by the hypothesiser for each call, unless detections are
+passed as a :class:`DetectionIndex`, in which case it is reused across
+tracks:
+
+.. code-block:: python
+
+    detections = DetectionIndex(detections)
+    associations = data_associator.associate(tracks, detections, timestamp)
+"""
+from collections import defaultdict
+from collections.abc import Set
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..types.angle import Angle, Bearing
+
+
+class DetectionIndex(Set):
+    """Immutable set of detections, with a spatial index
+
+    Detections are grouped by measurement model and timestamp, as these
+    determine the measurement prediction they are compared with. A KD-tree
+    is built for each group (and state vector mapping) on first query.
+
+    Parameters
+    ----------
+    detections : iterable of :class:`~.Detection`
+        Detections to index.
+    """
+
+    def __init__(self, detections=()):
+        self._detections = frozenset(detections)
+        self._groups = group_detections(self._detections)
+        self._trees = {}
+
+    def __contains__(self, detection):
+        return detection in self._detections
+
+    def __iter__(self):
+        return iter(self._detections)
+
+    def __len__(self):
+        return len(self._detections)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, set(self._detections))
+
+    @property
+    def groups(self):
+        """Detections grouped by measurement model and timestamp, as per
+        :func:`group_detections`"""
+        return self._groups
+
+    def query(self, group, centre, radius, mapping=None):
+        """Detections within radius of a point
+
+        Parameters
+        ----------
+        group : tuple of :class:`~.MeasurementModel` and \
+        :class:`datetime.datetime`
+            Measurement model and timestamp of detections to query, as per
+            :attr:`groups`
+        centre : :class:`numpy.ndarray`
+            Point to query around, in (mapped) measurement space
+        radius : float
+            Euclidean distance from `centre` to query. If not finite, all
+            detections in the group are returned.
+        mapping : sequence of int, optional
+            Elements of detection state vectors to index on. Default `None`,
+            where all elements are used.
+
+        Returns
+        -------
+        list of :class:`~.Detection`
+            Detections in group within `radius` of `centre`.
+        """
+        detections = self._groups.get(group, [])
+        if not detections or not np.isfinite(radius):
+            return list(detections)
+        tree, linear, bearings = self._tree(group, mapping)
+        if tree is None:
+            # No elements indexed
+            return list(detections)
+        centre = np.ravel(np.asarray(centre, dtype=np.float_))
+        indices = tree.query_ball_point(
+            _index_points(centre[np.newaxis, :], linear, bearings)[0],
+            radius)
+        return [detections[index] for index in indices]
+
+    def _tree(self, group, mapping):
+        key = group, None if mapping is None else tuple(mapping)
+        try:
+            return self._trees[key]
+        except KeyError:
+            pass
+        detections = self._groups[group]
+        elements = np.ravel(detections[0].state_vector)
+        if mapping is not None:
+            elements = elements[mapping]
+        # Positions (in mapped state vector) of linear and bearing elements;
+        # other wrapping angles aren't indexed
+        linear = [
+            position for position, element in enumerate(elements)
+            if not isinstance(element, Angle) or type(element) is Angle]
+        bearings = [
+            position for position, element in enumerate(elements)
+            if isinstance(element, Bearing)]
+
+        if linear or bearings:
+            state_vectors = np.array(
+                [np.ravel(detection.state_vector)
+                 for detection in detections],
+                dtype=np.float_)
+            if mapping is not None:
+                state_vectors = state_vectors[:, mapping]
+            tree = cKDTree(_index_points(state_vectors, linear, bearings))
+        else:
+            tree = None
+        self._trees[key] = tree, linear, bearings
+        return self._trees[key]
+
+
+def _index_points(points, linear, bearings):
+    """Points as indexed: linear elements, then each bearing as a point on
+    the unit circle"""
+    return np.hstack((points[:, linear],
+                      np.cos(points[:, bearings]),
+                      np.sin(points[:, bearings])))
+
+
+def group_detections(detections):
+    """Group detections by measurement model and timestamp
+
+    Parameters
+    ----------
+    detections : iterable of :class:`~.Detection`
+        Detections to group. If a :class:`DetectionIndex`, its existing
+        groups are returned.
+
+    Returns
+    -------
+    dict
+        Lists of detections, in iteration order, keyed by tuple of
+        measurement model and timestamp.
+    """
+    if isinstance(detections, DetectionIndex):
+        return detections.groups
+    groups = defaultdict(list)
+    for detection in detections:
+        groups[detection.measurement_model, detection.timestamp].append(
+            detection)
+    return dict(groups)
+
+
+def max_covariance_radius(covar, distance, mapping=None):
+    """Euclidean radius containing a Mahalanobis distance ellipsoid
+
+    Parameters
+    ----------
+    covar : :class:`numpy.ndarray`
+        Covariance matrix
+    distance : float
+        Mahalanobis distance
+    mapping : sequence of int, optional
+        Elements of covariance to use. Default `None`, where all are used.
+
+    Returns
+    -------
+    float
+        Radius, from largest eigenvalue of `covar`, with a small margin for
+        numerical error.
+    """
+    covar = np.asarray(covar, dtype=np.float_)
+    if mapping is not None:
+        covar = covar[np.ix_(mapping, mapping)]
+    return distance * np.sqrt(np.linalg.eigvalsh(covar)[-1]) * (1 + 1e-9)
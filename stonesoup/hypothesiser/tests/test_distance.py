@@ -3,8 +3,10 @@ from operator import attrgetter
 import datetime
 
 import numpy as np
+import pytest
 
 from ..distance import DistanceHypothesiser
+from ..spatial import DetectionIndex
 from ...types.detection import Detection
 from ...types.state import GaussianState
 from ...types.track import Track
@@ -67,3 +69,62 @@ def test_distance_include_all(predictor, updater):
     last_hypothesis = hypotheses[-1]
     assert last_hypothesis.measurement is detection3
     assert last_hypothesis.distance > hypothesiser.missed_distance
+
+
+@pytest.mark.parametrize('measure', [
+    measures.Mahalanobis(), measures.Euclidean(), measures.Mahalanobis([0])])
+def test_distance_spatial_index(predictor, updater, measure):
+
+    timestamp = datetime.datetime.now()
+    track = Track([GaussianState(
+        np.array([[0], [0]]), np.diag([1, 4]), timestamp)])
+    detections = {Detection(np.array([[x], [y]]), timestamp=timestamp)
+                  for x in range(-10, 11, 2) for y in range(-10, 11, 2)}
+
+    hypothesiser = DistanceHypothesiser(
+        predictor, updater, measure=measure, missed_distance=3)
+    index_hypothesiser = DistanceHypothesiser(
+        predictor, updater, measure=measure, missed_distance=3,
+        spatial_index=True)
+
+    hypotheses = hypothesiser.hypothesise(track, detections, timestamp)
+    for index_detections in (detections, DetectionIndex(detections)):
+        index_hypotheses = index_hypothesiser.hypothesise(
+            track, index_detections, timestamp)
+        assert {hypothesis.measurement for hypothesis in index_hypotheses
+                if hypothesis} \
+            == {hypothesis.measurement for hypothesis in hypotheses
+                if hypothesis}
+        assert len(index_hypotheses) < len(detections)
+
+
+def test_distance_grouped_predictions(predictor, updater):
+
+    timestamp = datetime.datetime.now()
+    later_timestamp = timestamp + datetime.timedelta(seconds=1)
+    track = Track([GaussianState(np.array([[0]]), np.array([[1]]), timestamp)])
+    detections = [Detection(np.array([[value]]), timestamp=detection_time)
+                  for value in range(5)
+                  for detection_time in (timestamp, later_timestamp)]
+
+    predict = predictor.predict
+    prediction_times = []
+
+    def counting_predict(prior, timestamp=None, **kwargs):
+        prediction_times.append(timestamp)
+        return predict(prior, timestamp=timestamp, **kwargs)
+    predictor.predict = counting_predict
+
+    hypothesiser = DistanceHypothesiser(
+        predictor, updater, measure=measures.Mahalanobis(),
+        include_all=True)
+    hypotheses = hypothesiser.hypothesise(track, detections, timestamp)
+
+    assert len(hypotheses) == 11
+    # One prediction for missed detection, and one per detection timestamp
+    assert sorted(prediction_times) \
+        == [timestamp, timestamp, later_timestamp]
+    for hypothesis in hypotheses:
+        if hypothesis:
+            assert hypothesis.prediction.timestamp \
+                == hypothesis.measurement.timestamp
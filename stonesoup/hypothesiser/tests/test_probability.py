@@ -2,6 +2,7 @@
 import datetime
 
 import numpy as np
+import pytest
 
 from ..probability import PDAHypothesiser
 from ...types.detection import Detection, MissedDetection
@@ -42,3 +43,29 @@ def test_pda(predictor, updater):
     assert any(isinstance(hypothesis.measurement, MissedDetection)
                for hypothesis in
                mulltihypothesis)
+
+
+def test_pda_spatial_index(predictor, updater):
+
+    timestamp = datetime.datetime.now()
+    track = Track([GaussianState(np.array([[0]]), np.array([[1]]), timestamp)])
+    detection1 = Detection(np.array([[2]]))
+    detection2 = Detection(np.array([[8]]))
+    detections = {detection1, detection2}
+
+    hypothesiser = PDAHypothesiser(predictor, updater,
+                                   clutter_spatial_density=1.2e-2,
+                                   prob_detect=0.9, prob_gate=0.99,
+                                   spatial_index=True)
+
+    mulltihypothesis = \
+        hypothesiser.hypothesise(track, detections, timestamp)
+
+    # Detection 2 is outside the 99% gate (predicted mean 1, variance 2)
+    assert len(mulltihypothesis) == 2
+    assert any(hypothesis.measurement is detection1 for hypothesis in
+               mulltihypothesis)
+    assert not any(hypothesis.measurement is detection2 for hypothesis in
+                   mulltihypothesis)
+    assert sum(float(hypothesis.probability)
+               for hypothesis in mulltihypothesis) == pytest.approx(1)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import numpy as np
+
+from ..spatial import (
+    DetectionIndex, group_detections, max_covariance_radius)
+from ...models.measurement.linear import LinearGaussian
+from ...types.angle import Bearing, Elevation
+from ...types.array import StateVector
+from ...types.detection import Detection
+
+
+def test_detection_index():
+    timestamp = datetime.datetime.now()
+    model = LinearGaussian(4, [0, 2], np.eye(2))
+    detections = {Detection(np.array([[x], [y]]), timestamp=timestamp)
+                  for x in range(5) for y in range(5)}
+    other_detections = {
+        Detection(np.array([[0], [0]]), timestamp=timestamp,
+                  measurement_model=model),
+        Detection(np.array([[0], [0]]))}
+    index = DetectionIndex(detections | other_detections)
+
+    assert len(index) == 27
+    assert index == detections | other_detections
+    assert all(detection in index for detection in detections)
+    assert set(index.groups) == {
+        (None, timestamp), (model, timestamp), (None, None)}
+
+    found = index.query((None, timestamp), np.array([[2], [2]]), 1)
+    assert {tuple(detection.state_vector.ravel()) for detection in found} \
+        == {(2, 2), (1, 2), (3, 2), (2, 1), (2, 3)}
+
+    found = index.query((None, timestamp), np.array([2]), 1, mapping=[0])
+    assert {detection.state_vector[0, 0] for detection in found} \
+        == {1, 2, 3}
+    assert len(found) == 15
+
+    assert len(index.query((None, timestamp), [2, 2], np.inf)) == 25
+    assert len(index.query((model, timestamp), [10, 10], 1)) == 0
+    assert len(index.query((model, None), [0, 0], 1)) == 0
+
+
+def test_detection_index_angles():
+    timestamp = datetime.datetime.now()
+    detections = [
+        Detection(StateVector([[Bearing(bearing)], [Elevation(elevation)],
+                               [10.]]),
+                  timestamp=timestamp)
+        for bearing, elevation in (
+            (np.pi - 0.05, 0.), (-np.pi + 0.05, 1.), (0., 0.))]
+    index = DetectionIndex(detections)
+    group = (None, timestamp)
+
+    # Found across wrap, with elevation not indexed
+    found = index.query(group, np.array([np.pi - 0.05, 0., 10.]), 0.2)
+    assert set(found) == set(detections[:2])
+    found = index.query(group, np.array([-np.pi + 0.1, -1., 10.]), 0.2)
+    assert set(found) == set(detections[:2])
+    assert index.query(group, np.array([0., 0., 10.5]), 0.2) == []
+
+    # Elevation only, so not indexed
+    found = index.query(group, np.array([1.]), 0.1, mapping=[1])
+    assert set(found) == set(detections)
+
+
+def test_max_covariance_radius():
+    covar = np.diag([1., 9., 4.])
+    assert np.isclose(max_covariance_radius(covar, 2), 6)
+    assert np.isclose(max_covariance_radius(covar, 2, [0, 2]), 4)
+
+
+def test_group_detections():
+    timestamp = datetime.datetime.now()
+    model = LinearGaussian(2, [0], np.eye(1))
+    detections = [
+        Detection(np.array([[0]]), timestamp=timestamp),
+        Detection(np.array([[1]]), timestamp=timestamp,
+                  measurement_model=model),
+        Detection(np.array([[2]]), timestamp=timestamp),
+        Detection(np.array([[3]]))]
+
+    groups = group_detections(detections)
+    assert groups == {
+        (None, timestamp): [detections[0], detections[2]],
+        (model, timestamp): [detections[1]],
+        (None, None): [detections[3]]}
+
+    index = DetectionIndex(detections)
+    assert group_detections(index) is index.groups
+    assert {key: set(value) for key, value in index.groups.items()} \
+        == {key: set(value) for key, value in groups.items()}
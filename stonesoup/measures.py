@@ -5,6 +5,7 @@ import numpy as np
 from scipy.spatial import distance
 
 from .base import Base, Property
+from .functions import gauss_innovation_scores
 
 
 class Measure(Base):
@@ -38,6 +39,46 @@ class Measure(Base):
         """
         return NotImplementedError
 
+    def _difference(self, state_vector1, state_vectors):
+        """Mapped difference of state vectors, as floats
+
+        The difference is taken before conversion to floats, such that
+        angles (e.g. :class:`~.Bearing`) wrap, for both pairs of states and
+        :meth:`distances`."""
+        difference = state_vectors - state_vector1
+        if self.mapping is not None:
+            difference = difference[self.mapping, :]
+        return np.asarray(difference, dtype=np.float_)
+
+    def distances(self, state1, states):
+        r"""
+        Compute the distance between a :class:`~.State` and each of many
+        :class:`~.State` objects
+
+        Subclasses may override this to compute all distances in a single
+        vectorised operation. The default calls the measure for each pair.
+
+        Parameters
+        ----------
+        state1 : :class:`~.State`
+        states : sequence of :class:`~.State`
+
+        Returns
+        -------
+        numpy.ndarray of shape (len(states),)
+            distance measure between `state1` and each of `states`
+
+        """
+        return np.array([self(state1, state2) for state2 in states],
+                        dtype=np.float_)
+
+    @staticmethod
+    def _state_vectors(states):
+        """State vectors of states, stacked as columns"""
+        if not states:
+            return None
+        return np.hstack([state.state_vector for state in states])
+
 
 class Euclidean(Measure):
     r"""Euclidean distance measure
@@ -67,11 +108,29 @@ class Euclidean(Measure):
 
         """
         # Calculate Euclidean distance between two state
-        if self.mapping is not None:
-            return distance.euclidean(state1.state_vector[self.mapping],
-                                      state2.state_vector[self.mapping])
-        else:
-            return distance.euclidean(state1.state_vector, state2.state_vector)
+        return np.linalg.norm(
+            self._difference(state1.state_vector, state2.state_vector))
+
+    def distances(self, state1, states):
+        r"""Calculate the Euclidean distance between a state vector and each
+        of many state vectors
+
+        Parameters
+        ----------
+        state1 : :class:`~.State`
+        states : sequence of :class:`~.State`
+
+        Returns
+        -------
+        numpy.ndarray of shape (len(states),)
+            Euclidean distance between `state1` and each of `states`
+
+        """
+        state_vectors = self._state_vectors(states)
+        if state_vectors is None:
+            return np.empty((0, ))
+        return np.linalg.norm(
+            self._difference(state1.state_vector, state_vectors), axis=0)
 
 
 class EuclideanWeighted(Measure):
@@ -155,20 +214,52 @@ class Mahalanobis(Measure):
 
         """
         if self.mapping is not None:
-            u = state1.state_vector[self.mapping]
-            v = state2.state_vector[self.mapping]
             # extract the mapped covariance data
             rows = np.array(self.mapping, dtype=np.intp)
             columns = np.array(self.mapping, dtype=np.intp)
             cov = state1.covar[rows[:, np.newaxis], columns]
         else:
-            u = state1.state_vector
-            v = state2.state_vector
             cov = state1.covar
 
         vi = np.linalg.inv(cov)
+        delta = self._difference(
+            state1.state_vector, state2.state_vector).ravel()
+
+        return distance.mahalanobis(delta, np.zeros_like(delta), vi)
+
+    def distances(self, state1, states):
+        r"""Calculate the Mahalanobis distance between a state object and
+        each of many state objects
+
+        The covariance of `state1` is factorised once, such that the cost is
+        a single Cholesky decomposition and triangular solve for all states.
+
+        Parameters
+        ----------
+        state1 : :class:`~.State`
+        states : sequence of :class:`~.State`
+
+        Returns
+        -------
+        numpy.ndarray of shape (len(states),)
+            Mahalanobis distance between `state1` and each of `states`
+
+        """
+        state_vectors = self._state_vectors(states)
+        if state_vectors is None:
+            return np.empty((0, ))
+        if self.mapping is not None:
+            # extract the mapped covariance data
+            rows = np.array(self.mapping, dtype=np.intp)
+            columns = np.array(self.mapping, dtype=np.intp)
+            cov = state1.covar[rows[:, np.newaxis], columns]
+        else:
+            cov = state1.covar
 
-        return distance.mahalanobis(u, v, vi)
+        differences = self._difference(state1.state_vector, state_vectors)
+        _, distances = gauss_innovation_scores(
+            differences, np.zeros((differences.shape[0], 1)), cov)
+        return distances
 
 
 class SquaredGaussianHellinger(Measure):
@@ -1,6 +1,28 @@
 # -*- coding: utf-8 -*-
+from abc import abstractmethod
+
 from ..base import Base
 
 
 class MixtureReducer(Base):
-    """Mixture Reducer base class"""
+    """Mixture Reducer base class
+
+    Reduces the number of components of a mixture, e.g. by pruning and
+    merging.
+    """
+
+    @abstractmethod
+    def reduce(self, components):
+        """Reduce mixture components
+
+        Parameters
+        ----------
+        components : list of :class:`~.WeightedGaussianState`
+            Components of the mixture
+
+        Returns
+        -------
+        : list of :class:`~.WeightedGaussianState`
+            Reduced components of the mixture
+        """
+        raise NotImplementedError
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import copy
+
+import numpy as np
+
+from .base import MixtureReducer
+from ..base import Property
+from ..functions import gm_reduce_single
+
+
+class GaussianMixtureReducer(MixtureReducer):
+    """Gaussian mixture reducer
+
+    Reduces a mixture of :class:`~.WeightedGaussianState` components by, in
+    turn:
+
+    1. Pruning components with weight below :attr:`prune_threshold`.
+    2. Merging components within squared Mahalanobis distance
+       :attr:`merge_threshold` of the highest weighted remaining component,
+       repeatedly, as per [1]_. Mahalanobis distances are calculated for all
+       candidates at once from the stacked component arrays, with each
+       component's covariance inverted only once.
+    3. Capping the number of components at :attr:`max_components`, keeping
+       those with highest weight.
+
+    Any stage can be disabled by setting its property to `None`. Merged
+    components are copies of the highest weighted component merged, so
+    retain any other attributes (e.g. tag of a
+    :class:`~.TaggedWeightedGaussianState`).
+    Components are returned in descending weight order.
+
+    References
+    ----------
+    .. [1] Vo, B.-N. and Ma, W.-K., "The Gaussian Mixture Probability
+       Hypothesis Density Filter", IEEE Transactions on Signal Processing,
+       vol. 54, no. 11, pp. 4091-4104, 2006.
+    """
+
+    prune_threshold = Property(
+        float,
+        default=1e-5,
+        doc="Weight below which components are pruned. Default 1e-5.")
+    merge_threshold = Property(
+        float,
+        default=4.,
+        doc="Squared Mahalanobis distance within which components are "
+            "merged. Default 4.")
+    max_components = Property(
+        int,
+        default=None,
+        doc="Maximum number of components. Default `None`, where the number "
+            "isn't capped.")
+
+    def reduce(self, components):
+        components = list(components)
+        if not components:
+            return []
+        means, covars, weights = self.stack(components)
+        indices = np.arange(len(components))
+
+        if self.prune_threshold is not None:
+            indices = indices[weights >= self.prune_threshold]
+
+        if self.merge_threshold is not None:
+            reduced = self._merge(
+                components, means, covars, weights, indices)
+        else:
+            reduced = [components[index] for index in indices]
+
+        reduced.sort(key=lambda component: component.weight, reverse=True)
+        if self.max_components is not None:
+            reduced = reduced[:self.max_components]
+        return reduced
+
+    @staticmethod
+    def stack(components):
+        """Stack mixture components into arrays
+
+        Parameters
+        ----------
+        components : list of :class:`~.WeightedGaussianState`
+            Components of the mixture
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (num_components, num_dims)
+            Means of components
+        : :class:`numpy.ndarray` of shape \
+        (num_components, num_dims, num_dims)
+            Covariances of components
+        : :class:`numpy.ndarray` of shape (num_components, )
+            Weights of components
+        """
+        means = np.array(
+            [np.ravel(component.state_vector) for component in components],
+            dtype=np.float_)
+        covars = np.array(
+            [component.covar for component in components], dtype=np.float_)
+        weights = np.array(
+            [component.weight for component in components], dtype=np.float_)
+        return means, covars, weights
+
+    def _merge(self, components, means, covars, weights, indices):
+        inv_covars = np.linalg.inv(covars[indices])
+        # Remaining indices, in descending weight order
+        order = np.argsort(-weights[indices], kind='stable')
+        remaining = indices[order]
+        remaining_inv_covars = inv_covars[order]
+
+        merged = []
+        while remaining.size:
+            best = remaining[0]
+            differences = means[remaining] - means[best]
+            distances = np.einsum(
+                'ni,nij,nj->n', differences, remaining_inv_covars, differences)
+            in_merge = distances <= self.merge_threshold
+            merge_indices = remaining[in_merge]
+
+            component = components[best]
+            if merge_indices.size > 1:
+                mean, covar = gm_reduce_single(
+                    means[merge_indices], covars[merge_indices],
+                    weights[merge_indices])
+                component = copy.copy(component)
+                component.state_vector = type(component.state_vector)(mean)
+                component.covar = type(component.covar)(covar)
+                component.weight = float(np.sum(weights[merge_indices]))
+            merged.append(component)
+
+            remaining = remaining[~in_merge]
+            remaining_inv_covars = remaining_inv_covars[~in_merge]
+        return merged
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from ..gaussianmixture import GaussianMixtureReducer
+from ...types.state import TaggedWeightedGaussianState
+
+
+@pytest.fixture()
+def components():
+    return [
+        TaggedWeightedGaussianState(
+            np.array([[0.], [0.]]), np.eye(2), weight=0.5, tag='a'),
+        TaggedWeightedGaussianState(
+            np.array([[1.], [0.]]), np.eye(2), weight=0.3, tag='b'),
+        TaggedWeightedGaussianState(
+            np.array([[10.], [0.]]), np.eye(2), weight=0.4, tag='c'),
+        TaggedWeightedGaussianState(
+            np.array([[20.], [0.]]), np.eye(2), weight=1e-7, tag='d')]
+
+
+def test_prune(components):
+    reducer = GaussianMixtureReducer(merge_threshold=None)
+    reduced = reducer.reduce(components)
+    assert [component.tag for component in reduced] == ['a', 'c', 'b']
+
+    reducer = GaussianMixtureReducer(
+        prune_threshold=None, merge_threshold=None)
+    assert len(reducer.reduce(components)) == 4
+
+
+def test_merge(components):
+    reducer = GaussianMixtureReducer()
+    reduced = reducer.reduce(components)
+    assert len(reduced) == 2
+
+    merged, other = reduced
+    # Merged takes tag of highest weighted component
+    assert merged.tag == 'a'
+    assert merged.weight == pytest.approx(0.8)
+    assert np.allclose(merged.state_vector, [[0.375], [0]])
+    spread = (0.5*0.375**2 + 0.3*0.625**2) / 0.8
+    assert np.allclose(merged.covar, np.diag([1 + spread, 1]))
+    # Inputs unchanged
+    assert components[0].weight == 0.5
+    assert np.array_equal(components[0].state_vector, [[0], [0]])
+
+    assert other is components[2]
+
+
+def test_cap(components):
+    reducer = GaussianMixtureReducer(merge_threshold=None, max_components=2)
+    reduced = reducer.reduce(components)
+    assert [component.tag for component in reduced] == ['a', 'c']
+
+    assert reducer.reduce([]) == []
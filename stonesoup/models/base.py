@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import abstractmethod
+from functools import wraps
 
 import numpy as np
 from scipy.stats import multivariate_normal
@@ -9,10 +10,134 @@ from ..functions import jacobian as compute_jac
 from ..types.numeric import Probability
 
 
+def vectorised(method):
+    """Mark a model method as supporting multiple state vectors
+
+    Methods :meth:`~.Model.function`, :meth:`~.Model.rvs`,
+    :meth:`~.Model.pdf`, :meth:`~.Model.logpdf` and
+    :meth:`~.NonLinearModel.jacobian` defined on a :class:`~.Model` subclass
+    without this decorator are assumed to handle a single state vector, and
+    are wrapped to loop over multiple state vectors (see :class:`~.Model`).
+    """
+    method.vectorised = True
+    return method
+
+
+def _num_vectors(*state_vectors):
+    """Number of state vectors (columns) across arrays, broadcasting
+    single state vectors"""
+    num_vectors = {np.shape(state_vector)[1] for state_vector in state_vectors
+                   if np.ndim(state_vector) == 2}
+    num_vectors.discard(1)
+    if len(num_vectors) > 1:
+        raise ValueError("Inconsistent number of state vectors: {}".format(
+            sorted(num_vectors)))
+    return num_vectors.pop() if num_vectors else 1
+
+
+def _column(array, index):
+    """Column of array, if array of multiple state vectors"""
+    if np.ndim(array) == 2 and np.shape(array)[1] > 1:
+        return array[:, index:index+1]
+    return array
+
+
+def _loop_function(method):
+    @wraps(method)
+    @vectorised
+    def function(self, state_vector, noise=None, **kwargs):
+        num_vectors = _num_vectors(state_vector)
+        if num_vectors == 1:
+            return method(self, state_vector, noise=noise, **kwargs)
+        if noise is None:
+            noise = self.rvs(num_samples=num_vectors, **kwargs)
+        return np.hstack([
+            method(self, _column(state_vector, index),
+                   noise=_column(noise, index), **kwargs)
+            for index in range(num_vectors)])
+    return function
+
+
+def _loop_rvs(method):
+    @wraps(method)
+    @vectorised
+    def rvs(self, num_samples=1, **kwargs):
+        if num_samples == 1:
+            return method(self, **kwargs)
+        return np.hstack([method(self, **kwargs)
+                          for _ in range(num_samples)])
+    return rvs
+
+
+def _loop_pdf(method):
+    @wraps(method)
+    @vectorised
+    def pdf(self, *state_vectors, **kwargs):
+        num_vectors = _num_vectors(*state_vectors)
+        if num_vectors == 1:
+            return method(self, *state_vectors, **kwargs)
+        values = np.empty(num_vectors, dtype=object)
+        values[:] = [
+            method(self, *(_column(state_vector, index)
+                           for state_vector in state_vectors),
+                   **kwargs)
+            for index in range(num_vectors)]
+        if method.__name__ == 'logpdf':
+            values = values.astype(np.float_)
+        return values
+    return pdf
+
+
+def _loop_jacobian(method):
+    @wraps(method)
+    @vectorised
+    def jacobian(self, state_vector, **kwargs):
+        num_vectors = _num_vectors(state_vector)
+        if num_vectors == 1:
+            return method(self, state_vector, **kwargs)
+        return np.stack([
+            method(self, state_vector[:, index:index+1], **kwargs)
+            for index in range(num_vectors)])
+    return jacobian
+
+
 class Model(Base):
     """Model type
 
-    Base/Abstract class for all models."""
+    Base/Abstract class for all models.
+
+    Models evaluate multiple state vectors in a single call, given as an
+    array of shape `(ndim, N)` with one state vector per column:
+
+    * :meth:`function` returns an array of shape `(ndim_out, N)`, where
+      `noise` may be a single sample, or one per state vector.
+    * :meth:`rvs` returns `num_samples` samples, of shape `(ndim, N)`.
+    * :meth:`pdf` and :meth:`logpdf` broadcast single state vectors against
+      multiple, returning arrays of shape `(N, )` (scalars where `N` is 1).
+    * :meth:`~.NonLinearModel.jacobian` returns an array of shape
+      `(N, ndim_out, ndim)` (a single matrix where `N` is 1).
+
+    Subclasses which implement these methods for a single state vector
+    only, i.e. without the :func:`vectorised` decorator, have them wrapped
+    to loop over state vectors, such that all models meet this contract.
+    """
+
+    _loop_wrappers = {
+        'function': _loop_function,
+        'rvs': _loop_rvs,
+        'pdf': _loop_pdf,
+        'logpdf': _loop_pdf,
+        'jacobian': _loop_jacobian,
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, loop_wrapper in cls._loop_wrappers.items():
+            method = cls.__dict__.get(name)
+            if callable(method) \
+                    and not getattr(method, 'vectorised', False) \
+                    and not getattr(method, '__isabstractmethod__', False):
+                setattr(cls, name, loop_wrapper(method))
 
     @property
     @abstractmethod
@@ -35,6 +160,22 @@ class Model(Base):
         """Model pdf/likelihood evaluator method"""
         pass
 
+    @vectorised
+    def logpdf(self, state_vector1, state_vector2, **kwargs):
+        """Model log pdf/likelihood evaluator method
+
+        Default implementation takes the log of :meth:`pdf`.
+
+        Returns
+        -------
+        : float or :class:`numpy.ndarray` of shape `(N, )`
+            The log likelihood of ``state_vector1``, given ``state_vector2``
+        """
+        pdf = self.pdf(state_vector1, state_vector2, **kwargs)
+        if isinstance(pdf, np.ndarray):
+            return np.array([Probability(value).log_value for value in pdf])
+        return Probability(pdf).log_value
+
 
 class LinearModel(Model):
     """LinearModel class
@@ -46,6 +187,7 @@ class LinearModel(Model):
         """ Model matrix"""
         pass
 
+    @vectorised
     def function(self, state_vector, noise=None, **kwargs):
         """Model linear function :math:`f_k(x(k),w(k)) = F_k(x_k) + w_k`
 
@@ -66,7 +208,7 @@ class LinearModel(Model):
 
         if noise is None:
             # TODO: doesn't make sense for noise=None to generate noise
-            noise = self.rvs(**kwargs)
+            noise = self.rvs(num_samples=_num_vectors(state_vector), **kwargs)
 
         return self.matrix(**kwargs) @ state_vector + noise
 
@@ -76,6 +218,7 @@ class NonLinearModel(Model):
 
     Base/Abstract class for all non-linear models"""
 
+    @vectorised
     def jacobian(self, state_vector, **kwargs):
         """Model jacobian matrix :math:`H_{jac}`
 
@@ -89,12 +232,19 @@ class NonLinearModel(Model):
         :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, \
         :py:attr:`~ndim_state`)
             The model jacobian matrix evaluated around the given state vector.
+            For multiple state vectors, of shape `(N, ndim_meas, ndim_state)`.
         """
 
+        @vectorised
         def fun(x):
-            return self.function(x, noise=0)
+            return self.function(x, noise=0, **kwargs)
 
-        return compute_jac(fun, state_vector)
+        num_vectors = _num_vectors(state_vector)
+        if num_vectors == 1:
+            return compute_jac(fun, state_vector)
+        return np.stack([
+            compute_jac(fun, state_vector[:, index:index+1])
+            for index in range(num_vectors)])
 
     @abstractmethod
     def function(self, state_vector, noise=None, **kwargs):
@@ -160,6 +310,7 @@ class GaussianModel(Model):
 
     Base/Abstract class for all Gaussian models"""
 
+    @vectorised
     def rvs(self, num_samples=1, **kwargs):
         r"""Model noise/sample generation function
 
@@ -188,8 +339,9 @@ class GaussianModel(Model):
         noise = multivariate_normal.rvs(
             np.zeros(self.ndim), self.covar(**kwargs), num_samples)
 
-        return np.atleast_2d(noise).T
+        return np.reshape(noise, (num_samples, self.ndim)).T
 
+    @vectorised
     def pdf(self, state_vector1, state_vector2, **kwargs):
         r"""Model pdf/likelihood evaluation function
 
@@ -213,15 +365,47 @@ class GaussianModel(Model):
         Returns
         -------
         : :class:`~.Probability`
-            The likelihood of ``state_vector1``, given ``state_vector2``
+            The likelihood of ``state_vector1``, given ``state_vector2``. For
+            multiple state vectors, an array of shape `(N, )`.
+        """
+
+        log_likelihood = self.logpdf(state_vector1, state_vector2, **kwargs)
+        if isinstance(log_likelihood, np.ndarray):
+            likelihood = np.empty(log_likelihood.shape, dtype=object)
+            likelihood[:] = [Probability(value, log_value=True)
+                             for value in log_likelihood]
+            return likelihood
+        return Probability(log_likelihood, log_value=True)
+
+    @vectorised
+    def logpdf(self, state_vector1, state_vector2, **kwargs):
+        r"""Model log pdf/likelihood evaluation function
+
+        Evaluates the log of :meth:`pdf`.
+
+        Parameters
+        ----------
+        state_vector1 : :class:`~.StateVector`
+        state_vector2 : :class:`~.StateVector`
+
+        Returns
+        -------
+        : float
+            The log likelihood of ``state_vector1``, given ``state_vector2``.
+            For multiple state vectors, an array of shape `(N, )`.
         """
 
-        likelihood = multivariate_normal.logpdf(
-            state_vector1.T,
-            mean=self.function(state_vector2, noise=0, **kwargs).ravel(),
-            cov=self.covar(**kwargs)
-        )
-        return Probability(likelihood, log_value=True)
+        num_vectors = _num_vectors(state_vector1, state_vector2)
+        innovations = \
+            np.asarray(state_vector1, dtype=np.float_) \
+            - np.asarray(self.function(state_vector2, noise=0, **kwargs),
+                         dtype=np.float_)
+        log_likelihood = multivariate_normal.logpdf(
+            np.reshape(innovations.T, (-1, self.ndim)),
+            cov=self.covar(**kwargs))
+        if num_vectors == 1:
+            return float(log_likelihood)
+        return np.broadcast_to(log_likelihood, (num_vectors, )).copy()
 
     @abstractmethod
     def covar(self):
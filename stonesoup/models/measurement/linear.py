@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import scipy as sp
 
 from ...base import Property
 from ...types.array import CovarianceMatrix
-from ..base import LinearModel, GaussianModel
+from ..base import LinearModel, GaussianModel, vectorised
 from .base import MeasurementModel
 
 
@@ -55,25 +56,28 @@ class LinearGaussian(MeasurementModel, LinearModel, GaussianModel):
 
         return model_matrix
 
+    @vectorised
     def function(self, state_vector, noise=None, **kwargs):
         """Model function :math:`h(t,x(t),w(t))`
 
         Parameters
         ----------
         state_vector: :class:`~.StateVector`
-            An input state vector
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
         noise: :class:`numpy.ndarray`
             An externally generated random process noise sample (the default in
             `None`, in which case process noise will be added via :meth:`rvs`)
 
         Returns
         -------
-        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, 1)
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, N)
             The model function evaluated given the provided time interval.
         """
 
         if noise is None:
-            noise = self.rvs()  # TODO: change noise=None generates noise!
+            # TODO: change noise=None generates noise!
+            noise = self.rvs(num_samples=np.shape(state_vector)[1])
 
         return self.matrix(**kwargs)@state_vector + noise
 
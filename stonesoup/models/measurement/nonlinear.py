@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import scipy as sp
-from numpy.linalg import inv
 
 from ...base import Property
 
@@ -10,10 +10,20 @@ from ...functions import cart2pol, pol2cart, \
     rotx, roty, rotz
 from ...types.array import StateVector, CovarianceMatrix
 from ...types.angle import Bearing, Elevation
-from ..base import NonLinearModel, GaussianModel, ReversibleModel
+from ..base import NonLinearModel, GaussianModel, ReversibleModel, \
+    vectorised
 from .base import MeasurementModel
 
 
+def _measurement_array(*rows):
+    """Object array of shape (ndim_meas, N) from rows of measurement
+    elements, such that angle types are retained"""
+    array = np.empty((len(rows), len(rows[0])), dtype=object)
+    for index, row in enumerate(rows):
+        array[index, :] = row
+    return array
+
+
 class NonLinearGaussianMeasurement(MeasurementModel,
                                    NonLinearModel,
                                    GaussianModel):
@@ -30,6 +40,29 @@ class NonLinearGaussianMeasurement(MeasurementModel,
             counter-clockwise direction when viewed by an observer looking\
             along the respective rotation axis, towards the origin.")
 
+    def __init__(self, *args, **kwargs):
+        self.clear_cache()
+        super().__init__(*args, **kwargs)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in type(self)._properties:
+            self.clear_cache()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def clear_cache(self):
+        """Clear cached rotation and translation
+
+        These are cleared when a property is set, but this should be called
+        if :py:attr:`rotation_offset` or :py:attr:`translation_offset` is
+        modified in place.
+        """
+        self._cache = {}
+
     def covar(self, **kwargs):
         """Returns the measurement model noise covariance matrix.
 
@@ -43,22 +76,98 @@ class NonLinearGaussianMeasurement(MeasurementModel,
         return self.noise_covar
 
     @property
-    def _rotation_matrix(self):
-        """_rotation_matrix getter method
+    def rotation_matrix(self):
+        """Cached (3D) axis rotation matrix
 
-        Calculates and returns the (3D) axis rotation matrix.
+        Calculated from :py:attr:`rotation_offset`, and applied to
+        coordinates relative to :py:attr:`translation_offset`.
 
         Returns
         -------
         :class:`numpy.ndarray` of shape (3, 3)
-            The model (3D) rotation matrix.
+            The model (3D) rotation matrix. This is read-only.
         """
+        try:
+            return self._cache['rotation_matrix']
+        except KeyError:
+            pass
 
         theta_x = -self.rotation_offset[0, 0]
         theta_y = -self.rotation_offset[1, 0]
         theta_z = -self.rotation_offset[2, 0]
 
-        return rotz(theta_z)@roty(theta_y)@rotx(theta_x)
+        rotation_matrix = rotz(theta_z)@roty(theta_y)@rotx(theta_x)
+        rotation_matrix.flags.writeable = False
+        self._cache['rotation_matrix'] = rotation_matrix
+        return rotation_matrix
+
+    @property
+    def inverse_rotation_matrix(self):
+        """Cached inverse of :py:attr:`rotation_matrix`
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of shape (3, 3)
+            The inverse model (3D) rotation matrix. This is read-only.
+        """
+        try:
+            return self._cache['inverse_rotation_matrix']
+        except KeyError:
+            pass
+
+        # Rotation matrices are orthogonal
+        inverse_rotation_matrix = self.rotation_matrix.T.copy()
+        inverse_rotation_matrix.flags.writeable = False
+        self._cache['inverse_rotation_matrix'] = inverse_rotation_matrix
+        return inverse_rotation_matrix
+
+    @property
+    def translation_vector(self):
+        """Cached :py:attr:`translation_offset` as float array
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of shape (len(:py:attr:`~mapping`), 1)
+            The translation offset, which is subtracted from mapped state
+            vector elements. This is read-only.
+        """
+        try:
+            return self._cache['translation_vector']
+        except KeyError:
+            pass
+
+        translation_vector = np.array(
+            self.translation_offset, dtype=np.float_).reshape(-1, 1)
+        translation_vector.flags.writeable = False
+        self._cache['translation_vector'] = translation_vector
+        return translation_vector
+
+    def _rotated_coordinates(self, state_vector):
+        """Cartesian coordinates of (ndim_state, N) state vectors, relative
+        to, and rotated to, the model's origin, as array of shape (3, N)"""
+        xyz = np.asarray(state_vector, dtype=np.float_)[self.mapping, :] \
+            - self.translation_vector
+        rotation_matrix = self.rotation_matrix
+        # Only rotate the mapped coordinates, as others are zero
+        return rotation_matrix[:, :len(xyz)] @ xyz
+
+    def _unrotated_coordinates(self, xyz_rot):
+        """Inverse of :meth:`_rotated_coordinates`, returning mapped
+        coordinates of shape (len(mapping), N) from array of shape (3, N)"""
+        ndim_mapped = len(self.mapping)
+        return self.inverse_rotation_matrix[:ndim_mapped, :] @ xyz_rot \
+            + self.translation_vector
+
+    def _state_jacobian(self, partials, state_vector):
+        """Jacobian with respect to state vectors, from (N, ndim_meas, 3)
+        partial derivatives with respect to rotated coordinates"""
+        ndim_mapped = len(self.mapping)
+        partials = partials @ self.rotation_matrix[:, :ndim_mapped]
+        jac = np.zeros((len(partials), self.ndim_meas, self.ndim_state))
+        jac[:, :, self.mapping] = partials
+        if np.shape(state_vector)[1] == 1:
+            return jac[0]
+        return jac
 
 
 class CartesianToElevationBearingRange(
@@ -139,60 +248,97 @@ class CartesianToElevationBearingRange(
 
         return 3
 
+    @vectorised
     def function(self, state_vector, noise=None, **kwargs):
         r"""Model function :math:`h(\vec{x}_t,\vec{v}_t)`
 
         Parameters
         ----------
         state_vector: :class:`~.StateVector`
-            An input state vector
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
         noise: :class:`numpy.ndarray`
             An externally generated random process noise sample (the default in
             `None`, in which case process noise will be generated internally)
 
         Returns
         -------
-        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_state`, 1)
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, N)
             The model function evaluated given the provided time interval.
         """
 
         if noise is None:
-            noise = self.rvs()
-
-        # Account for origin offset
-        xyz = state_vector[self.mapping] - self.translation_offset
+            noise = self.rvs(num_samples=np.shape(state_vector)[1])
 
-        # Rotate coordinates
-        xyz_rot = self._rotation_matrix @ xyz
+        # Account for origin offset, and rotate coordinates
+        xyz_rot = self._rotated_coordinates(state_vector)
 
         # Convert to Spherical
-        rho, phi, theta = cart2sphere(*xyz_rot[:, 0])
+        rho, phi, theta = cart2sphere(*xyz_rot)
 
-        return sp.array([[Elevation(theta)],
-                         [Bearing(phi)],
-                         [rho]]) + noise
+        return _measurement_array(
+            [Elevation(value) for value in theta],
+            [Bearing(value) for value in phi],
+            rho) + noise
 
     def inverse_function(self, state_vector, **kwargs):
 
         theta, phi, rho = state_vector[:, 0]
         x, y, z = sphere2cart(rho, phi, theta)
 
-        xyz = [[x], [y], [z]]
-        inv_rotation_matrix = inv(self._rotation_matrix)
-        xyz_rot = inv_rotation_matrix @ xyz
-        xyz = [xyz_rot[0][0], xyz_rot[1][0], xyz_rot[2][0]]
-        x, y, z = xyz + self.translation_offset[:, 0]
+        xyz = self._unrotated_coordinates(np.array([[x], [y], [z]]))
 
         res = sp.zeros((self.ndim_state, 1))
-        res[self.mapping, 0] = x, y, z
+        res[self.mapping, :] = xyz
 
         return res
 
+    @vectorised
     def rvs(self, num_samples=1, **kwargs):
         out = super().rvs(num_samples, **kwargs)
         out = sp.array([[Elevation(0.)], [Bearing(0.)], [0.]]) + out
         return out
 
+    @vectorised
+    def jacobian(self, state_vector, **kwargs):
+        """Model jacobian matrix :math:`H_{jac}`, evaluated analytically
+
+        Parameters
+        ----------
+        state_vector : :class:`~.StateVector`
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, \
+        :py:attr:`~ndim_state`)
+            The model jacobian matrix evaluated around the given state vector.
+            For multiple state vectors, of shape
+            (N, :py:attr:`~ndim_meas`, :py:attr:`~ndim_state`).
+        """
+
+        x, y, z = self._rotated_coordinates(state_vector)
+        range_xy2 = x**2 + y**2
+        range_xy = np.sqrt(range_xy2)
+        range2 = range_xy2 + z**2
+        range_ = np.sqrt(range2)
+
+        partials = np.zeros((len(x), 3, 3))
+        # Elevation
+        partials[:, 0, 0] = -x*z / (range2*range_xy)
+        partials[:, 0, 1] = -y*z / (range2*range_xy)
+        partials[:, 0, 2] = range_xy / range2
+        # Bearing
+        partials[:, 1, 0] = -y / range_xy2
+        partials[:, 1, 1] = x / range_xy2
+        # Range
+        partials[:, 2, 0] = x / range_
+        partials[:, 2, 1] = y / range_
+        partials[:, 2, 2] = z / range_
+
+        return self._state_jacobian(partials, state_vector)
+
 
 class CartesianToBearingRange(
         NonLinearGaussianMeasurement, ReversibleModel):
@@ -277,57 +423,84 @@ class CartesianToBearingRange(
         phi, rho = state_vector[:, 0]
         x, y = pol2cart(rho, phi)
 
-        xyz = [[x], [y], [0]]
-        inv_rotation_matrix = inv(self._rotation_matrix)
-        xyz_rot = inv_rotation_matrix @ xyz
-        xy = [xyz_rot[0][0], xyz_rot[1][0]]
-        x, y = xy + self.translation_offset[:, 0]
+        xy = self._unrotated_coordinates(np.array([[x], [y], [0.]]))
 
         res = sp.zeros((self.ndim_state, 1))
-        res[self.mapping, 0] = x, y
+        res[self.mapping, :] = xy
 
         return res
 
+    @vectorised
     def function(self, state_vector, noise=None, **kwargs):
         r"""Model function :math:`h(\vec{x}_t,\vec{v}_t)`
 
         Parameters
         ----------
         state_vector: :class:`~.StateVector`
-            An input state vector
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
         noise: :class:`numpy.ndarray`
             An externally generated random process noise sample (the default in
             `None`, in which case process noise will be generated internally)
 
         Returns
         -------
-        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, 1)
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, N)
             The model function evaluated given the provided time interval.
         """
 
         if noise is None:
-            noise = self.rvs()
-
-        # Account for origin offset
-        xyz = [[state_vector[self.mapping[0], 0]
-                - self.translation_offset[0, 0]],
-               [state_vector[self.mapping[1], 0]
-                - self.translation_offset[1, 0]],
-               [0]]
+            noise = self.rvs(num_samples=np.shape(state_vector)[1])
 
-        # Rotate coordinates
-        xyz_rot = self._rotation_matrix @ xyz
+        # Account for origin offset, and rotate coordinates
+        xyz_rot = self._rotated_coordinates(state_vector)
 
         # Covert to polar
-        rho, phi = cart2pol(*xyz_rot[:2, 0])
+        rho, phi = cart2pol(*xyz_rot[:2])
 
-        return sp.array([[Bearing(phi)], [rho]]) + noise
+        return _measurement_array(
+            [Bearing(value) for value in phi],
+            rho) + noise
 
+    @vectorised
     def rvs(self, num_samples=1, **kwargs):
         out = super().rvs(num_samples, **kwargs)
         out = sp.array([[Bearing(0)], [0.]]) + out
         return out
 
+    @vectorised
+    def jacobian(self, state_vector, **kwargs):
+        """Model jacobian matrix :math:`H_{jac}`, evaluated analytically
+
+        Parameters
+        ----------
+        state_vector : :class:`~.StateVector`
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, \
+        :py:attr:`~ndim_state`)
+            The model jacobian matrix evaluated around the given state vector.
+            For multiple state vectors, of shape
+            (N, :py:attr:`~ndim_meas`, :py:attr:`~ndim_state`).
+        """
+
+        x, y, _ = self._rotated_coordinates(state_vector)
+        range2 = x**2 + y**2
+        range_ = np.sqrt(range2)
+
+        partials = np.zeros((len(x), 2, 3))
+        # Bearing
+        partials[:, 0, 0] = -y / range2
+        partials[:, 0, 1] = x / range2
+        # Range
+        partials[:, 1, 0] = x / range_
+        partials[:, 1, 1] = y / range_
+
+        return self._state_jacobian(partials, state_vector)
+
 
 class CartesianToElevationBearing(NonLinearGaussianMeasurement):
     r"""This is a class implementation of a time-invariant measurement model, \
@@ -403,39 +576,75 @@ class CartesianToElevationBearing(NonLinearGaussianMeasurement):
 
         return 2
 
+    @vectorised
     def function(self, state_vector, noise=None, **kwargs):
         r"""Model function :math:`h(\vec{x}_t,\vec{v}_t)`
 
         Parameters
         ----------
         state_vector: :class:`~.StateVector`
-            An input state vector
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
         noise: :class:`numpy.ndarray`
             An externally generated random process noise sample (the default in
             `None`, in which case process noise will be generated internally)
 
         Returns
         -------
-        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_state`, 1)
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, N)
             The model function evaluated given the provided time interval.
         """
 
         if noise is None:
-            noise = self.rvs()
+            noise = self.rvs(num_samples=np.shape(state_vector)[1])
 
-        # Account for origin offset
-        xyz = state_vector[self.mapping] - self.translation_offset
-
-        # Rotate coordinates
-        xyz_rot = self._rotation_matrix @ xyz
+        # Account for origin offset, and rotate coordinates
+        xyz_rot = self._rotated_coordinates(state_vector)
 
         # Convert to Angles
-        phi, theta = cart2angles(*xyz_rot[:, 0])
+        phi, theta = cart2angles(*xyz_rot)
 
-        return sp.array([[Elevation(theta)],
-                         [Bearing(phi)]]) + noise
+        return _measurement_array(
+            [Elevation(value) for value in theta],
+            [Bearing(value) for value in phi]) + noise
 
+    @vectorised
     def rvs(self, num_samples=1, **kwargs):
         out = super().rvs(num_samples, **kwargs)
         out = sp.array([[Elevation(0.)], [Bearing(0.)]]) + out
         return out
+
+    @vectorised
+    def jacobian(self, state_vector, **kwargs):
+        """Model jacobian matrix :math:`H_{jac}`, evaluated analytically
+
+        Parameters
+        ----------
+        state_vector : :class:`~.StateVector`
+            An input state vector, or array of shape (:py:attr:`~ndim_state`,
+            N) of state vectors
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of shape (:py:attr:`~ndim_meas`, \
+        :py:attr:`~ndim_state`)
+            The model jacobian matrix evaluated around the given state vector.
+            For multiple state vectors, of shape
+            (N, :py:attr:`~ndim_meas`, :py:attr:`~ndim_state`).
+        """
+
+        x, y, z = self._rotated_coordinates(state_vector)
+        range_xy2 = x**2 + y**2
+        range_xy = np.sqrt(range_xy2)
+        range2 = range_xy2 + z**2
+
+        partials = np.zeros((len(x), 2, 3))
+        # Elevation
+        partials[:, 0, 0] = -x*z / (range2*range_xy)
+        partials[:, 0, 1] = -y*z / (range2*range_xy)
+        partials[:, 0, 2] = range_xy / range2
+        # Bearing
+        partials[:, 1, 0] = -y / range_xy2
+        partials[:, 1, 1] = x / range_xy2
+
+        return self._state_jacobian(partials, state_vector)
@@ -185,11 +185,11 @@ def test_models(h, ModelClass, state_vec, R,
     eval_m = h(state_vec, model.translation_offset, model.rotation_offset)
     assert np.array_equal(meas_pred_wo_noise, eval_m)
 
-    # Ensure ```lg.transfer_function()``` returns H
+    # Ensure analytic Jacobian matches numerical approximation
     def fun(x):
         return model.function(x, noise=0)
     H = compute_jac(fun, state_vec)
-    assert np.array_equal(H, model.jacobian(state_vec))
+    assert np.allclose(H, model.jacobian(state_vec), rtol=1e-6, atol=1e-8)
 
     # Check Jacobian has proper dimensions
     assert H.shape == (model.ndim_meas, ndim_state)
@@ -252,3 +252,166 @@ def test_models(h, ModelClass, state_vec, R,
                         model.translation_offset,
                         model.rotation_offset)).ravel(),
         cov=R)
+
+
+@pytest.mark.parametrize(
+    "ModelClass, ndim_state, translation_offset, rotation_offset",
+    [
+        (CartesianToBearingRange, 2, [[1], [-1]], [[0], [0], [1]]),
+        (CartesianToElevationBearingRange, 3, [[0], [1], [0]],
+         [[.2], [3], [-1]]),
+        (CartesianToElevationBearing, 3, [[0], [0], [0]],
+         [[-3], [0], [np.pi/3]]),
+    ],
+    ids=["standard", "RBE", "BearingsOnly"]
+)
+def test_models_batch(ModelClass, ndim_state, translation_offset,
+                      rotation_offset):
+    ndim_meas = 3 if ModelClass is CartesianToElevationBearingRange else 2
+    model = ModelClass(ndim_state=ndim_state,
+                       mapping=np.arange(ndim_state),
+                       noise_covar=np.eye(ndim_meas) * 0.1,
+                       translation_offset=np.array(translation_offset),
+                       rotation_offset=np.array(rotation_offset))
+    state_vectors = np.array([[1., -2., 3., 0.5],
+                              [2., 1., -1., -3.],
+                              [3., 1., 2., -1.]])[:ndim_state]
+    num_vectors = state_vectors.shape[1]
+
+    meas_preds = model.function(state_vectors, noise=0)
+    assert meas_preds.shape == (model.ndim_meas, num_vectors)
+    for index in range(num_vectors):
+        meas_pred = model.function(state_vectors[:, index:index+1], noise=0)
+        assert np.allclose(np.asfarray(meas_preds[:, index:index+1]),
+                           np.asfarray(meas_pred))
+        assert [type(value) for value in meas_preds[:, index]] \
+            == [type(value) for value in meas_pred[:, 0]]
+
+    noise = model.rvs(num_samples=num_vectors)
+    assert noise.shape == (model.ndim_meas, num_vectors)
+    assert np.allclose(
+        np.asfarray(model.function(state_vectors, noise=noise)),
+        np.asfarray(meas_preds + noise))
+    assert model.function(state_vectors).shape \
+        == (model.ndim_meas, num_vectors)
+
+    jacobians = model.jacobian(state_vectors)
+    assert jacobians.shape == (num_vectors, model.ndim_meas, ndim_state)
+
+    measurement = meas_preds[:, :1] + 0.1
+    log_likelihoods = model.logpdf(measurement, state_vectors)
+    likelihoods = model.pdf(measurement, state_vectors)
+    assert log_likelihoods.shape == likelihoods.shape == (num_vectors, )
+    for index in range(num_vectors):
+        state_vector = state_vectors[:, index:index+1]
+        assert np.allclose(
+            jacobians[index], model.jacobian(state_vector))
+        assert log_likelihoods[index] == approx(
+            model.logpdf(measurement, state_vector))
+        assert float(likelihoods[index]) == approx(
+            float(model.pdf(measurement, state_vector)))
+
+
+def test_model_loop_fallback():
+    class SingleStateModel(CartesianToBearingRange):
+        # Only handles a single state vector
+        def function(self, state_vector, noise=None, **kwargs):
+            assert state_vector.shape == (2, 1)
+            return super().function(state_vector, noise=noise, **kwargs)
+
+    model = SingleStateModel(ndim_state=2, mapping=[0, 1],
+                             noise_covar=np.diag([0.01, 1]))
+    base_model = CartesianToBearingRange(ndim_state=2, mapping=[0, 1],
+                                         noise_covar=np.diag([0.01, 1]))
+    state_vectors = np.array([[1., -2., 3.], [2., 1., -1.]])
+
+    assert np.allclose(
+        np.asfarray(model.function(state_vectors, noise=0)),
+        np.asfarray(base_model.function(state_vectors, noise=0)))
+    noise = model.rvs(num_samples=3)
+    assert np.allclose(
+        np.asfarray(model.function(state_vectors, noise=noise)),
+        np.asfarray(base_model.function(state_vectors, noise=noise)))
+    assert model.function(state_vectors).shape == (2, 3)
+    assert model.jacobian(state_vectors).shape == (3, 2, 2)
+    assert np.allclose(model.logpdf(state_vectors, state_vectors),
+                       base_model.logpdf(state_vectors, state_vectors))
+
+
+@pytest.mark.parametrize(
+    "ModelClass, mapping, translation_offset, noise_covar",
+    [
+        (CartesianToBearingRange, [0, 2], [[1], [-1]], np.eye(2)),
+        (CartesianToElevationBearingRange, [0, 2, 4], [[0.5], [1], [-2]],
+         np.eye(3)),
+        (CartesianToElevationBearing, [0, 2, 4], [[0.5], [1], [-2]],
+         np.eye(2)),
+    ],
+    ids=["standard", "RBE", "BearingsOnly"]
+)
+def test_models_jacobian(ModelClass, mapping, translation_offset,
+                         noise_covar):
+    model = ModelClass(ndim_state=6,
+                       mapping=mapping,
+                       noise_covar=noise_covar,
+                       translation_offset=np.array(translation_offset),
+                       rotation_offset=np.array([[0], [0], [np.pi/4]]))
+    state_vectors = np.array([[1., -2., 3.],
+                              [1., 1., 1.],
+                              [2., 1., -1.],
+                              [1., 1., 1.],
+                              [3., 1., 2.],
+                              [1., 1., 1.]])
+
+    def fun(x):
+        return model.function(x, noise=0)
+
+    jacobians = model.jacobian(state_vectors)
+    assert jacobians.shape == (3, model.ndim_meas, 6)
+    for index in range(3):
+        state_vector = state_vectors[:, index:index+1]
+        jacobian = model.jacobian(state_vector)
+        assert jacobian.shape == (model.ndim_meas, 6)
+        assert np.allclose(jacobian, jacobians[index])
+        assert np.allclose(jacobian, compute_jac(fun, state_vector),
+                           rtol=1e-6, atol=1e-8)
+        # Velocity elements are not measured
+        assert np.all(jacobian[:, [1, 3, 5]] == 0)
+
+
+def test_models_offset_cache():
+    model = CartesianToElevationBearingRange(
+        ndim_state=3,
+        mapping=[0, 1, 2],
+        noise_covar=np.eye(3),
+        translation_offset=np.array([[1], [2], [3]]),
+        rotation_offset=np.array([[0], [0], [np.pi/2]]))
+    state_vector = np.array([[2.], [2.], [3.]])
+
+    rotation_matrix = model.rotation_matrix
+    assert model.rotation_matrix is rotation_matrix
+    assert not rotation_matrix.flags.writeable
+    assert np.allclose(model.inverse_rotation_matrix @ rotation_matrix,
+                       np.eye(3))
+    assert np.allclose(model.translation_vector, [[1], [2], [3]])
+    bearing = model.function(state_vector, noise=0)[1, 0]
+    assert approx(-np.pi/2) == bearing
+
+    # Setting offsets clears cache
+    model.rotation_offset = np.array([[0], [0], [0]])
+    assert model.rotation_matrix is not rotation_matrix
+    assert np.allclose(model.rotation_matrix, np.eye(3))
+    assert approx(0) == model.function(state_vector, noise=0)[1, 0]
+
+    model.translation_offset = np.array([[0], [0], [0]])
+    assert np.allclose(model.translation_vector, 0)
+    assert approx(np.pi/4) == model.function(state_vector, noise=0)[1, 0]
+
+    # In place modification requires cache to be cleared
+    model.translation_offset[0, 0] = 2
+    model.clear_cache()
+    assert approx(np.pi/2) == model.function(state_vector, noise=0)[1, 0]
+
+    # Inverse function uses cached inverse
+    measurement = model.function(state_vector, noise=0)
+    assert np.allclose(model.inverse_function(measurement), state_vector)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import math
-from functools import lru_cache
+from functools import wraps
 
 import scipy as sp
 from scipy.linalg import block_diag
@@ -13,8 +13,74 @@ from ..base import (LinearModel, GaussianModel, TimeVariantModel,
 from .base import TransitionModel
 
 
+def interval_cached(method):
+    """Cache model matrices by time interval
+
+    Decorates :meth:`~.LinearModel.matrix` and :meth:`~.GaussianModel.covar`
+    methods of a :class:`LinearGaussianTransitionModel`, such that results
+    are stored per time interval, and returned as read-only arrays (or
+    tuples of arrays) so that callers can't modify cached values. Other
+    keyword arguments are assumed to not affect the result.
+    """
+    @wraps(method)
+    def cached_method(self, *args, **kwargs):
+        time_interval = args[0] if args else kwargs.get('time_interval')
+        key = method.__name__, time_interval, self._cache_dependencies()
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable time interval
+            return method(self, *args, **kwargs)
+
+        result = method(self, *args, **kwargs)
+        for array in result if isinstance(result, tuple) else (result, ):
+            array.flags.writeable = False
+        cache = self._cache
+        cache[key] = result
+        # Remove oldest, if over size
+        for old_key in list(cache)[:-self._cache_size]:
+            cache.pop(old_key, None)
+        return result
+    return cached_method
+
+
 class LinearGaussianTransitionModel(
         TransitionModel, LinearModel, GaussianModel):
+    """Linear Gaussian transition model base class
+
+    Models may cache their matrices per time interval, with
+    :func:`interval_cached`. Caches are cleared when a property is set, and
+    :meth:`clear_cache` should be called if a property is modified in
+    place.
+    """
+
+    _cache_size = 32  # Number of cached matrices per model
+
+    def __init__(self, *args, **kwargs):
+        self.clear_cache()
+        super().__init__(*args, **kwargs)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in type(self)._properties:
+            self.clear_cache()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def clear_cache(self):
+        """Clear matrices cached by time interval"""
+        self._cache = {}
+        # Unique token, such that dependent models can detect change
+        self._cache_version = object()
+
+    def _cache_dependencies(self):
+        """Values, other than time interval, on which cached results
+        depend, other than the model's own properties"""
+        return None
 
     @property
     def ndim_state(self):
@@ -52,6 +118,10 @@ class CombinedLinearGaussianTransitionModel(LinearGaussianTransitionModel):
         """
         return sum(model.ndim_state for model in self.model_list)
 
+    def _cache_dependencies(self):
+        return tuple(model._cache_version for model in self.model_list)
+
+    @interval_cached
     def matrix(self, **kwargs):
         """Model matrix :math:`F`
 
@@ -65,6 +135,7 @@ class CombinedLinearGaussianTransitionModel(LinearGaussianTransitionModel):
             model.matrix(**kwargs) for model in self.model_list]
         return block_diag(*transition_matrices)
 
+    @interval_cached
     def covar(self, **kwargs):
         """Returns the transition model noise covariance matrix.
 
@@ -78,6 +149,32 @@ class CombinedLinearGaussianTransitionModel(LinearGaussianTransitionModel):
         covar_list = [model.covar(**kwargs) for model in self.model_list]
         return block_diag(*covar_list)
 
+    @interval_cached
+    def block_matrices(self, **kwargs):
+        """Model matrix of each model, i.e. diagonal blocks of :math:`F`
+
+        Returns
+        -------
+        : tuple of :class:`numpy.ndarray`
+            Transition matrix of each model in :attr:`model_list`, as float
+            arrays.
+        """
+        return tuple(sp.asfarray(model.matrix(**kwargs))
+                     for model in self.model_list)
+
+    @interval_cached
+    def block_covars(self, **kwargs):
+        """Noise covariance of each model, i.e. diagonal blocks of :math:`Q`
+
+        Returns
+        -------
+        : tuple of :class:`numpy.ndarray`
+            Transition noise covariance of each model in :attr:`model_list`,
+            as float arrays.
+        """
+        return tuple(sp.asfarray(model.covar(**kwargs))
+                     for model in self.model_list)
+
 
 class LinearGaussianTimeInvariantTransitionModel(LinearGaussianTransitionModel,
                                                  TimeInvariantModel):
@@ -151,6 +248,7 @@ class ConstantNthDerivative(LinearGaussianTransitionModel, TimeVariantModel):
     def ndim_state(self):
         return self.constant_derivative + 1
 
+    @interval_cached
     def matrix(self, time_interval, **kwargs):
         time_interval_sec = time_interval.total_seconds()
         N = self.constant_derivative
@@ -162,6 +260,7 @@ class ConstantNthDerivative(LinearGaussianTransitionModel, TimeVariantModel):
 
         return Fmat
 
+    @interval_cached
     def covar(self, time_interval, **kwargs):
         time_interval_sec = time_interval.total_seconds()
         dt = time_interval_sec
@@ -344,7 +443,6 @@ class NthDerivativeDecay(LinearGaussianTransitionModel, TimeVariantModel):
         return self.decay_derivative + 1
 
     @staticmethod
-    @lru_cache()
     def _continoustransitionmatrix(t, N, K):
         FCont = sp.zeros((N + 1, N + 1))
         for i in range(0, N + 1):
@@ -356,6 +454,7 @@ class NthDerivativeDecay(LinearGaussianTransitionModel, TimeVariantModel):
                 FCont[i, j] = (t ** (j - i)) / math.factorial(j - i)
         return FCont
 
+    @interval_cached
     def matrix(self, time_interval, **kwargs):
         dt = time_interval.total_seconds()
         N = self.decay_derivative
@@ -371,7 +470,6 @@ class NthDerivativeDecay(LinearGaussianTransitionModel, TimeVariantModel):
         return CovarCont[k, l]
 
     @classmethod
-    @lru_cache()
     def _covardiscrete(cls, N, q, K, dt):
         covar = sp.zeros((N + 1, N + 1))
         for k in range(0, N + 1):
@@ -380,6 +478,7 @@ class NthDerivativeDecay(LinearGaussianTransitionModel, TimeVariantModel):
                                    dt, args=(N, K, k, l))[0]
         return covar * q
 
+    @interval_cached
     def covar(self, time_interval, **kwargs):
         N = self.decay_derivative
         q = self.noise_diff_coeff
@@ -579,6 +678,7 @@ class SingerApproximate(Singer):
                         \frac{dt^3}{6} & \frac{dt^2}{2} & dt
                         \end{bmatrix}
     """
+    @interval_cached
     def covar(self, time_interval, **kwargs):
         """Returns the transition model noise covariance matrix.
 
@@ -692,6 +792,7 @@ class ConstantTurn(LinearGaussianTransitionModel, TimeVariantModel):
 
         return 4
 
+    @interval_cached
     def matrix(self, time_interval, **kwargs):
         """Model matrix :math:`F(t)`
 
@@ -720,6 +821,7 @@ class ConstantTurn(LinearGaussianTransitionModel, TimeVariantModel):
              [0, sp.sin(turn_ratedt),
               0, sp.cos(turn_ratedt)]])
 
+    @interval_cached
     def covar(self, time_interval, **kwargs):
         """Returns the transition model noise covariance matrix.
 
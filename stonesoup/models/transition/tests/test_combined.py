@@ -1,8 +1,11 @@
 # coding: utf-8
 import datetime
+import pickle
 from numbers import Real
 
 import numpy as np
+from pytest import approx
+from scipy.linalg import block_diag
 
 from ..linear import (
     LinearGaussianTimeInvariantTransitionModel, ConstantVelocity,
@@ -35,3 +38,61 @@ def test_combined():
     assert (DIM, 1) == combined_model.rvs(time_interval=t_delta).shape
     assert isinstance(
         combined_model.pdf(x_post, x_prior, time_interval=t_delta), Real)
+
+    # Multiple state vectors
+    x_priors = np.random.randn(DIM, 5)
+    noise = combined_model.rvs(num_samples=5, time_interval=t_delta)
+    assert (DIM, 5) == noise.shape
+    x_posts = combined_model.function(
+        x_priors, noise=noise, time_interval=t_delta)
+    assert (DIM, 5) == x_posts.shape
+    assert (DIM, 5) == combined_model.function(
+        x_priors, time_interval=t_delta).shape
+    likelihoods = combined_model.pdf(x_posts, x_priors, time_interval=t_delta)
+    assert (5, ) == likelihoods.shape
+    for index in range(5):
+        assert np.allclose(
+            x_posts[:, index:index+1],
+            combined_model.function(x_priors[:, index:index+1],
+                                    noise=noise[:, index:index+1],
+                                    time_interval=t_delta))
+        assert float(likelihoods[index]) == approx(float(combined_model.pdf(
+            x_posts[:, index:index+1], x_priors[:, index:index+1],
+            time_interval=t_delta)))
+
+
+def test_combined_cache():
+    model_1 = ConstantVelocity(noise_diff_coeff=3)
+    model_2 = ConstantVelocity(noise_diff_coeff=1)
+    combined_model = CombinedLinearGaussianTransitionModel([model_1, model_2])
+    t_delta = datetime.timedelta(0, 3)
+
+    F = combined_model.matrix(time_interval=t_delta)
+    Q = combined_model.covar(time_interval=t_delta)
+    assert combined_model.matrix(time_interval=t_delta) is F
+    assert combined_model.covar(time_interval=t_delta) is Q
+
+    # Diagonal blocks, cached as read-only tuples
+    block_Qs = combined_model.block_covars(time_interval=t_delta)
+    assert combined_model.block_covars(time_interval=t_delta) is block_Qs
+    assert np.array_equal(block_diag(*block_Qs), Q)
+    assert not any(block_Q.flags.writeable for block_Q in block_Qs)
+    assert np.array_equal(
+        block_diag(*combined_model.block_matrices(time_interval=t_delta)), F)
+
+    # Change to sub-model invalidates combined model's cache
+    model_2.noise_diff_coeff = 2
+    new_Q = combined_model.covar(time_interval=t_delta)
+    assert new_Q is not Q
+    assert np.allclose(new_Q[2:, 2:], 2*Q[2:, 2:])
+    assert np.allclose(new_Q[:2, :2], Q[:2, :2])
+    assert combined_model.matrix(time_interval=t_delta) is not F
+    assert np.array_equal(
+        block_diag(*combined_model.block_covars(time_interval=t_delta)),
+        new_Q)
+
+    # Cache not pickled
+    unpickled_model = pickle.loads(pickle.dumps(combined_model))
+    assert not unpickled_model._cache
+    assert np.array_equal(
+        unpickled_model.covar(time_interval=t_delta), new_Q)
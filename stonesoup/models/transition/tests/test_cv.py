@@ -1,6 +1,7 @@
 # coding: utf-8
 import datetime
 
+import pytest
 from pytest import approx
 import scipy as sp
 from scipy.stats import multivariate_normal
@@ -94,3 +95,34 @@ def test_cvmodel():
         new_state_vec_w_enoise.T,
         mean=sp.array(F@state_vec).ravel(),
         cov=Q)
+
+
+def test_cvmodel_cache():
+    """ ConstantVelocity matrices cached by time interval """
+    cv = ConstantVelocity(noise_diff_coeff=0.1)
+    time_interval = datetime.timedelta(seconds=2)
+
+    F = cv.matrix(time_interval=time_interval)
+    Q = cv.covar(time_interval)
+    assert cv.matrix(time_interval) is F
+    assert cv.covar(time_interval=time_interval) is Q
+    assert cv.matrix(datetime.timedelta(seconds=1)) is not F
+    with pytest.raises(ValueError):
+        F[0, 1] = 5
+    with pytest.raises(ValueError):
+        Q[0, 0] = 5
+
+    # Setting property invalidates cache
+    cv.noise_diff_coeff = 0.2
+    new_Q = cv.covar(time_interval)
+    assert new_Q is not Q
+    assert sp.allclose(new_Q, Q*2)
+
+    # Modification in place requires cache to be cleared
+    cv.clear_cache()
+    assert cv.covar(time_interval) is not new_Q
+
+    # Cache is bounded
+    for seconds in range(cv._cache_size + 1):
+        cv.matrix(datetime.timedelta(seconds=seconds))
+    assert len(cv._cache) == cv._cache_size
@@ -48,3 +48,25 @@ class Predictor(Base):
             State prediction
         """
         raise NotImplementedError
+
+    def predict_batch(self, priors, timestamp=None, **kwargs):
+        """Predict a batch of priors to a common timestamp
+
+        The default implementation calls :meth:`predict` for each prior;
+        predictors which can vectorise across priors should override this.
+
+        Parameters
+        ----------
+        priors : sequence of :class:`~.State`
+            The prior states
+        timestamp : :class:`datetime.datetime`, optional
+            Time at which the prediction is made (used by the transition
+            model)
+
+        Returns
+        -------
+        : list of :class:`~.StatePrediction`
+            State predictions, in the same order as `priors`
+        """
+        return [self.predict(prior, timestamp=timestamp, **kwargs)
+                for prior in priors]
@@ -1,17 +1,83 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from functools import lru_cache, partial
+from collections import defaultdict
+from functools import partial
 
 from ..base import Property
 from .base import Predictor
-from ..types.prediction import GaussianStatePrediction
-from ..models.base import LinearModel
+from ..types.prediction import GaussianStatePrediction, \
+    SqrtGaussianStatePrediction, InformationStatePrediction
+from ..models.base import LinearModel, vectorised
 from ..models.transition import TransitionModel
-from ..models.transition.linear import LinearGaussianTransitionModel
+from ..models.transition.linear import LinearGaussianTransitionModel, \
+    CombinedLinearGaussianTransitionModel
 from ..models.control import ControlModel
 from ..models.control.linear import LinearControlModel
-from ..functions import gauss2sigma, unscented_transform
+from ..cache import prediction_cache
+from ..functions import gauss2sigma, unscented_transform, \
+    sqrt_unscented_transform, lower_sqrt, tria, state_sqrt_covar, \
+    state_information_form
+
+
+def _block_transition(state_vectors, covars, matrices, noise_covars):
+    """Apply block diagonal transition to state vectors and covariances
+
+    Parameters
+    ----------
+    state_vectors : :class:`numpy.ndarray` of shape (..., d, 1)
+        State vectors
+    covars : :class:`numpy.ndarray` of shape (..., d, d)
+        Covariances
+    matrices : list of :class:`numpy.ndarray`
+        Square transition matrix of each diagonal block, in order
+    noise_covars : list of :class:`numpy.ndarray`
+        Transition noise covariance of each diagonal block, in order
+
+    Returns
+    -------
+    : :class:`numpy.ndarray` of shape (..., d, 1)
+        Transitioned state vectors
+    : :class:`numpy.ndarray` of shape (..., d, d)
+        Transitioned covariances, with noise added
+    """
+    sizes = [len(matrix) for matrix in matrices]
+    ndim = sum(sizes)
+    leading_shape = covars.shape[:-2]
+
+    if len(set(sizes)) == 1:
+        # Equal size blocks, so stack them to transform all rows of each
+        # block at once, and then all columns
+        num_blocks, block_size = len(sizes), sizes[0]
+        matrices = np.stack(matrices)
+        state_vectors = matrices @ state_vectors.reshape(
+            leading_shape + (num_blocks, block_size, 1))
+        half_covars = (matrices @ covars.reshape(
+            leading_shape + (num_blocks, block_size, ndim))).reshape(
+                leading_shape + (ndim, num_blocks, block_size))
+        covars = np.swapaxes(
+            np.swapaxes(half_covars, -3, -2) @ np.swapaxes(matrices, -1, -2),
+            -3, -2).reshape(leading_shape + (ndim, ndim))
+        # Indices of elements of diagonal blocks, of shape (k, b, b)
+        offsets = np.arange(0, ndim, block_size)[:, np.newaxis, np.newaxis]
+        indices = np.arange(block_size)
+        covars[..., offsets + indices[:, np.newaxis], offsets + indices] \
+            += np.stack(noise_covars)
+        return state_vectors.reshape(leading_shape + (ndim, 1)), covars
+
+    slices = [slice(end - size, end)
+              for size, end in zip(sizes, np.cumsum(sizes))]
+    new_state_vectors = np.empty_like(state_vectors)
+    half_covars = np.empty_like(covars)
+    for matrix, slice_ in zip(matrices, slices):
+        new_state_vectors[..., slice_, :] = matrix @ state_vectors[
+            ..., slice_, :]
+        half_covars[..., slice_, :] = matrix @ covars[..., slice_, :]
+    new_covars = np.empty_like(covars)
+    for matrix, noise_covar, slice_ in zip(matrices, noise_covars, slices):
+        new_covars[..., :, slice_] = half_covars[..., :, slice_] @ matrix.T
+        new_covars[..., slice_, slice_] += noise_covar
+    return new_state_vectors, new_covars
 
 
 class KalmanPredictor(Predictor):
@@ -29,6 +95,13 @@ class KalmanPredictor(Predictor):
     -----
     In the Kalman filter, transition and control models must be linear.
 
+    Where the transition model is a
+    :class:`~.CombinedLinearGaussianTransitionModel`, each of its models is
+    applied to the corresponding block of the state vector and covariance,
+    rather than forming the block diagonal transition matrix. This is only
+    done for states of at least 48 dimensions, below which dense matrix
+    products are quicker.
+
 
     Raises
     ------
@@ -47,6 +120,8 @@ class KalmanPredictor(Predictor):
         doc="The control model to be used. Default `None` where the predictor "
             "will create a zero-effect linear :class:`~.ControlModel`.")
 
+    _block_min_ndim = 48  # Minimum state dimension to apply blocks
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -133,7 +208,7 @@ class KalmanPredictor(Predictor):
 
         return predict_over_interval
 
-    @lru_cache()
+    @prediction_cache()
     def predict(self, prior, timestamp=None, **kwargs):
         r"""The predict function
 
@@ -158,6 +233,18 @@ class KalmanPredictor(Predictor):
         # Get the prediction interval
         predict_over_interval = self._predict_over_interval(prior, timestamp)
 
+        blocks = self._transition_blocks(
+            time_interval=predict_over_interval, **kwargs)
+        if blocks is not None:
+            x_pred, p_pred = _block_transition(
+                np.asarray(prior.state_vector, dtype=np.float_),
+                np.asarray(prior.covar, dtype=np.float_),
+                *blocks)
+            return GaussianStatePrediction(
+                x_pred + self.control_model.control_input(),
+                p_pred + self._control_covar(),
+                timestamp=timestamp)
+
         # Prediction of the mean
         x_pred = self._transition_function(
             prior, time_interval=predict_over_interval, **kwargs) \
@@ -180,6 +267,158 @@ class KalmanPredictor(Predictor):
 
         return GaussianStatePrediction(x_pred, p_pred, timestamp=timestamp)
 
+    def _transition_blocks(self, **kwargs):
+        """Return the transition matrix and covariance of each diagonal block
+
+        Parameters
+        ----------
+        **kwargs : various, optional
+            These are passed to the transition model
+
+        Returns
+        -------
+        : tuple of two tuples of :class:`numpy.ndarray`, or `None`
+            Transition matrices and covariances of each model of a
+            :class:`~.CombinedLinearGaussianTransitionModel`, or `None` for
+            other models, or where the state is too small for blocks to be
+            quicker than dense matrices.
+        """
+        transition_model = self.transition_model
+        if not isinstance(transition_model,
+                          CombinedLinearGaussianTransitionModel) \
+                or transition_model.ndim_state < self._block_min_ndim:
+            return None
+        return (transition_model.block_matrices(**kwargs),
+                transition_model.block_covars(**kwargs))
+
+    def _control_covar(self):
+        r"""Return the control noise covariance in state space,
+        :math:`B_k \Gamma_k B_k^T`, skipping the products if zero"""
+        control_noise = self.control_model.control_noise
+        if not np.any(control_noise):
+            return 0
+        control_matrix = self._control_matrix
+        return control_matrix @ control_noise @ control_matrix.T
+
+    def _batch_transition_matrices(self, priors, state_vectors, **kwargs):
+        """Return the transition matrix, or matrices, for a batch of priors
+
+        Parameters
+        ----------
+        priors : list of :class:`~.State`
+            The prior states, all sharing the same prediction interval
+        state_vectors : :class:`numpy.ndarray` of shape (N, d, 1)
+            The stacked prior state vectors
+        **kwargs : various, optional
+            These are passed to :meth:`~.LinearGaussianTransitionModel.matrix`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (d, d)
+            The transition matrix, :math:`F_k`, shared by all priors
+        """
+        return np.asarray(self.transition_model.matrix(**kwargs))
+
+    def _batch_transition_function(self, priors, state_vectors,
+                                   transition_matrices, **kwargs):
+        """Applies the linear transition function to a batch of state vectors
+        in the absence of a control input
+
+        Parameters
+        ----------
+        priors : list of :class:`~.State`
+            The prior states, all sharing the same prediction interval
+        state_vectors : :class:`numpy.ndarray` of shape (N, d, 1)
+            The stacked prior state vectors
+        transition_matrices : :class:`numpy.ndarray`
+            As returned by :meth:`_batch_transition_matrices`
+        **kwargs : various, optional
+            These are passed to the transition model
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (N, d, 1)
+            The predicted state vectors
+        """
+        return transition_matrices @ state_vectors
+
+    def predict_batch(self, priors, timestamp=None, **kwargs):
+        r"""Predict a batch of priors to a common timestamp
+
+        Equivalent to calling :meth:`predict` for each prior, but the state
+        vectors and covariances are stacked into `(N, d, 1)` and `(N, d, d)`
+        arrays so that :math:`F_k P_{k-1} F_k^T + Q_k` is carried out as a
+        single vectorised operation. Priors are grouped by prediction
+        interval, such that the transition matrix and covariance are only
+        evaluated once for each distinct interval.
+
+        Parameters
+        ----------
+        priors : sequence of :class:`~.GaussianState`
+            The prior states, :math:`\mathbf{x}_{k-1}`
+        timestamp : :class:`datetime.datetime`, optional
+            :math:`k`
+        **kwargs :
+            These are passed to the transition model
+
+        Returns
+        -------
+        : list of :class:`~.GaussianStatePrediction`
+            The predictions, in the same order as `priors`
+        """
+        priors = list(priors)
+        predictions = [None] * len(priors)
+
+        # Group priors by prediction interval
+        interval_indices = defaultdict(list)
+        for index, prior in enumerate(priors):
+            interval_indices[
+                self._predict_over_interval(prior, timestamp)].append(index)
+
+        control_input = np.asarray(self.control_model.control_input())
+        control_covar = np.asarray(self._control_covar())
+
+        for predict_over_interval, indices in interval_indices.items():
+            group_priors = [priors[index] for index in indices]
+            state_vectors = np.stack(
+                [np.asarray(prior.state_vector, dtype=np.float_)
+                 for prior in group_priors])
+            covars = np.stack(
+                [np.asarray(prior.covar, dtype=np.float_)
+                 for prior in group_priors])
+
+            blocks = self._transition_blocks(
+                time_interval=predict_over_interval, **kwargs)
+            if blocks is not None:
+                x_preds, p_preds = _block_transition(
+                    state_vectors, covars, *blocks)
+                for index, x_pred, p_pred in zip(
+                        indices, x_preds + control_input,
+                        p_preds + control_covar):
+                    predictions[index] = GaussianStatePrediction(
+                        x_pred, p_pred, timestamp=timestamp)
+                continue
+
+            transition_matrices = self._batch_transition_matrices(
+                group_priors, state_vectors,
+                time_interval=predict_over_interval, **kwargs)
+            transition_covar = np.asarray(self.transition_model.covar(
+                time_interval=predict_over_interval, **kwargs))
+
+            x_preds = self._batch_transition_function(
+                group_priors, state_vectors, transition_matrices,
+                time_interval=predict_over_interval, **kwargs) \
+                + control_input
+            p_preds = transition_matrices @ covars \
+                @ np.swapaxes(transition_matrices, -1, -2) \
+                + transition_covar + control_covar
+
+            for index, x_pred, p_pred in zip(indices, x_preds, p_preds):
+                predictions[index] = GaussianStatePrediction(
+                    x_pred, p_pred, timestamp=timestamp)
+
+        return predictions
+
 
 class ExtendedKalmanPredictor(KalmanPredictor):
     """ExtendedKalmanPredictor class
@@ -249,6 +488,64 @@ class ExtendedKalmanPredictor(KalmanPredictor):
         return self.transition_model.function(prior.state_vector, noise=0,
                                               **kwargs)
 
+    def _batch_transition_matrices(self, priors, state_vectors, **kwargs):
+        """Return the transition matrix, or matrices, for a batch of priors
+
+        If the transition model is linear a single matrix is shared by the
+        batch, otherwise the Jacobian is evaluated for each prior.
+
+        Parameters
+        ----------
+        priors : list of :class:`~.State`
+            The prior states, all sharing the same prediction interval
+        state_vectors : :class:`numpy.ndarray` of shape (N, d, 1)
+            The stacked prior state vectors
+        **kwargs : various, optional
+            These are passed to :meth:`~.TransitionModel.matrix` or
+            :meth:`~.TransitionModel.jacobian`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (d, d) or (N, d, d)
+            The transition matrix, or stacked Jacobians
+        """
+        if isinstance(self.transition_model, LinearModel):
+            return np.asarray(self.transition_model.matrix(**kwargs))
+        else:
+            return np.stack([
+                np.asarray(self.transition_model.jacobian(
+                    prior.state_vector, **kwargs))
+                for prior in priors])
+
+    def _batch_transition_function(self, priors, state_vectors,
+                                   transition_matrices, **kwargs):
+        """Applies the transition function to a batch of state vectors in
+        the absence of a control input
+
+        Parameters
+        ----------
+        priors : list of :class:`~.State`
+            The prior states, all sharing the same prediction interval
+        state_vectors : :class:`numpy.ndarray` of shape (N, d, 1)
+            The stacked prior state vectors
+        transition_matrices : :class:`numpy.ndarray`
+            As returned by :meth:`_batch_transition_matrices`
+        **kwargs : various, optional
+            These are passed to :meth:`~.TransitionModel.function`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (N, d, 1)
+            The predicted state vectors
+        """
+        if isinstance(self.transition_model, LinearModel):
+            return transition_matrices @ state_vectors
+        else:
+            return np.stack([
+                np.asarray(self._transition_function(prior, **kwargs),
+                           dtype=np.float_)
+                for prior in priors])
+
     @property
     def _control_matrix(self):
         r"""Returns the control input model matrix, :math:`B_k`, or its linear
@@ -274,6 +571,9 @@ class UnscentedKalmanPredictor(KalmanPredictor):
     The predict is accomplished by calculating the sigma points from the
     Gaussian mean and covariance, then putting these through the (in general
     non-linear) transition function, then reconstructing the Gaussian.
+    Sigma points are passed through the transition function at once where
+    the model supports it, otherwise one at a time (see
+    :func:`~.unscented_transform`).
     """
     transition_model = Property(
         TransitionModel,
@@ -304,6 +604,7 @@ class UnscentedKalmanPredictor(KalmanPredictor):
 
         self._time_interval = None
 
+    @vectorised
     def _transition_and_control_function(self, prior_state_vector, **kwargs):
         r"""Returns the result of applying the transition and control functions
         for the unscented transform
@@ -327,7 +628,7 @@ class UnscentedKalmanPredictor(KalmanPredictor):
                 prior_state_vector, noise=0, **kwargs) \
             + self.control_model.control_input()
 
-    @lru_cache()
+    @prediction_cache()
     def predict(self, prior, timestamp=None, **kwargs):
         r"""The unscented version of the predict step
 
@@ -379,3 +680,207 @@ class UnscentedKalmanPredictor(KalmanPredictor):
 
         # and return a Gaussian state based on these parameters
         return GaussianStatePrediction(x_pred, p_pred, timestamp=timestamp)
+
+    # Sigma points are specific to each prior, so there is nothing to share
+    # across a batch
+    predict_batch = Predictor.predict_batch
+
+
+class SqrtKalmanPredictor(KalmanPredictor):
+    r"""Square root Kalman predictor
+
+    As :class:`~.KalmanPredictor`, but the covariance is propagated as a
+    lower-triangular square root, :math:`L_{k-1}` where :math:`P_{k-1} =
+    L_{k-1} L_{k-1}^T`, such that it remains symmetric positive definite.
+    The predicted square root is found by triangularisation (see
+    :func:`~.tria`) of
+
+    .. math::
+
+      \begin{bmatrix} F_k L_{k-1} & Q_k^{1/2} & B_k \Gamma_k^{1/2}
+      \end{bmatrix}
+
+    and returned as a :class:`~.SqrtGaussianStatePrediction`. Priors without
+    a square root covariance (e.g. from an initiator) are factorised first.
+    """
+
+    @prediction_cache()
+    def predict(self, prior, timestamp=None, **kwargs):
+        r"""The square root predict function
+
+        Parameters
+        ----------
+        prior : :class:`~.SqrtGaussianState` or :class:`~.GaussianState`
+            :math:`\mathbf{x}_{k-1}`
+        timestamp : :class:`datetime.datetime`, optional
+            :math:`k`
+        **kwargs :
+            These are passed to the transition model
+
+        Returns
+        -------
+        : :class:`~.SqrtGaussianStatePrediction`
+            :math:`\mathbf{x}_{k|k-1}`, the predicted state and the square
+            root of the predicted state covariance :math:`P_{k|k-1}`
+        """
+
+        # Get the prediction interval
+        predict_over_interval = self._predict_over_interval(prior, timestamp)
+
+        x_pred = self._transition_function(
+            prior, time_interval=predict_over_interval, **kwargs) \
+            + self.control_model.control_input()
+
+        transition_matrix = self._transition_matrix(
+            prior=prior, time_interval=predict_over_interval, **kwargs)
+        sqrt_transition_covar = lower_sqrt(self.transition_model.covar(
+            time_interval=predict_over_interval, **kwargs))
+
+        sqrt_terms = [transition_matrix @ state_sqrt_covar(prior),
+                      sqrt_transition_covar]
+        control_noise = self.control_model.control_noise
+        if np.any(control_noise):
+            sqrt_terms.append(
+                self._control_matrix @ lower_sqrt(control_noise))
+
+        sqrt_p_pred = tria(np.hstack(sqrt_terms))
+
+        return SqrtGaussianStatePrediction(
+            x_pred, sqrt_p_pred, timestamp=timestamp)
+
+    # Predictions are in square root form, so use predict for each prior
+    predict_batch = Predictor.predict_batch
+
+
+class SqrtUnscentedKalmanPredictor(UnscentedKalmanPredictor):
+    r"""Square root unscented Kalman predictor
+
+    As :class:`~.UnscentedKalmanPredictor`, but sigma points are drawn
+    directly from the lower-triangular square root of the prior covariance,
+    and the square root of the predicted covariance is formed from the
+    transformed sigma points by :func:`~.sqrt_unscented_transform`, without
+    the full covariance being formed or factorised.
+    """
+
+    @prediction_cache()
+    def predict(self, prior, timestamp=None, **kwargs):
+        r"""The square root unscented version of the predict step
+
+        Parameters
+        ----------
+        prior : :class:`~.SqrtGaussianState` or :class:`~.GaussianState`
+            Prior state, :math:`\mathbf{x}_{k-1}`
+        timestamp : :class:`datetime.datetime`
+            Time to transit to (:math:`k`)
+        **kwargs : various, optional
+            These are passed to :meth:`~.TransitionModel.covar`
+
+        Returns
+        -------
+        : :class:`~.SqrtGaussianStatePrediction`
+            The predicted state :math:`\mathbf{x}_{k|k-1}` and the square
+            root of the predicted state covariance :math:`P_{k|k-1}`
+        """
+
+        # Get the prediction interval
+        predict_over_interval = self._predict_over_interval(prior, timestamp)
+
+        sqrt_total_noise_covar = lower_sqrt(
+            self.transition_model.covar(
+                time_interval=predict_over_interval, **kwargs)
+            + self.control_model.control_noise)
+
+        sigma_points, mean_weights, covar_weights = gauss2sigma(
+            prior.state_vector, state_sqrt_covar(prior),
+            self.alpha, self.beta, self.kappa, sqrt=True)
+
+        transition_and_control_function = partial(
+            self._transition_and_control_function,
+            time_interval=predict_over_interval)
+
+        x_pred, sqrt_p_pred, _, _ = sqrt_unscented_transform(
+            sigma_points, mean_weights, covar_weights,
+            transition_and_control_function,
+            sqrt_covar_noise=sqrt_total_noise_covar)
+
+        return SqrtGaussianStatePrediction(
+            x_pred, sqrt_p_pred, timestamp=timestamp)
+
+    # Predictions are in square root form, so use predict for each prior
+    predict_batch = Predictor.predict_batch
+
+
+class InformationKalmanPredictor(KalmanPredictor):
+    r"""Information Kalman predictor
+
+    As :class:`~.KalmanPredictor`, but the state is propagated in information
+    form, as the information vector :math:`\mathbf{y}_{k-1}` and matrix
+    :math:`Y_{k-1}` of an :class:`~.InformationState`. With
+    :math:`M_k = F_k^{-T} Y_{k-1} F_k^{-1}`, the prediction is
+
+    .. math::
+
+        Y_{k|k-1} = (I + M_k Q_k)^{-1} M_k
+
+        \mathbf{y}_{k|k-1} = (I + M_k Q_k)^{-1} F_k^{-T} \mathbf{y}_{k-1}
+        + Y_{k|k-1} B_k \mathbf{u}_k
+
+    where :math:`Q_k` includes the control noise. The information matrix
+    needn't be invertible, so priors with no information can be predicted,
+    but the transition matrix must be. Priors in moment form, e.g. from an
+    initiator, are converted first.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If the transition matrix is singular.
+    """
+
+    @prediction_cache()
+    def predict(self, prior, timestamp=None, **kwargs):
+        r"""The information form predict function
+
+        Parameters
+        ----------
+        prior : :class:`~.InformationState` or :class:`~.GaussianState`
+            :math:`\mathbf{x}_{k-1}`
+        timestamp : :class:`datetime.datetime`, optional
+            :math:`k`
+        **kwargs :
+            These are passed to the transition model
+
+        Returns
+        -------
+        : :class:`~.InformationStatePrediction`
+            The predicted information vector :math:`\mathbf{y}_{k|k-1}` and
+            information matrix :math:`Y_{k|k-1}`
+        """
+
+        # Get the prediction interval
+        predict_over_interval = self._predict_over_interval(prior, timestamp)
+
+        info_vector, precision = state_information_form(prior)
+
+        transition_matrix = np.asfarray(self._transition_matrix(
+            prior=prior, time_interval=predict_over_interval, **kwargs))
+        noise_covar = self.transition_model.covar(
+            time_interval=predict_over_interval, **kwargs) \
+            + self._control_covar()
+
+        # M = F^-T Y F^-1, from solves against F^T
+        transition_t = transition_matrix.T
+        half_precision = np.linalg.solve(transition_t, precision)
+        trans_precision = np.linalg.solve(transition_t, half_precision.T).T
+
+        scale = np.eye(len(precision)) + trans_precision @ noise_covar
+        precision_pred = np.linalg.solve(scale, trans_precision)
+        precision_pred = (precision_pred + precision_pred.T)/2
+        info_pred = np.linalg.solve(
+            scale, np.linalg.solve(transition_t, info_vector)) \
+            + precision_pred @ np.asfarray(self.control_model.control_input())
+
+        return InformationStatePrediction(
+            info_pred, precision_pred, timestamp=timestamp)
+
+    # Predictions are in information form, so use predict for each prior
+    predict_batch = Predictor.predict_batch
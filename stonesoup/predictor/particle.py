@@ -1,24 +1,32 @@
 # -*- coding: utf-8 -*-
-from functools import lru_cache
+import numpy as np
 
 from .base import Predictor
+from ..cache import prediction_cache
+from ..types.array import StateVector
 from ..types.particle import Particle
-from ..types.prediction import ParticleStatePrediction
+from ..types.prediction import ParticleStatePrediction, \
+    ParticleArrayStatePrediction
+from ..types.state import ParticleArrayState
 
 
 class ParticlePredictor(Predictor):
     """ParticlePredictor class
 
     An implementation of a Particle Filter predictor.
+
+    Priors may be a :class:`~.ParticleState`, or an array backed
+    :class:`~.ParticleArrayState`, in which case all particles are predicted
+    at once.
     """
 
-    @lru_cache()
+    @prediction_cache()
     def predict(self, prior, control_input=None, timestamp=None, **kwargs):
         """Particle Filter prediction step
 
         Parameters
         ----------
-        prior : :class:`~.ParticleState`
+        prior : :class:`~.ParticleState` or :class:`~.ParticleArrayState`
             A prior state object
         control_input : :class:`~.State`, optional
             The control input. It will only have an effect if
@@ -29,7 +37,8 @@ class ParticlePredictor(Predictor):
 
         Returns
         -------
-        : :class:`~.ParticleStatePrediction`
+        : :class:`~.ParticleStatePrediction` or \
+        :class:`~.ParticleArrayStatePrediction`
             The predicted state
         """
         # Compute time_interval
@@ -39,15 +48,24 @@ class ParticlePredictor(Predictor):
             # TypeError: (timestamp or prior.timestamp) is None
             time_interval = None
 
-        new_particles = []
-        for particle in prior.particles:
-            new_state_vector = self.transition_model.function(
-                particle.state_vector,
-                time_interval=time_interval,
-                **kwargs)
-            new_particles.append(
-                Particle(new_state_vector,
-                         weight=particle.weight,
-                         parent=particle.parent))
+        if isinstance(prior, ParticleArrayState):
+            new_state_vectors = self._transition_state_vectors(
+                prior.state_vectors, time_interval=time_interval, **kwargs)
+            return ParticleArrayStatePrediction(
+                new_state_vectors, log_weights=prior.log_weights,
+                timestamp=timestamp)
+
+        new_state_vectors = self._transition_state_vectors(
+            np.hstack([particle.state_vector for particle in prior.particles]),
+            time_interval=time_interval, **kwargs)
+        new_particles = [
+            Particle(StateVector(new_state_vectors[:, index:index+1]),
+                     weight=particle.weight,
+                     parent=particle.parent)
+            for index, particle in enumerate(prior.particles)]
 
         return ParticleStatePrediction(new_particles, timestamp=timestamp)
+
+    def _transition_state_vectors(self, state_vectors, **kwargs):
+        """Apply transition model, with noise, to (ndim, N) state vectors"""
+        return self.transition_model.function(state_vectors, **kwargs)
@@ -3,11 +3,17 @@ import datetime
 import pytest
 import numpy as np
 
-from ...models.transition.linear import ConstantVelocity
+from ...models.transition.linear import (
+    ConstantVelocity, ConstantAcceleration, RandomWalk,
+    CombinedLinearGaussianTransitionModel)
 from ...predictor.kalman import (
-    KalmanPredictor, ExtendedKalmanPredictor, UnscentedKalmanPredictor)
-from ...types.prediction import GaussianStatePrediction
-from ...types.state import GaussianState
+    KalmanPredictor, ExtendedKalmanPredictor, UnscentedKalmanPredictor,
+    SqrtKalmanPredictor, SqrtUnscentedKalmanPredictor,
+    InformationKalmanPredictor)
+from ...types.prediction import (
+    GaussianStatePrediction, SqrtGaussianStatePrediction,
+    InformationStatePrediction)
+from ...types.state import GaussianState, SqrtGaussianState, InformationState
 
 
 @pytest.mark.parametrize(
@@ -77,3 +83,163 @@ def test_kalman(PredictorClass, transition_model,
     assert(prediction.timestamp == new_timestamp)
 
     # TODO: Test with Control Model
+
+
+@pytest.mark.parametrize(
+    "PredictorClass",
+    [KalmanPredictor, ExtendedKalmanPredictor, UnscentedKalmanPredictor],
+    ids=["standard", "extended", "unscented"]
+)
+def test_kalman_batch(PredictorClass):
+    transition_model = ConstantVelocity(noise_diff_coeff=0.1)
+    predictor = PredictorClass(transition_model=transition_model)
+
+    # Priors at a mix of timestamps, so multiple intervals are grouped
+    timestamp = datetime.datetime.now()
+    new_timestamp = timestamp + datetime.timedelta(seconds=5)
+    priors = [
+        GaussianState(np.array([[-6.45 + i], [0.7 * i]]),
+                      np.array([[4.1123, 0.0013],
+                                [0.0013, 0.0365]]) * (i + 1),
+                      timestamp=timestamp + datetime.timedelta(seconds=i % 3))
+        for i in range(7)]
+
+    predictions = predictor.predict_batch(priors, timestamp=new_timestamp)
+
+    assert len(predictions) == len(priors)
+    for prior, prediction in zip(priors, predictions):
+        eval_prediction = predictor.predict(prior, timestamp=new_timestamp)
+        assert isinstance(prediction, GaussianStatePrediction)
+        assert np.allclose(prediction.mean, eval_prediction.mean,
+                           0, atol=1.e-14)
+        assert np.allclose(prediction.covar, eval_prediction.covar,
+                           0, atol=1.e-14)
+        assert prediction.timestamp == new_timestamp
+
+    assert predictor.predict_batch([], timestamp=new_timestamp) == []
+
+
+@pytest.mark.parametrize(
+    "model_list",
+    [
+        [ConstantVelocity(noise_diff_coeff=0.1),
+         ConstantVelocity(noise_diff_coeff=0.2),
+         ConstantVelocity(noise_diff_coeff=0.3)],
+        [ConstantVelocity(noise_diff_coeff=0.1),
+         ConstantAcceleration(noise_diff_coeff=0.2),
+         RandomWalk(noise_diff_coeff=0.3)],
+    ],
+    ids=["equal", "unequal"]
+)
+@pytest.mark.parametrize(
+    "PredictorClass", [KalmanPredictor, ExtendedKalmanPredictor],
+    ids=["standard", "extended"])
+def test_kalman_combined(PredictorClass, model_list, monkeypatch):
+    # Apply blocks regardless of state size
+    monkeypatch.setattr(PredictorClass, '_block_min_ndim', 0)
+    transition_model = CombinedLinearGaussianTransitionModel(model_list)
+    ndim = transition_model.ndim_state
+    predictor = PredictorClass(transition_model=transition_model)
+
+    timestamp = datetime.datetime.now()
+    new_timestamp = timestamp + datetime.timedelta(seconds=2)
+    time_interval = new_timestamp - timestamp
+    random_state = np.random.RandomState(1)
+    priors = []
+    for _ in range(3):
+        sqrt_covar = random_state.randn(ndim, ndim)
+        priors.append(GaussianState(
+            random_state.randn(ndim, 1), sqrt_covar @ sqrt_covar.T,
+            timestamp=timestamp))
+
+    F = transition_model.matrix(time_interval=time_interval)
+    Q = transition_model.covar(time_interval=time_interval)
+    predictions = predictor.predict_batch(priors, timestamp=new_timestamp)
+    for prior, batch_prediction in zip(priors, predictions):
+        prediction = predictor.predict(prior, timestamp=new_timestamp)
+        for eval_prediction in (prediction, batch_prediction):
+            assert np.allclose(eval_prediction.state_vector,
+                               F @ prior.state_vector)
+            assert np.allclose(eval_prediction.covar,
+                               F @ prior.covar @ F.T + Q)
+
+
+@pytest.mark.parametrize(
+    "PredictorClass, SqrtPredictorClass",
+    [(KalmanPredictor, SqrtKalmanPredictor),
+     (UnscentedKalmanPredictor, SqrtUnscentedKalmanPredictor)],
+    ids=["standard", "unscented"]
+)
+def test_sqrt_kalman(PredictorClass, SqrtPredictorClass):
+    transition_model = ConstantVelocity(noise_diff_coeff=0.1)
+    predictor = PredictorClass(transition_model=transition_model)
+    sqrt_predictor = SqrtPredictorClass(transition_model=transition_model)
+
+    timestamp = datetime.datetime.now()
+    new_timestamp = timestamp + datetime.timedelta(seconds=2)
+    prior_mean = np.array([[-6.45], [0.7]])
+    prior_covar = np.array([[4.1123, 0.0013],
+                            [0.0013, 0.0365]])
+    prior = GaussianState(prior_mean, prior_covar, timestamp=timestamp)
+    sqrt_prior = SqrtGaussianState(
+        prior_mean, np.linalg.cholesky(prior_covar), timestamp=timestamp)
+
+    eval_prediction = predictor.predict(prior, timestamp=new_timestamp)
+    for prior_ in (prior, sqrt_prior):
+        prediction = sqrt_predictor.predict(prior_, timestamp=new_timestamp)
+        assert isinstance(prediction, SqrtGaussianStatePrediction)
+        assert np.allclose(prediction.sqrt_covar,
+                           np.tril(prediction.sqrt_covar))
+        assert np.allclose(prediction.mean, eval_prediction.mean,
+                           0, atol=1.e-10)
+        assert np.allclose(prediction.covar, eval_prediction.covar,
+                           0, atol=1.e-10)
+        assert prediction.timestamp == new_timestamp
+
+    # Repeated predictions remain positive definite
+    state = sqrt_prior
+    for _ in range(100):
+        state = sqrt_predictor.predict(
+            state, timestamp=state.timestamp + datetime.timedelta(seconds=1))
+    assert np.all(np.diag(state.sqrt_covar) > 0)
+    assert np.allclose(state.covar, state.covar.T)
+
+    predictions = sqrt_predictor.predict_batch(
+        [prior, sqrt_prior], timestamp=new_timestamp)
+    assert all(isinstance(prediction, SqrtGaussianStatePrediction)
+               for prediction in predictions)
+
+
+def test_information_kalman():
+    transition_model = ConstantVelocity(noise_diff_coeff=0.1)
+    predictor = KalmanPredictor(transition_model=transition_model)
+    info_predictor = InformationKalmanPredictor(
+        transition_model=transition_model)
+
+    timestamp = datetime.datetime.now()
+    new_timestamp = timestamp + datetime.timedelta(seconds=2)
+    prior_mean = np.array([[-6.45], [0.7]])
+    prior_covar = np.array([[4.1123, 0.0013],
+                            [0.0013, 0.0365]])
+    prior = GaussianState(prior_mean, prior_covar, timestamp=timestamp)
+    prior_precision = np.linalg.inv(prior_covar)
+    info_prior = InformationState(
+        prior_precision @ prior_mean, prior_precision, timestamp=timestamp)
+
+    eval_prediction = predictor.predict(prior, timestamp=new_timestamp)
+    for prior_ in (prior, info_prior):
+        prediction = info_predictor.predict(prior_, timestamp=new_timestamp)
+        assert isinstance(prediction, InformationStatePrediction)
+        assert np.allclose(prediction.mean, eval_prediction.mean,
+                           0, atol=1.e-10)
+        assert np.allclose(prediction.covar, eval_prediction.covar,
+                           0, atol=1.e-10)
+        assert prediction.timestamp == new_timestamp
+
+    # No information remains no information
+    prediction = info_predictor.predict(
+        InformationState(np.zeros((2, 1)), np.zeros((2, 2)),
+                         timestamp=timestamp),
+        timestamp=new_timestamp)
+    assert np.array_equal(prediction.information_vector, np.zeros((2, 1)))
+    assert np.array_equal(prediction.precision, np.zeros((2, 2)))
@@ -6,8 +6,9 @@ import numpy as np
 from ...models.transition.linear import ConstantVelocity
 from ...predictor.particle import ParticlePredictor
 from ...types.particle import Particle
-from ...types.prediction import ParticleStatePrediction
-from ...types.state import ParticleState
+from ...types.prediction import ParticleStatePrediction, \
+    ParticleArrayStatePrediction
+from ...types.state import ParticleState, ParticleArrayState
 
 
 def test_particle():
@@ -61,3 +62,29 @@ def test_particle():
     assert np.all([eval_prediction.particles[i].state_vector ==
                    prediction.particles[i].state_vector for i in range(9)])
     assert np.all([prediction.particles[i].weight == 1 / 9 for i in range(9)])
+
+
+def test_particle_array():
+    cv = ConstantVelocity(noise_diff_coeff=0)
+    timestamp = datetime.datetime.now()
+    new_timestamp = timestamp + datetime.timedelta(seconds=2)
+    state_vectors = np.array([[10, 10, 10, 20, 20, 20, 30, 30, 30],
+                              [10, 20, 30, 10, 20, 30, 10, 20, 30]])
+    log_weights = np.log(np.arange(1, 10))
+    prior = ParticleArrayState(state_vectors, log_weights, timestamp)
+
+    predictor = ParticlePredictor(transition_model=cv)
+    prediction = predictor.predict(prior, timestamp=new_timestamp)
+
+    assert isinstance(prediction, ParticleArrayStatePrediction)
+    assert prediction.timestamp == new_timestamp
+    eval_state_vectors = cv.matrix(time_interval=new_timestamp-timestamp) \
+        @ state_vectors
+    assert np.allclose(prediction.state_vectors, eval_state_vectors)
+    assert np.array_equal(prediction.log_weights, log_weights)
+
+    # Noise drawn independently for each particle
+    predictor = ParticlePredictor(
+        transition_model=ConstantVelocity(noise_diff_coeff=1))
+    prediction = predictor.predict(prior, timestamp=new_timestamp)
+    assert len(np.unique(prediction.state_vectors[0, :3])) == 3
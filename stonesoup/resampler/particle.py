@@ -1,45 +1,219 @@
 # -*- coding: utf-8 -*-
+from abc import abstractmethod
+
 import numpy as np
+from scipy.special import logsumexp
 
 from .base import Resampler
+from ..base import Property
 from ..types.numeric import Probability
 from ..types.particle import Particle
+from ..types.state import ParticleArrayState
+
 
+class IndexResampler(Resampler):
+    """Base class for resamplers which draw particles by index
 
-class SystematicResampler(Resampler):
+    Subclasses implement :meth:`indices`, which draws the indices of
+    particles to be copied from an array of weights, such that resampling
+    can be done in a single operation on array backed particles.
+    """
+
+    @abstractmethod
+    def indices(self, weights):
+        """Draw indices of particles to resample
+
+        Parameters
+        ----------
+        weights : :class:`numpy.ndarray` of shape (N, )
+            Normalised particle weights
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of int of shape (N, )
+            Indices of the particles selected
+        """
+        raise NotImplementedError
 
     def resample(self, particles):
         """Resample the particles
 
         Parameters
         ----------
-        particles : list of :class:`~.Particle`
+        particles : list of :class:`~.Particle` or \
+        :class:`~.ParticleArrayState`
             The particles to be resampled according to their weight
 
         Returns
         -------
-        particles : list of :class:`~.Particle`
-            The resampled particles
+        particles : list of :class:`~.Particle` or \
+        :class:`~.ParticleArrayState`
+            The resampled particles, with equal weights
         """
+        if isinstance(particles, ParticleArrayState):
+            indices = self.indices(particles.weights)
+            return ParticleArrayState(
+                particles.state_vectors[:, indices],
+                timestamp=particles.timestamp)
 
-        n_particles = len(particles)
-        weight = Probability(1/n_particles)
-        cdf = np.cumsum([p.weight for p in particles])
         particles_listed = list(particles)
+        log_weights = np.array([
+            Probability(particle.weight).log_value
+            for particle in particles_listed])
+        indices = self.indices(np.exp(log_weights - logsumexp(log_weights)))
+
+        weight = Probability(1 / len(particles_listed))
+        return [Particle(particles_listed[index].state_vector,
+                         weight=weight,
+                         parent=particles_listed[index])
+                for index in indices]
+
+    @staticmethod
+    def _search(weights, points):
+        """Index of particle which pushes cumulative weight over each of
+        the `points` in [0, 1)"""
+        cdf = np.cumsum(weights)
+        # Normalise so final value is exactly one, so any trailing zero
+        # weight particles are never selected
+        cdf /= cdf[-1]
+        return np.minimum(
+            np.searchsorted(cdf, points, side='right'), len(weights) - 1)
+
+
+class SystematicResampler(IndexResampler):
+    """Systematic resampler
+
+    Particles are selected at evenly spaced points along the cumulative
+    weights, from a single random offset.
+    """
+
+    def indices(self, weights):
+        n_particles = len(weights)
         # Pick random starting point
         u_i = np.random.uniform(0, 1 / n_particles)
-        new_particles = []
+        return self._search(
+            weights, u_i + np.arange(n_particles) / n_particles)
 
-        # Cycle through the cumulative distribution and copy the particle
-        # that pushed the score over the current value
-        for j in range(n_particles):
 
-            u_j = u_i + (1 / n_particles) * j
+class StratifiedResampler(IndexResampler):
+    """Stratified resampler
 
-            particle = particles_listed[np.argmax(u_j < cdf)]
-            new_particles.append(
-                Particle(particle.state_vector,
-                         weight=weight,
-                         parent=particle))
+    Particles are selected at a random point within each of N evenly spaced
+    strata of the cumulative weights.
+    """
+
+    def indices(self, weights):
+        n_particles = len(weights)
+        return self._search(
+            weights,
+            (np.arange(n_particles) + np.random.uniform(size=n_particles))
+            / n_particles)
+
+
+class MultinomialResampler(IndexResampler):
+    """Multinomial resampler
+
+    Particles are selected independently at random, according to their
+    weight.
+    """
+
+    def indices(self, weights):
+        n_particles = len(weights)
+        return self._search(
+            weights, np.sort(np.random.uniform(size=n_particles)))
+
+
+class ResidualResampler(IndexResampler):
+    """Residual resampler
+
+    Each particle is deterministically copied the integer part of its
+    weight multiplied by N times, with the remaining particles drawn from
+    the residual weights by :attr:`residual_resampler`.
+    """
+
+    residual_resampler = Property(
+        IndexResampler, default=MultinomialResampler(),
+        doc="Resampler used to draw remaining particles from residual "
+            "weights. Default :class:`~.MultinomialResampler`.")
+
+    def indices(self, weights):
+        n_particles = len(weights)
+        copies = np.floor(weights * n_particles).astype(np.int_)
+        indices = np.repeat(np.arange(n_particles), copies)
+
+        n_residual = n_particles - len(indices)
+        if n_residual:
+            residuals = weights * n_particles - copies
+            residual_indices = self.residual_resampler.indices(
+                residuals / residuals.sum())
+            # Draws for N residual particles, so take a random subset
+            residual_indices = np.random.choice(
+                residual_indices, n_residual, replace=False)
+            indices = np.concatenate((indices, residual_indices))
+        return indices
+
+
+class ESSResampler(Resampler):
+    """Effective sample size triggered resampler
+
+    Resamples particles with :attr:`resampler` only when the effective
+    sample size, :math:`1 / \\sum_i w_i^2` for normalised weights
+    :math:`w_i`, falls below :attr:`threshold` multiplied by the number of
+    particles. Otherwise particles are returned unchanged.
+    """
+
+    resampler = Property(
+        Resampler, default=SystematicResampler(),
+        doc="Resampler to use when effective sample size is below threshold."
+            " Default :class:`~.SystematicResampler`.")
+    threshold = Property(
+        float, default=0.5,
+        doc="Fraction of number of particles the effective sample size must "
+            "fall below to trigger resampling. Default 0.5.")
+
+    @staticmethod
+    def effective_sample_size(log_weights):
+        """Effective sample size of particles
+
+        Parameters
+        ----------
+        log_weights : :class:`numpy.ndarray` of shape (N, )
+            Natural log of (unnormalised) particle weights
+
+        Returns
+        -------
+        float
+            Effective sample size
+        """
+        log_weights = log_weights - logsumexp(log_weights)
+        return np.exp(-logsumexp(2 * log_weights))
+
+    def resample(self, particles):
+        """Resample the particles, if effective sample size is below
+        threshold
+
+        Parameters
+        ----------
+        particles : list of :class:`~.Particle` or \
+        :class:`~.ParticleArrayState`
+            The particles to be resampled according to their weight
+
+        Returns
+        -------
+        particles : list of :class:`~.Particle` or \
+        :class:`~.ParticleArrayState`
+            The resampled particles, or the original particles if
+            resampling was not required
+        """
+        if isinstance(particles, ParticleArrayState):
+            log_weights = particles.log_weights
+        else:
+            particles = list(particles)
+            log_weights = np.array([
+                Probability(particle.weight).log_value
+                for particle in particles])
 
-        return new_particles
+        if self.effective_sample_size(log_weights) \
+                < self.threshold * len(log_weights):
+            return self.resampler.resample(particles)
+        return particles
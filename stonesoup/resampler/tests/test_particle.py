@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 import numpy as np
+import pytest
 
+from ...types.numeric import Probability
 from ...types.particle import Particle
-from ..particle import SystematicResampler
+from ...types.state import ParticleArrayState
+from ..particle import SystematicResampler, StratifiedResampler, \
+    MultinomialResampler, ResidualResampler, ESSResampler
 
 
 def test_systematic_equal():
@@ -42,3 +46,81 @@ def test_systematic_even():
     # Weight all at even particles, so new should all be at even vector
     assert all(np.array_equal(np.array([[i//2*2]]), new_particle.state_vector)
                for i, new_particle in enumerate(new_particles))
+
+
+def test_systematic_array():
+    log_weights = np.array(
+        [np.log(1/10) if i % 2 == 0 else -np.inf for i in range(20)])
+    particles = ParticleArrayState(np.arange(20)[np.newaxis, :], log_weights)
+
+    resampler = SystematicResampler()
+
+    new_particles = resampler.resample(particles)
+
+    # Weight all at even particles, so new should all be at even vector
+    assert isinstance(new_particles, ParticleArrayState)
+    assert np.array_equal(new_particles.state_vectors[0],
+                          np.arange(20)//2*2)
+    assert np.allclose(new_particles.weights, 1/20)
+
+
+@pytest.mark.parametrize(
+    'resampler',
+    [SystematicResampler(), StratifiedResampler(), MultinomialResampler(),
+     ResidualResampler()],
+    ids=['Systematic', 'Stratified', 'Multinomial', 'Residual'])
+def test_index_resamplers(resampler):
+    np.random.seed(1990)
+    weights = np.array([0.5, 0, 0.25, 0, 0.25, 0, 0, 0])
+
+    indices = resampler.indices(weights)
+    assert indices.shape == (8, )
+    assert set(indices) <= {0, 2, 4}
+
+    # Large sample proportions should follow weights
+    weights = np.random.uniform(size=10)
+    weights /= weights.sum()
+    indices = resampler.indices(np.repeat(weights, 1000) / 1000)
+    counts = np.bincount(indices // 1000, minlength=10)
+    assert np.allclose(counts / 10000, weights, atol=0.02)
+
+    particles = [Particle(np.array([[i]]), weight=Probability(i == 3))
+                 for i in range(10)]
+    new_particles = resampler.resample(particles)
+    assert all(particle.state_vector[0, 0] == 3
+               for particle in new_particles)
+    assert all(particle.weight == Probability(1/10)
+               for particle in new_particles)
+
+
+def test_systematic_deterministic_weights():
+    # Exact multiples of 1/N must be copied exactly that many times
+    resampler = SystematicResampler()
+    indices = resampler.indices(np.array([0.5, 0.25, 0.25, 0]))
+    assert np.array_equal(indices, [0, 0, 1, 2])
+    indices = ResidualResampler().indices(np.array([0.5, 0.25, 0.25, 0]))
+    assert np.array_equal(indices, [0, 0, 1, 2])
+
+
+def test_ess():
+    resampler = ESSResampler()
+    assert resampler.effective_sample_size(np.zeros(10)) \
+        == pytest.approx(10)
+    assert resampler.effective_sample_size(
+        np.array([0] + [-np.inf]*9)) == pytest.approx(1)
+
+    # Equal weights, so no resampling
+    particles = ParticleArrayState(np.arange(10)[np.newaxis, :])
+    assert resampler.resample(particles) is particles
+    particles = [Particle(np.array([[i]]), weight=1/10) for i in range(10)]
+    assert resampler.resample(particles) == particles
+
+    # Weight at even particles, ESS of 5, so resamples with threshold
+    log_weights = np.array(
+        [np.log(1/5) if i % 2 == 0 else -np.inf for i in range(10)])
+    particles = ParticleArrayState(np.arange(10)[np.newaxis, :], log_weights)
+    assert ESSResampler(threshold=0.4).resample(particles) is particles
+    new_particles = ESSResampler(threshold=0.6).resample(particles)
+    assert new_particles is not particles
+    assert np.all(new_particles.state_vectors % 2 == 0)
+    assert np.allclose(new_particles.weights, 1/10)
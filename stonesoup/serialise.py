@@ -19,6 +19,7 @@ import ruamel.yaml
 from ruamel.yaml.constructor import ConstructorError
 
 from .base import Base
+from .types.state import StateColumns
 
 
 class YAML:
@@ -47,6 +48,10 @@ class YAML:
         self._yaml.constructor.add_constructor(
             "!pathlib.Path", self.path_from_yaml)
 
+        # Columnar states, stored as list
+        self._yaml.representer.add_representer(
+            StateColumns, self.state_columns_to_yaml)
+
         # Declarative classes
         self._yaml.representer.add_multi_representer(
             Base, self.declarative_to_yaml)
@@ -160,6 +165,13 @@ class YAML:
         return datetime.timedelta(
             seconds=float(constructor.construct_scalar(node)))
 
+    @staticmethod
+    def state_columns_to_yaml(representer, node):
+        """Convert columnar states to YAML.
+
+        Stored as a plain list of states."""
+        return representer.represent_list(list(node))
+
     @staticmethod
     def path_to_yaml(representer, node):
         """Convert path to YAML.
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import gc
+import pickle
+
+import pytest
+
+from ..cache import PredictionCache, prediction_cache
+
+
+class State:
+    pass
+
+
+class Component:
+    def __init__(self):
+        self.calls = 0
+
+    @prediction_cache(maxsize=2)
+    def predict(self, prior, timestamp=None, **kwargs):
+        self.calls += 1
+        return [timestamp, kwargs]
+
+
+def test_prediction_cache_hits():
+    component = Component()
+    prior = State()
+
+    first = component.predict(prior, timestamp=1)
+    assert component.predict(prior, timestamp=1) is first
+    assert component.predict(prior=prior, timestamp=1) is first
+    assert component.calls == 1
+    component.predict(prior, timestamp=2)
+    assert component.calls == 2
+
+    info = component.predict.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+    assert info.evictions == 0
+    assert info.currsize == 2
+    assert info.maxsize == 2
+
+
+def test_prediction_cache_per_instance():
+    component1 = Component()
+    component2 = Component()
+    prior = State()
+
+    component1.predict(prior)
+    component2.predict(prior)
+    assert component1.calls == component2.calls == 1
+    assert component1.predict.cache is not component2.predict.cache
+
+
+def test_prediction_cache_eviction():
+    component = Component()
+    priors = [State() for _ in range(3)]
+
+    for prior in priors:
+        component.predict(prior)
+    assert component.predict.cache_info().evictions == 1
+    assert component.predict.cache_info().currsize == 2
+
+    # First prior evicted
+    component.predict(priors[0])
+    assert component.calls == 4
+
+    component.predict.cache.maxsize = 1
+    assert component.predict.cache_info().currsize == 1
+    assert component.predict.cache_info().evictions == 3
+
+
+@pytest.mark.parametrize('policy, expected_calls', [('lru', 3), ('fifo', 4)])
+def test_prediction_cache_policy(policy, expected_calls):
+    component = Component()
+    component.predict.cache.policy = policy
+    prior1, prior2, prior3 = State(), State(), State()
+
+    component.predict(prior1)
+    component.predict(prior2)
+    component.predict(prior1)  # LRU moves to end; FIFO doesn't
+    component.predict(prior3)  # Evicts prior2 (LRU) or prior1 (FIFO)
+    component.predict(prior1)
+    assert component.calls == expected_calls
+
+
+def test_prediction_cache_weak_reference():
+    component = Component()
+    prior = State()
+
+    component.predict(prior)
+    assert len(component.predict.cache) == 1
+    del prior
+    gc.collect()
+    assert len(component.predict.cache) == 0
+
+
+def test_prediction_cache_invalidate():
+    component = Component()
+    prior1, prior2 = State(), State()
+
+    component.predict(prior1)
+    component.predict(prior2)
+    component.predict.cache_invalidate(prior1)
+    assert len(component.predict.cache) == 1
+    component.predict(prior1)
+    assert component.calls == 3
+
+    component.predict.cache_clear()
+    assert component.predict.cache_info() == (0, 0, 0, 2, 0)
+
+
+def test_prediction_cache_uncacheable():
+    component = Component()
+    prior = State()
+
+    # Unhashable argument
+    component.predict(prior, unhashable=[1])
+    component.predict(prior, unhashable=[1])
+    assert component.calls == 2
+
+    # Not weak referencable
+    component.predict(1)
+    component.predict(1)
+    assert component.calls == 4
+    assert len(component.predict.cache) == 0
+
+
+def test_prediction_cache_pickle():
+    cache = PredictionCache(maxsize=10, policy='fifo')
+    prior = State()
+    cache.put(prior, (), 1)
+    assert cache.get(prior, ()) == 1
+
+    new_cache = pickle.loads(pickle.dumps(cache))
+    assert new_cache.maxsize == 10
+    assert new_cache.policy == 'fifo'
+    assert len(new_cache) == 0
+
+
+def test_prediction_cache_invalid_policy():
+    with pytest.raises(ValueError):
+        PredictionCache(policy='random')
+    with pytest.raises(ValueError):
+        prediction_cache(policy='random')
+    with pytest.raises(ValueError):
+        PredictionCache().policy = 'random'
@@ -23,6 +23,16 @@ def test_subclass_remove_property(base):
         property_a = 2
     assert _TestSubclassRemoveProperty("2").property_a == 2
 
+    class _TestSubclass(base):
+        pass
+
+    # Property removed by a base class later in the method resolution order
+    class _TestSubclassMixinRemoveProperty(
+            _TestSubclass, _TestSubclassRemoveProperty):
+        pass
+    assert 'property_a' not in _TestSubclassMixinRemoveProperty.properties
+    assert _TestSubclassMixinRemoveProperty("2").property_a == 2
+
 
 def test_init_unordered(base):
     with pytest.raises(TypeError):
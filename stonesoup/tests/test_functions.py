@@ -1,9 +1,17 @@
 import numpy as np
+import pytest
 from numpy import deg2rad
 from pytest import approx
 
+from scipy.stats import multivariate_normal
+
 from ..functions import (
-    jacobian, gm_reduce_single, mod_bearing, mod_elevation)
+    jacobian, gm_reduce_single, gm_reduce_batch, mod_bearing, mod_elevation,
+    gauss_innovation_scores, gauss2sigma, sigma_point_weights,
+    unscented_transform, sqrt_unscented_transform, cholesky_update,
+    lower_sqrt, state_sqrt_covar, state_information_form)
+from ..types.numeric import Probability
+from ..types.state import GaussianState, SqrtGaussianState, InformationState
 
 
 def test_jacobian():
@@ -19,6 +27,35 @@ def test_jacobian():
     jac = jac  # Stop flake8 unused warning
 
 
+def test_jacobian_batch():
+    """ jacobian function evaluates perturbations at once """
+    calls = []
+
+    def f(x):
+        calls.append(x.shape)
+        return np.vstack((x[0]**2 * x[1], np.sin(x[1])))
+
+    x = np.array([[3.0], [1.0]])
+    jac = jacobian(f, x)
+    assert np.allclose(jac, [[2*3*1, 3**2], [0, np.cos(1)]],
+                       rtol=1e-8, atol=1e-8)
+    # Not marked as vectorised, so each perturbation in turn
+    assert calls == [(2, 1)] * 4
+
+    calls.clear()
+    f.vectorised = True
+    assert np.allclose(jacobian(f, x), jac)
+    # All perturbations at once
+    assert calls == [(2, 4)]
+
+    def f_error(x):
+        raise ValueError("Model error")
+    f_error.vectorised = True
+    # Errors aren't hidden by evaluating each perturbation in turn
+    with pytest.raises(ValueError, match="Model error"):
+        jacobian(f_error, x)
+
+
 def test_jacobian2():
     """ jacobian function test """
 
@@ -98,3 +135,236 @@ def test_elevation():
 
     for ind, val in enumerate(rad_in):
         assert rad_out[ind] == approx(mod_elevation(val))
+
+
+def test_gauss_innovation_scores():
+    mean = np.array([[1.], [-2.], [0.5]])
+    covar = np.array([[4., 1., 0.],
+                      [1., 3., 0.5],
+                      [0., 0.5, 2.]])
+    state_vectors = np.array([[1., 0., 3., -1.],
+                              [-2., 1., 0., -5.],
+                              [0.5, 0., 2., 1.]])
+
+    log_likelihoods, distances = gauss_innovation_scores(
+        state_vectors, mean, covar)
+
+    assert log_likelihoods.shape == distances.shape == (4, )
+    for state_vector, log_likelihood, distance in zip(
+            state_vectors.T, log_likelihoods, distances):
+        assert log_likelihood == approx(multivariate_normal.logpdf(
+            state_vector, mean.ravel(), covar))
+        innovation = state_vector - mean.ravel()
+        assert distance == approx(
+            np.sqrt(innovation @ np.linalg.inv(covar) @ innovation))
+    assert distances[0] == 0
+
+    # Precomputed Cholesky factor used in place of covariance
+    factored = gauss_innovation_scores(
+        state_vectors, mean, None, np.linalg.cholesky(covar))
+    assert np.allclose(factored[0], log_likelihoods)
+    assert np.allclose(factored[1], distances)
+
+
+def test_sigma_point_weights():
+    mean_weights, covar_weights = sigma_point_weights(3, 0.5, 2, 0)
+    assert mean_weights.shape == covar_weights.shape == (7, )
+    assert np.sum(mean_weights) == approx(1)
+    assert covar_weights[0] == approx(mean_weights[0] + 1 - 0.25 + 2)
+    assert np.array_equal(mean_weights[1:], covar_weights[1:])
+
+    # Cached per parameter set, and read-only
+    assert sigma_point_weights(3, 0.5, 2., 0.)[0] is mean_weights
+    assert sigma_point_weights(3, 0.5, 2, None)[0] is mean_weights  # 3-Ns
+    assert sigma_point_weights(3, 0.5, 2, 1)[0] is not mean_weights
+    with pytest.raises(ValueError):
+        mean_weights[0] = 1
+
+    _, gauss_mean_weights, gauss_covar_weights = gauss2sigma(
+        np.zeros((3, 1)), np.eye(3), 0.5, 2, 0)
+    assert gauss_mean_weights is mean_weights
+    assert gauss_covar_weights is covar_weights
+
+
+def test_unscented_transform():
+    mean = np.array([[1.], [2.]])
+    covar = np.array([[2., 0.5], [0.5, 1.]])
+    sigma_points, mean_weights, covar_weights = gauss2sigma(
+        mean, covar, 0.5, 2, 0)
+    noise_covar = np.diag([0.1, 0.2])
+
+    def fun(x):
+        return np.vstack((x[0:1, :] * x[1:2, :], np.hypot(x[0], x[1])))
+    fun.vectorised = True
+
+    calls = []
+
+    def fun_single(x):
+        # Only handles a single point
+        calls.append(x.shape)
+        return np.array([[x[0, 0] * x[1, 0]], [np.hypot(x[0, 0], x[1, 0])]])
+
+    batch = unscented_transform(
+        sigma_points, mean_weights, covar_weights, fun,
+        covar_noise=noise_covar)
+    single = unscented_transform(
+        sigma_points, mean_weights, covar_weights, fun_single,
+        covar_noise=noise_covar)
+    assert calls == [(2, 1)] * 5
+
+    for batch_output, single_output in zip(batch, single):
+        assert np.allclose(batch_output, single_output)
+
+    points_t = np.vstack((sigma_points[0] * sigma_points[1],
+                          np.hypot(sigma_points[0], sigma_points[1])))
+    expected_mean = points_t @ mean_weights[:, np.newaxis]
+    points_diff = points_t - expected_mean
+    assert np.allclose(batch[0], expected_mean)
+    assert np.allclose(
+        batch[1],
+        points_diff @ np.diag(covar_weights) @ points_diff.T + noise_covar)
+    assert np.allclose(
+        batch[2],
+        (sigma_points - sigma_points[:, 0:1]) @ np.diag(mean_weights)
+        @ points_diff.T)
+
+
+def test_lower_sqrt():
+    covar = np.array([[2., 0.5, 0.], [0.5, 1., 0.], [0., 0., 0.]])
+    sqrt_covar = lower_sqrt(covar)
+    assert np.allclose(sqrt_covar, np.tril(sqrt_covar))
+    assert np.allclose(sqrt_covar @ sqrt_covar.T, covar)
+
+    covar[2, 2] = 3.
+    assert np.allclose(lower_sqrt(covar), np.linalg.cholesky(covar))
+
+
+def test_state_sqrt_covar():
+    covar = np.array([[4., 2.], [2., 5.]])
+    sqrt_covar = np.linalg.cholesky(covar)
+    state = GaussianState([[1.], [2.]], covar)
+    assert np.allclose(state_sqrt_covar(state), sqrt_covar)
+
+    sqrt_state = SqrtGaussianState([[1.], [2.]], sqrt_covar)
+    assert np.array_equal(state_sqrt_covar(sqrt_state), sqrt_covar)
+
+
+def test_state_information_form():
+    covar = np.array([[4., 2.], [2., 5.]])
+    state = GaussianState([[1.], [2.]], covar)
+    info_vector, precision = state_information_form(state)
+    assert np.allclose(precision, np.linalg.inv(covar))
+    assert np.allclose(info_vector, np.linalg.solve(covar, [[1.], [2.]]))
+
+    info_state = InformationState(info_vector, precision)
+    info_vector2, precision2 = state_information_form(info_state)
+    assert np.array_equal(info_vector2, info_vector)
+    assert np.array_equal(precision2, precision)
+
+
+@pytest.mark.parametrize('downdate', [False, True])
+def test_cholesky_update(downdate):
+    covar = np.array([[4., 2., 0.6], [2., 5., 1.], [0.6, 1., 3.]])
+    vector = np.array([[0.5], [-1.], [0.3]])
+    lower = np.linalg.cholesky(covar)
+
+    updated = cholesky_update(lower, vector, downdate=downdate)
+    sign = -1 if downdate else 1
+    assert np.allclose(updated, np.tril(updated))
+    assert np.allclose(updated @ updated.T, covar + sign*vector @ vector.T)
+    # Input not modified
+    assert np.array_equal(lower, np.linalg.cholesky(covar))
+
+    with pytest.raises(np.linalg.LinAlgError):
+        cholesky_update(lower, 10*vector, downdate=True)
+
+
+def test_sqrt_unscented_transform():
+    mean = np.array([[1.], [2.]])
+    covar = np.array([[2., 0.5], [0.5, 1.]])
+    sqrt_covar = np.linalg.cholesky(covar)
+    noise_covar = np.diag([0.1, 0.2])
+
+    sigma_points, mean_weights, covar_weights = gauss2sigma(
+        mean, covar, 0.5, 2, 0)
+    sqrt_sigma_points, _, _ = gauss2sigma(
+        mean, sqrt_covar, 0.5, 2, 0, sqrt=True)
+    assert np.allclose(sigma_points, sqrt_sigma_points)
+    # Central covariance weight negative, so is downdated
+    assert covar_weights[0] < 0
+
+    def fun(x):
+        return np.vstack((x[0:1, :] * x[1:2, :], np.hypot(x[0], x[1])))
+
+    full = unscented_transform(
+        sigma_points, mean_weights, covar_weights, fun,
+        covar_noise=noise_covar)
+    sqrt = sqrt_unscented_transform(
+        sigma_points, mean_weights, covar_weights, fun,
+        sqrt_covar_noise=np.linalg.cholesky(noise_covar))
+
+    assert np.allclose(sqrt[0], full[0])
+    assert np.allclose(sqrt[1], np.tril(sqrt[1]))
+    assert np.allclose(sqrt[1] @ sqrt[1].T, full[1])
+    assert np.allclose(sqrt[2], full[2])
+    assert np.allclose(sqrt[3], full[3])
+
+
+def test_gm_reduce_single_probability():
+    means = np.array([[1, 2], [3, 4], [5, 6]])
+    covars = np.array([[[1, 1], [1, 0.7]],
+                       [[1.2, 1.4], [1.3, 2]],
+                       [[2, 1.4], [1.2, 1.2]]])
+    weights = np.array([Probability(1e-300), Probability(2e-300),
+                        Probability(5e-300)])
+
+    mean, covar = gm_reduce_single(means, covars, weights)
+
+    assert np.allclose(mean, np.array([[4], [5]]))
+    assert np.allclose(covar, np.array([[3.675, 3.35],
+                                        [3.2, 3.3375]]))
+
+
+def test_gm_reduce_batch():
+    np.random.seed(1993)
+    counts = [1, 3, 2]
+    mixtures = []
+    for count in counts:
+        means = np.random.randn(count, 2)
+        covars = np.array([np.eye(2) * value
+                           for value in np.random.uniform(1, 2, count)])
+        log_weights = np.random.randn(count)
+        mixtures.append((means, covars, log_weights))
+    expected = [gm_reduce_single(means, covars, np.exp(log_weights))
+                for means, covars, log_weights in mixtures]
+
+    # Ragged
+    means, covars = gm_reduce_batch(
+        np.concatenate([mixture[0] for mixture in mixtures]),
+        np.concatenate([mixture[1] for mixture in mixtures]),
+        np.concatenate([mixture[2] for mixture in mixtures]),
+        counts)
+    assert means.shape == (3, 2, 1)
+    assert covars.shape == (3, 2, 2)
+    for mean, covar, (expected_mean, expected_covar) in zip(
+            means, covars, expected):
+        assert np.allclose(mean, expected_mean)
+        assert np.allclose(covar, expected_covar)
+
+    # Padded
+    padded_means = np.zeros((3, 3, 2))
+    padded_covars = np.tile(np.eye(2), (3, 3, 1, 1))
+    padded_log_weights = np.full((3, 3), -np.inf)
+    for index, (means, covars, log_weights) in enumerate(mixtures):
+        padded_means[index, :len(means)] = means
+        padded_covars[index, :len(means)] = covars
+        padded_log_weights[index, :len(means)] = log_weights
+    means, covars = gm_reduce_batch(
+        padded_means, padded_covars, padded_log_weights)
+    for mean, covar, (expected_mean, expected_covar) in zip(
+            means, covars, expected):
+        assert np.allclose(mean, expected_mean)
+        assert np.allclose(covar, expected_covar)
+
+    with pytest.raises(ValueError):
+        gm_reduce_batch(means[0], covars[0], [0, 0], [2, 0])
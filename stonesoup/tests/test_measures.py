@@ -2,10 +2,12 @@
 import datetime
 
 import numpy as np
+import pytest
 from scipy.spatial import distance
 
 from .. import measures
 
+from ..types.angle import Bearing
 from ..types.array import StateVector, CovarianceMatrix
 from ..types.state import GaussianState
 
@@ -143,3 +145,34 @@ def test_euclideanweighted_partial_mapping():
     measure = measures.EuclideanWeighted(weight, mapping=mapping)
     assert measure(state_u, state_v) == \
         distance.euclidean([[10], [1]], [[11], [2]], weight)
+
+
+@pytest.mark.parametrize('measure', [
+    measures.Euclidean(),
+    measures.Euclidean(mapping=np.array([0, 3])),
+    measures.Mahalanobis(),
+    measures.Mahalanobis(mapping=np.array([0, 3])),
+    measures.GaussianHellinger()])
+def test_distances(measure):
+    states = [state_v, GaussianState(u + 1, vi, timestamp=t),
+              GaussianState(u - 2, ui, timestamp=t)]
+    distances = measure.distances(state_u, states)
+    assert distances.shape == (3, )
+    assert np.allclose(
+        distances, [measure(state_u, state) for state in states])
+    assert measure.distances(state_u, []).shape == (0, )
+
+
+@pytest.mark.parametrize('measure', [
+    measures.Euclidean(),
+    measures.Mahalanobis()])
+def test_distances_angles(measure):
+    # Bearings either side of +/-pi wrap, as for pairs of states
+    state1 = GaussianState(
+        StateVector([[Bearing(np.pi - 0.1)], [1.]]), np.eye(2), timestamp=t)
+    states = [GaussianState(StateVector([[Bearing(-np.pi + 0.1)], [1.]]),
+                            np.eye(2), timestamp=t)]
+    distances = measure.distances(state1, states)
+    assert distances == pytest.approx([0.2])
+    assert np.allclose(
+        distances, [measure(state1, state) for state in states])
@@ -175,3 +175,18 @@ def test_missing_property(base, serialised_file):
 
     with pytest.raises(ConstructorError, match="missing a required argument"):
         serialised_file.load(serialised_str)
+
+
+def test_state_columns(serialised_file):
+    import datetime
+    import numpy as np
+    from ..types.state import State
+    from ..types.track import Track
+
+    track = Track([State(np.array([[0]]), datetime.datetime(2018, 1, 1))],
+                  columnar=True)
+    serialised_str = serialised_file.dumps(track)
+    new_track = serialised_file.load(serialised_str)
+    assert new_track.id == track.id
+    assert len(new_track) == 1
+    assert np.array_equal(new_track.state_vector, track.state_vector)
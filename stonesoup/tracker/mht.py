@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+import heapq
+import itertools
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .base import Tracker
+from ..base import Property
+from ..buffered_generator import BufferedGenerator
+from ..functions import gauss_innovation_scores
+from ..hypothesiser import Hypothesiser
+from ..initiator import Initiator
+from ..reader import DetectionReader
+from ..types.numeric import Probability
+from ..types.track import Track
+from ..updater import Updater
+
+
+class _TrackHypothesis:
+    """Node of a track hypothesis tree
+
+    Each node is a single track hypothesis, sharing its history with its
+    parent and so all ancestors. Only detections of the last `window` nodes
+    are held in :attr:`detections`, as older decisions are final.
+    """
+    __slots__ = ('parent', 'state', 'detection', 'score', 'depth',
+                 'detections', '_track')
+
+    def __init__(self, parent, state, detection, score, window):
+        self.parent = parent
+        self.state = state
+        self.detection = detection
+        self.score = score
+        self.depth = 0 if parent is None else parent.depth + 1
+        detections = set()
+        node = self
+        for _ in range(window):
+            if node is None:
+                break
+            if node.detection is not None:
+                detections.add(node.detection)
+            node = node.parent
+        self.detections = frozenset(detections)
+        self._track = None
+
+    @property
+    def track(self):
+        """Track of this node's state only, for hypothesisers"""
+        if self._track is None:
+            self._track = Track([self.state])
+        return self._track
+
+    def ancestor(self, depth):
+        """Ancestor (or self) at `depth` in tree"""
+        node = self
+        while node.depth > depth:
+            node = node.parent
+        return node
+
+    def states(self):
+        """States of this hypothesis and its ancestors, oldest first"""
+        states = []
+        node = self
+        while node is not None:
+            states.append(node.state)
+            node = node.parent
+        return states[::-1]
+
+
+class _TrackTree:
+    """Tree of hypotheses for a single potential target"""
+    __slots__ = ('leaves', 'peak_score', 'track', 'reported')
+
+    def __init__(self, root):
+        self.leaves = [root]
+        self.peak_score = root.score
+        self.track = None
+        self.reported = None
+
+
+class MultiHypothesisTracker(Tracker):
+    """Track-oriented multiple hypothesis tracker (MHT)
+
+    Rather than committing to a single association each scan, each potential
+    target has a tree of track hypotheses, each of which is a different
+    sequence of associated detections (or missed detections). Hypotheses are
+    scored by their log likelihood ratio (LLR) against all their detections
+    being clutter [1]_: each scan a hypothesis' score increases by
+    :math:`\\log(P_D \\mathcal{N}(z; \\hat{z}, S) / \\lambda)` for associated
+    detection :math:`z`, or :math:`\\log(1 - P_D)` for a missed detection.
+    Each detection also starts a new tree, scored :attr:`initial_score`.
+
+    Each scan, the tracker:
+
+    1. Extends every leaf of every tree with each detection gated by
+       :attr:`hypothesiser`, and with a missed detection.
+    2. Splits trees into clusters which share detections, and finds the
+       :attr:`k_best` global hypotheses of each cluster: sets of track
+       hypotheses, at most one per tree, which share no detections and have
+       the highest total score. Any tree may be omitted from a global
+       hypothesis, as all its detections being clutter has an LLR of zero.
+    3. Prunes track hypotheses in none of the :attr:`k_best` global
+       hypotheses, and applies N-scan pruning: for trees in the best global
+       hypothesis, all track hypotheses which differ from it more than
+       :attr:`n_scan` scans ago are pruned, deferring decisions by at most
+       :attr:`n_scan` scans. Track hypotheses of other trees using the
+       detection so decided are also pruned. Each tree then keeps at most
+       :attr:`max_leaves` hypotheses.
+    4. Deletes trees whose best score has dropped more than
+       :attr:`deletion_threshold` below the highest it has reached, or which
+       have no remaining hypotheses.
+
+    Tracks output are those of trees in the best global hypothesis with a
+    score of at least :attr:`confirmation_threshold`. Each tree's track keeps
+    its :attr:`~.Track.id`, but the :class:`~.Track` object is replaced when
+    a revised decision changes its history.
+
+    As decisions more than :attr:`n_scan` scans ago are final, track
+    hypotheses only hold, and are only compared on, detections from the
+    last :attr:`n_scan` + 1 scans. Memory and per scan cost are therefore
+    bounded by :attr:`max_leaves`, :attr:`n_scan`, :attr:`k_best` and
+    :attr:`max_expansions`, along with the gating of
+    :attr:`hypothesiser` (e.g. :class:`~.DistanceHypothesiser` with a finite
+    :attr:`~.DistanceHypothesiser.missed_distance`), which also limits the
+    size of clusters.
+
+    Note
+    ----
+    Hypotheses from :attr:`hypothesiser` must have a Gaussian measurement
+    prediction, used for scoring.
+
+    References
+    ----------
+    .. [1] Blackman, S. S., "Multiple hypothesis tracking for multiple target
+       tracking", IEEE Aerospace and Electronic Systems Magazine, vol. 19,
+       no. 1, pp. 5-18, 2004.
+    """
+    initiator = Property(
+        Initiator,
+        doc="Initiator used to initialise a track from a single detection.")
+    detector = Property(
+        DetectionReader,
+        doc="Detector used to generate detection objects.")
+    hypothesiser = Property(
+        Hypothesiser,
+        doc="Hypothesiser used to gate and predict track hypotheses to "
+            "detections.")
+    updater = Property(
+        Updater,
+        doc="Updater used to update track hypotheses.")
+    clutter_spatial_density = Property(
+        float,
+        doc="Spatial density of clutter")
+    prob_detect = Property(
+        Probability,
+        default=Probability(0.9),
+        doc="Target detection probability. Default 0.9.")
+    n_scan = Property(
+        int,
+        default=3,
+        doc="Number of scans decisions are deferred by, before N-scan "
+            "pruning. Default 3.")
+    max_leaves = Property(
+        int,
+        default=10,
+        doc="Maximum number of track hypotheses kept per tree. Default 10.")
+    k_best = Property(
+        int,
+        default=10,
+        doc="Number of best global hypotheses per cluster whose track "
+            "hypotheses are kept. Default 10.")
+    max_expansions = Property(
+        int,
+        default=1000,
+        doc="Maximum number of partial global hypotheses expanded when "
+            "searching for the :attr:`k_best` global hypotheses of a "
+            "cluster, after which the best partial global hypotheses are "
+            "completed greedily. Default 1000.")
+    initial_score = Property(
+        float,
+        default=0.,
+        doc="Score (LLR) of a new track from a single detection. Default 0.")
+    confirmation_threshold = Property(
+        float,
+        default=0.,
+        doc="Minimum score of a track to be output. Default 0.")
+    deletion_threshold = Property(
+        float,
+        default=10.,
+        doc="Drop in score from its peak at which a tree is deleted. "
+            "Default 10.")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trees = []
+
+    @BufferedGenerator.generator_method
+    def tracks_gen(self):
+        self._trees = []
+        for time, detections in self.detector:
+            detections = set(detections)
+            for tree in self._trees:
+                tree.leaves = [
+                    child
+                    for leaf in tree.leaves
+                    for child in self._children(leaf, detections, time)]
+            for detection in detections:
+                for track in self.initiator.initiate({detection}):
+                    self._trees.append(_TrackTree(_TrackHypothesis(
+                        None, track.state, detection, self.initial_score,
+                        self.n_scan + 1)))
+
+            best_hypothesis = self._prune()
+            yield time, self._tracks(best_hypothesis)
+
+    def _children(self, leaf, detections, timestamp):
+        """Extend track hypothesis with each gated detection, or missed
+        detection"""
+        hypotheses = self.hypothesiser.hypothesise(
+            leaf.track, detections, timestamp)
+
+        log_missed = np.log1p(-float(self.prob_detect))
+        log_detect = np.log(float(self.prob_detect)) \
+            - np.log(self.clutter_spatial_density)
+
+        # Detection hypotheses grouped by measurement prediction, so each is
+        # scored with a single factorisation of the innovation covariance
+        groups = {}
+        children = []
+        for hypothesis in hypotheses:
+            if hypothesis:
+                groups.setdefault(
+                    id(hypothesis.measurement_prediction), []).append(
+                        hypothesis)
+            else:
+                children.append(_TrackHypothesis(
+                    leaf, hypothesis.prediction, None,
+                    leaf.score + log_missed, self.n_scan + 1))
+        for group in groups.values():
+            measurement_prediction = group[0].measurement_prediction
+            log_pdfs, _ = gauss_innovation_scores(
+                np.hstack([hypothesis.measurement.state_vector
+                           for hypothesis in group]),
+                measurement_prediction.state_vector,
+                measurement_prediction.covar)
+            for hypothesis, log_pdf in zip(group, log_pdfs):
+                children.append(_TrackHypothesis(
+                    leaf, self.updater.update(hypothesis),
+                    hypothesis.measurement,
+                    leaf.score + log_detect + log_pdf, self.n_scan + 1))
+        return children
+
+    def _prune(self):
+        """Prune track hypotheses and delete trees
+
+        Returns
+        -------
+        dict
+            Best global hypothesis, mapping trees to track hypotheses
+        """
+        best_hypothesis = {}
+        kept_leaves = set()
+        for cluster in self._clusters():
+            global_hypotheses = self.k_best_global_hypotheses(
+                [tree.leaves for tree in cluster], self.k_best,
+                self.max_expansions)
+            for _, leaves in global_hypotheses:
+                kept_leaves.update(leaf for leaf in leaves if leaf is not None)
+            if global_hypotheses:
+                for tree, leaf in zip(cluster, global_hypotheses[0][1]):
+                    if leaf is not None:
+                        best_hypothesis[tree] = leaf
+
+        # Detections decided by N-scan pruning, which are about to leave the
+        # window of detections held by track hypotheses
+        decided_detections = {}
+        for tree, best_leaf in best_hypothesis.items():
+            if best_leaf.depth >= self.n_scan:
+                detection = best_leaf.ancestor(
+                    best_leaf.depth - self.n_scan).detection
+                if detection is not None:
+                    decided_detections[detection] = tree
+
+        trees = []
+        for tree in self._trees:
+            leaves = [
+                leaf for leaf in tree.leaves
+                if leaf in kept_leaves
+                and all(decided_detections.get(detection, tree) is tree
+                        for detection in leaf.detections)]
+
+            # N-scan pruning, to ancestor of best hypothesis N scans ago
+            best_leaf = best_hypothesis.get(tree)
+            if best_leaf is not None and best_leaf.depth > self.n_scan:
+                depth = best_leaf.depth - self.n_scan
+                ancestor = best_leaf.ancestor(depth)
+                leaves = [leaf for leaf in leaves
+                          if leaf.ancestor(depth) is ancestor]
+
+            if len(leaves) > self.max_leaves:
+                leaves = heapq.nlargest(
+                    self.max_leaves, leaves, key=lambda leaf: leaf.score)
+                if best_leaf is not None and best_leaf not in leaves:
+                    leaves[-1] = best_leaf
+            if not leaves:
+                continue
+
+            tree.leaves = leaves
+            max_score = max(leaf.score for leaf in leaves)
+            tree.peak_score = max(tree.peak_score, max_score)
+            if tree.peak_score - max_score > self.deletion_threshold:
+                best_hypothesis.pop(tree, None)
+                continue
+            trees.append(tree)
+        self._trees = trees
+        return best_hypothesis
+
+    def _clusters(self):
+        """Split trees into clusters with no detections in common"""
+        detection_indices = {}
+        rows = []
+        columns = []
+        for tree_index, tree in enumerate(self._trees):
+            tree_detections = set()
+            for leaf in tree.leaves:
+                tree_detections |= leaf.detections
+            for detection in tree_detections:
+                rows.append(tree_index)
+                columns.append(detection_indices.setdefault(
+                    detection, len(detection_indices)))
+
+        n_trees = len(self._trees)
+        n_nodes = n_trees + len(detection_indices)
+        graph = coo_matrix(
+            (np.ones(len(rows)), (rows, np.add(columns, n_trees, dtype=int))),
+            shape=(n_nodes, n_nodes))
+        n_clusters, labels = connected_components(graph, directed=False)
+
+        clusters = [[] for _ in range(n_clusters)]
+        for tree, label in zip(self._trees, labels):
+            clusters[label].append(tree)
+        return [cluster for cluster in clusters if cluster]
+
+    @classmethod
+    def k_best_global_hypotheses(cls, trees_leaves, k, max_expansions=None):
+        """Find the k best global hypotheses
+
+        A global hypothesis selects at most one track hypothesis from each
+        tree, such that no detection is used by more than one, maximising
+        the total score. This is found by best-first search over trees, with
+        the sum of the remaining trees' best (non-negative) scores as an
+        admissible bound, such that global hypotheses are found in order.
+
+        As a track hypothesis may use several detections, this isn't a two
+        dimensional assignment problem, so the search is bounded by
+        `max_expansions` instead. Once reached, the best partial global
+        hypotheses remaining are completed greedily, taking the best
+        positive scoring track hypothesis of each remaining tree which
+        doesn't share detections, so results may then be approximate.
+        Completions which assign the same detections to each tree as
+        another global hypothesis are discarded.
+
+        Parameters
+        ----------
+        trees_leaves : list of list of track hypotheses
+            Track hypotheses of each tree, which have :attr:`score` and
+            :attr:`detections` attributes.
+        k : int
+            Maximum number of global hypotheses
+        max_expansions : int, optional
+            Maximum number of partial global hypotheses expanded. Default
+            `None`, where the search is exact.
+
+        Returns
+        -------
+        list of (float, tuple)
+            Up to `k` global hypotheses, best first, as total score and a
+            tuple with a track hypothesis (or `None`) for each tree.
+        """
+        options = [
+            sorted(leaves, key=lambda leaf: leaf.score, reverse=True)
+            for leaves in trees_leaves]
+        # Bound on score achievable from each tree onwards
+        bounds = np.cumsum([
+            max([0.] + [leaf.score for leaf in leaves])
+            for leaves in options][::-1])[::-1].tolist() + [0.]
+
+        counter = itertools.count()
+        queue = [(-bounds[0], next(counter), 0, 0., frozenset(), ())]
+        global_hypotheses = []
+        expansions = 0
+        while queue and len(global_hypotheses) < k:
+            if max_expansions is not None and expansions >= max_expansions:
+                break
+            _, _, index, score, used, selected = heapq.heappop(queue)
+            if index == len(options):
+                global_hypotheses.append((score, selected))
+                continue
+            expansions += 1
+            # Tree not in global hypothesis
+            heapq.heappush(queue, (
+                -(score + bounds[index + 1]), next(counter), index + 1,
+                score, used, selected + (None, )))
+            for leaf in options[index]:
+                if used.isdisjoint(leaf.detections):
+                    leaf_score = score + leaf.score
+                    heapq.heappush(queue, (
+                        -(leaf_score + bounds[index + 1]), next(counter),
+                        index + 1, leaf_score, used | leaf.detections,
+                        selected + (leaf, )))
+
+        # Expansion limit reached, so complete best remaining greedily. As
+        # different partial global hypotheses can complete to the same
+        # assignment of detections to trees, these are de-duplicated,
+        # keeping the best scoring.
+        found = {cls._assignment(selected)
+                 for _, selected in global_hypotheses}
+        completed = {}
+        while queue and len(completed) < k - len(global_hypotheses):
+            _, _, index, score, used, selected = heapq.heappop(queue)
+            for leaves in options[index:]:
+                for leaf in leaves:
+                    if leaf.score <= 0:
+                        leaf = None
+                        break
+                    if used.isdisjoint(leaf.detections):
+                        break
+                else:
+                    leaf = None
+                if leaf is not None:
+                    score += leaf.score
+                    used |= leaf.detections
+                selected += (leaf, )
+            assignment = cls._assignment(selected)
+            if assignment not in found and (
+                    assignment not in completed
+                    or score > completed[assignment][0]):
+                completed[assignment] = (score, selected)
+        return global_hypotheses + sorted(
+            completed.values(), key=lambda hypothesis: hypothesis[0],
+            reverse=True)
+
+    @staticmethod
+    def _assignment(selected):
+        """Detections assigned to each tree by a global hypothesis"""
+        return tuple(None if leaf is None else leaf.detections
+                     for leaf in selected)
+
+    def _tracks(self, best_hypothesis):
+        """Confirmed tracks of best global hypothesis"""
+        tracks = set()
+        for tree, leaf in best_hypothesis.items():
+            if leaf.score < self.confirmation_threshold:
+                continue
+            if tree.track is None:
+                tree.track = Track(leaf.states())
+            elif tree.reported is not leaf:
+                if leaf.parent is not None and leaf.parent is tree.reported:
+                    tree.track.append(leaf.state)
+                else:
+                    # History revised, so replace track, keeping its id
+                    tree.track = Track(leaf.states(), id=tree.track.id)
+            tree.reported = leaf
+            tracks.add(tree.track)
+        return tracks
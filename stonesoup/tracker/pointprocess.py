@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from scipy.linalg import cho_solve
+from scipy.special import logsumexp
+
+from .base import Tracker
+from ..base import Property
+from ..buffered_generator import BufferedGenerator
+from ..functions import gauss_innovation_scores
+from ..mixturereducer import MixtureReducer
+from ..predictor import Predictor
+from ..reader import DetectionReader
+from ..types.numeric import Probability
+from ..types.state import TaggedWeightedGaussianState
+from ..types.track import Track
+from ..updater import Updater
+
+
+class GMPHDTracker(Tracker):
+    """Gaussian mixture probability hypothesis density (GM-PHD) tracker
+
+    Rather than associating detections with tracks, the PHD filter [1]_
+    propagates the first moment (intensity) of the multi-target state, as a
+    mixture of :class:`~.TaggedWeightedGaussianState` components, whose
+    total weight is the expected number of targets. Each scan:
+
+    1. Components are predicted with :attr:`predictor`, their weights scaled
+       by :attr:`prob_survival`, and :attr:`birth_component` added.
+    2. Each component is updated with a missed detection, weight scaled by
+       :math:`1 - P_D`, and with every detection, weighted by its likelihood
+       relative to all components and :attr:`clutter_intensity`. Each
+       component's innovation covariance is factorised once, and gain
+       calculated once, for all detections.
+    3. Components are reduced with :attr:`reducer`, e.g. a
+       :class:`~.GaussianMixtureReducer`.
+
+    Cost is therefore linear in the number of components and detections,
+    unlike joint association. Components with weight of at least
+    :attr:`extraction_threshold` are output as tracks, where a track is the
+    history of a component tag, which updated components inherit from their
+    predicted component. Tracks are deleted when no component has their tag.
+
+    References
+    ----------
+    .. [1] Vo, B.-N. and Ma, W.-K., "The Gaussian Mixture Probability
+       Hypothesis Density Filter", IEEE Transactions on Signal Processing,
+       vol. 54, no. 11, pp. 4091-4104, 2006.
+    """
+    detector = Property(
+        DetectionReader,
+        doc="Detector used to generate detection objects.")
+    predictor = Property(
+        Predictor,
+        doc="Predictor used to predict components, e.g. "
+            ":class:`~.KalmanPredictor`.")
+    updater = Property(
+        Updater,
+        doc="Updater used to get measurement predictions of components, "
+            "including cross covariance, e.g. :class:`~.KalmanUpdater`.")
+    reducer = Property(
+        MixtureReducer,
+        doc="Reducer used to prune and merge components.")
+    birth_component = Property(
+        TaggedWeightedGaussianState,
+        doc="Birth intensity component, added each scan with a new tag.")
+    clutter_intensity = Property(
+        float,
+        doc="Clutter intensity: expected number of clutter detections per "
+            "scan, multiplied by their spatial density.")
+    prob_detect = Property(
+        Probability,
+        default=Probability(0.9),
+        doc="Target detection probability. Default 0.9.")
+    prob_survival = Property(
+        Probability,
+        default=Probability(0.99),
+        doc="Target survival probability. Default 0.99.")
+    extraction_threshold = Property(
+        float,
+        default=0.5,
+        doc="Minimum weight of a component to be output as a track. "
+            "Default 0.5.")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._components = []
+
+    @property
+    def components(self):
+        """Current components of the Gaussian mixture"""
+        return self._components
+
+    @BufferedGenerator.generator_method
+    def tracks_gen(self):
+        self._components = []
+        tracks = {}
+        for time, detections in self.detector:
+            predictions = self._predict(time)
+            self._components = self.reducer.reduce(
+                self._update(predictions, detections, time))
+
+            updated_tracks = set()
+            for component in self._components:
+                if component.weight < self.extraction_threshold:
+                    continue
+                track = tracks.get(component.tag)
+                if track is None:
+                    track = tracks[component.tag] = Track(id=component.tag)
+                elif track in updated_tracks:
+                    # Only highest weight component of tag
+                    continue
+                track.append(component)
+                updated_tracks.add(track)
+
+            tags = {component.tag for component in self._components}
+            tracks = {tag: track for tag, track in tracks.items()
+                      if tag in tags}
+            yield time, updated_tracks
+
+    def _predict(self, timestamp):
+        """Predicted components, as (prediction, weight, tag) tuples"""
+        predictions = [
+            (self.predictor.predict(component, timestamp=timestamp),
+             component.weight * float(self.prob_survival),
+             component.tag)
+            for component in self._components]
+        birth = self.birth_component
+        predictions.append((
+            TaggedWeightedGaussianState(
+                birth.state_vector, birth.covar, timestamp=timestamp),
+            birth.weight,
+            None))
+        return predictions
+
+    def _update(self, predictions, detections, timestamp):
+        """Updated components, from missed and each detection"""
+        prob_detect = float(self.prob_detect)
+        components = [
+            TaggedWeightedGaussianState(
+                prediction.state_vector, prediction.covar,
+                timestamp=timestamp, weight=weight * (1 - prob_detect),
+                tag=tag)
+            for prediction, weight, tag in predictions]
+
+        detections = list(detections)
+        if not detections:
+            return components
+        state_vectors = np.hstack(
+            [detection.state_vector for detection in detections])
+
+        log_weights = []
+        posteriors = []
+        for prediction, weight, _ in predictions:
+            measurement_prediction = self.updater.predict_measurement(
+                prediction)
+            # Innovation covariance factorised once, for both scores and gain
+            innov_covar = np.asarray(
+                measurement_prediction.covar, dtype=np.float_)
+            cholesky = np.linalg.cholesky(innov_covar)
+            log_pdfs, _ = gauss_innovation_scores(
+                state_vectors, measurement_prediction.state_vector,
+                innov_covar, cholesky)
+            with np.errstate(divide='ignore'):
+                log_weights.append(
+                    np.log(prob_detect * weight) + log_pdfs)
+
+            # Gain and posterior covariance are common to all detections
+            cross_covar = np.asarray(
+                measurement_prediction.cross_covar, dtype=np.float_)
+            gain = cho_solve((cholesky, True), cross_covar.T).T
+            means = prediction.state_vector + gain @ np.asarray(
+                state_vectors - measurement_prediction.state_vector,
+                dtype=np.float_)
+            covar = prediction.covar - gain @ innov_covar @ gain.T
+            posteriors.append((means, covar))
+
+        # Normalise each detection's weights over components and clutter
+        log_weights = np.array(log_weights)
+        log_normalisers = logsumexp(np.vstack((
+            log_weights,
+            np.full((1, len(detections)), np.log(self.clutter_intensity)))),
+            axis=0)
+        weights = np.exp(log_weights - log_normalisers)
+
+        for (_, _, tag), (means, covar), component_weights in zip(
+                predictions, posteriors, weights):
+            for index, weight in enumerate(component_weights):
+                components.append(TaggedWeightedGaussianState(
+                    means[:, index:index+1], covar, timestamp=timestamp,
+                    weight=weight, tag=tag))
+        return components
@@ -8,9 +8,10 @@ from ..deleter import Deleter
 from ..reader import DetectionReader
 from ..initiator import Initiator
 from ..updater import Updater
+from ..types.numeric import Probability
 from ..types.prediction import GaussianStatePrediction
 from ..types.update import GaussianStateUpdate
-from ..functions import gm_reduce_single
+from ..functions import gm_reduce_batch
 from stonesoup.buffered_generator import BufferedGenerator
 
 
@@ -179,34 +180,33 @@ class MultiTargetMixtureTracker(Tracker):
             associations = self.data_associator.associate(
                 tracks, detections, time)
             unassociated_detections = set(detections)
-            for track, multihypothesis in associations.items():
 
-                # calculate each Track's state as a Gaussian Mixture of
-                # its possible associations with each detection, then
-                # reduce the Mixture to a single Gaussian State
-                posterior_states = []
-                posterior_state_weights = []
+            # calculate each Track's state as a Gaussian Mixture of
+            # its possible associations with each detection, then
+            # reduce all Tracks' Mixtures to single Gaussian States at once
+            means = []
+            covars = []
+            log_weights = []
+            for multihypothesis in associations.values():
                 for hypothesis in multihypothesis:
                     if not hypothesis:
-                        posterior_states.append(hypothesis.prediction)
+                        posterior_state = hypothesis.prediction
                     else:
-                        posterior_states.append(
-                            self.updater.update(hypothesis))
-                    posterior_state_weights.append(
-                        hypothesis.probability)
-
-                means = np.array([state.state_vector for state
-                                  in posterior_states])
-                means = np.reshape(means, np.shape(means)[:-1])
-                covars = np.array([state.covar for state
-                                   in posterior_states])
-                covars = np.reshape(covars, (np.shape(covars)))
-                weights = np.array([weight for weight
-                                    in posterior_state_weights])
-                weights = np.reshape(weights, np.shape(weights))
-
-                post_mean, post_covar = gm_reduce_single(means,
-                                                         covars, weights)
+                        posterior_state = self.updater.update(hypothesis)
+                    means.append(np.ravel(posterior_state.state_vector))
+                    covars.append(posterior_state.covar)
+                    log_weights.append(
+                        Probability(hypothesis.probability).log_value)
+            if associations:
+                post_means, post_covars = gm_reduce_batch(
+                    np.array(means), np.array(covars), np.array(log_weights),
+                    [len(multihypothesis)
+                     for multihypothesis in associations.values()])
+            else:
+                post_means = post_covars = []
+
+            for (track, multihypothesis), post_mean, post_covar in zip(
+                    associations.items(), post_means, post_covars):
 
                 missed_detection_weight = next(
                     hyp.weight for hyp in multihypothesis if not hyp)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import datetime
+from collections import namedtuple
+
+import numpy as np
+
+from ..mht import MultiHypothesisTracker
+from ...buffered_generator import BufferedGenerator
+from ...hypothesiser.distance import DistanceHypothesiser
+from ...initiator.simple import SimpleMeasurementInitiator
+from ...measures import Mahalanobis
+from ...models.measurement.linear import LinearGaussian
+from ...models.transition.linear import (
+    CombinedLinearGaussianTransitionModel, ConstantVelocity)
+from ...predictor.kalman import KalmanPredictor
+from ...reader import DetectionReader
+from ...types.detection import Detection, Clutter
+from ...types.state import GaussianState
+from ...updater.kalman import KalmanUpdater
+
+
+Leaf = namedtuple('Leaf', ['score', 'detections'])
+
+
+def test_k_best_global_hypotheses():
+    a, b, c = 'abc'
+    trees_leaves = [
+        [Leaf(5, frozenset({a})), Leaf(3, frozenset({b})),
+         Leaf(-1, frozenset())],
+        [Leaf(4, frozenset({a})), Leaf(1, frozenset({c}))],
+        [Leaf(-2, frozenset({b}))]]
+
+    global_hypotheses = MultiHypothesisTracker.k_best_global_hypotheses(
+        trees_leaves, 100)
+
+    # Brute force all valid global hypotheses
+    expected = []
+    for selected in np.ndindex(*(len(leaves) + 1 for leaves in trees_leaves)):
+        leaves = [leaves[index] if index < len(leaves) else None
+                  for leaves, index in zip(trees_leaves, selected)]
+        detections = [detection
+                      for leaf in leaves if leaf is not None
+                      for detection in leaf.detections]
+        if len(detections) == len(set(detections)):
+            expected.append(sum(leaf.score for leaf in leaves
+                                if leaf is not None))
+
+    assert len(global_hypotheses) == len(expected)
+    assert [score for score, _ in global_hypotheses] \
+        == sorted(expected, reverse=True)
+    assert global_hypotheses[0] == (
+        7, (trees_leaves[0][1], trees_leaves[1][0], None))
+    for score, leaves in global_hypotheses:
+        assert score == sum(leaf.score for leaf in leaves if leaf is not None)
+
+    assert len(MultiHypothesisTracker.k_best_global_hypotheses(
+        trees_leaves, 3)) == 3
+    assert MultiHypothesisTracker.k_best_global_hypotheses([], 3) == [(0, ())]
+
+    # Limited expansions completes greedily, still without shared detections
+    global_hypotheses = MultiHypothesisTracker.k_best_global_hypotheses(
+        trees_leaves, 3, max_expansions=1)
+    assert [score for score, _ in global_hypotheses] == [7, 6, 4]
+    for score, leaves in global_hypotheses:
+        assert score == sum(leaf.score for leaf in leaves if leaf is not None)
+        detections = [detection
+                      for leaf in leaves if leaf is not None
+                      for detection in leaf.detections]
+        assert len(detections) == len(set(detections))
+
+    # Greedy completions with the same assignment are only returned once
+    trees_leaves = [
+        [Leaf(5, frozenset({a})), Leaf(4, frozenset({a}))],
+        [Leaf(3, frozenset({b}))]]
+    global_hypotheses = MultiHypothesisTracker.k_best_global_hypotheses(
+        trees_leaves, 3, max_expansions=1)
+    assert global_hypotheses == [
+        (8, (trees_leaves[0][0], trees_leaves[1][0])),
+        (3, (None, trees_leaves[1][0]))]
+
+
+def test_multi_hypothesis_tracker():
+    np.random.seed(1991)
+    start = datetime.datetime(2020, 1, 1)
+    transition_model = CombinedLinearGaussianTransitionModel(
+        [ConstantVelocity(0.01), ConstantVelocity(0.01)])
+    measurement_model = LinearGaussian(4, [0, 2], np.eye(2) * 0.25)
+    truths = [np.array([[0.], [1.], [0.], [1.]]),
+              np.array([[0.], [1.], [20.], [-1.]])]
+
+    class TestDetector(DetectionReader):
+        @BufferedGenerator.generator_method
+        def detections_gen(self):
+            for step in range(20):
+                time = start + datetime.timedelta(seconds=step)
+                detections = set()
+                for truth in truths:
+                    truth[:] = transition_model.function(
+                        truth, time_interval=datetime.timedelta(seconds=1))
+                    if step == 0 or np.random.rand() < 0.9:
+                        detections.add(Detection(
+                            measurement_model.function(truth),
+                            timestamp=time))
+                for _ in range(np.random.poisson(3)):
+                    detections.add(Clutter(
+                        np.random.uniform(-10, 40, (2, 1)), timestamp=time))
+                yield time, detections
+
+    predictor = KalmanPredictor(transition_model)
+    updater = KalmanUpdater(measurement_model)
+    hypothesiser = DistanceHypothesiser(
+        predictor, updater, Mahalanobis(), missed_distance=4)
+    initiator = SimpleMeasurementInitiator(
+        GaussianState(np.zeros((4, 1)), np.diag([0, 1, 0, 1])),
+        measurement_model)
+    tracker = MultiHypothesisTracker(
+        initiator, TestDetector(), hypothesiser, updater,
+        clutter_spatial_density=3 / 50**2, n_scan=2, max_leaves=5, k_best=5,
+        confirmation_threshold=10)
+
+    for _, tracks in tracker:
+        # Bounded number of hypotheses, holding detections of N+1 scans
+        assert all(len(tree.leaves) <= 5 for tree in tracker._trees)
+        assert all(len(leaf.detections) <= 3
+                   for tree in tracker._trees for leaf in tree.leaves)
+        # Hypotheses of output tracks share history more than N scans ago
+        for tree in tracker._trees:
+            if tree.reported in tree.leaves and tree.reported.depth > 2:
+                depth = tree.reported.depth - 2
+                assert all(leaf.ancestor(depth)
+                           is tree.reported.ancestor(depth)
+                           for leaf in tree.leaves)
+
+    # Both targets tracked, and no clutter tracks
+    assert len(tracks) == 2
+    for track in tracks:
+        assert len(track) > 10
+        assert min(
+            np.linalg.norm(track.state_vector[[0, 2], :]
+                           - truth[[0, 2], :])
+            for truth in truths) < 2
+    assert len({track.id for track in tracks}) == 2
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import numpy as np
+
+from ..pointprocess import GMPHDTracker
+from ...buffered_generator import BufferedGenerator
+from ...mixturereducer.gaussianmixture import GaussianMixtureReducer
+from ...models.measurement.linear import LinearGaussian
+from ...models.transition.linear import (
+    CombinedLinearGaussianTransitionModel, ConstantVelocity)
+from ...predictor.kalman import KalmanPredictor
+from ...reader import DetectionReader
+from ...types.detection import Detection, Clutter
+from ...types.state import TaggedWeightedGaussianState
+from ...updater.kalman import KalmanUpdater
+
+
+def test_gmphd_tracker():
+    np.random.seed(1992)
+    start = datetime.datetime(2020, 1, 1)
+    transition_model = CombinedLinearGaussianTransitionModel(
+        [ConstantVelocity(0.01), ConstantVelocity(0.01)])
+    measurement_model = LinearGaussian(4, [0, 2], np.eye(2) * 0.25)
+    truths = [np.array([[0.], [1.], [0.], [1.]]),
+              np.array([[0.], [1.], [20.], [-1.]])]
+
+    class TestDetector(DetectionReader):
+        @BufferedGenerator.generator_method
+        def detections_gen(self):
+            for step in range(20):
+                time = start + datetime.timedelta(seconds=step)
+                detections = set()
+                for truth in truths:
+                    truth[:] = transition_model.function(
+                        truth, time_interval=datetime.timedelta(seconds=1))
+                    if np.random.rand() < 0.95:
+                        detections.add(Detection(
+                            measurement_model.function(truth),
+                            timestamp=time))
+                for _ in range(np.random.poisson(3)):
+                    detections.add(Clutter(
+                        np.random.uniform(-10, 40, (2, 1)), timestamp=time))
+                yield time, detections
+
+    birth_component = TaggedWeightedGaussianState(
+        np.array([[10.], [0.], [10.], [0.]]), np.diag([400, 4, 400, 4]),
+        weight=0.2)
+    tracker = GMPHDTracker(
+        TestDetector(),
+        KalmanPredictor(transition_model),
+        KalmanUpdater(measurement_model),
+        GaussianMixtureReducer(max_components=50),
+        birth_component,
+        clutter_intensity=3 / 50**2,
+        prob_detect=0.95)
+
+    for _, tracks in tracker:
+        assert len(tracker.components) <= 50
+
+    # Expected number of targets
+    assert abs(sum(component.weight for component in tracker.components)
+               - 2) < 0.5
+
+    assert len(tracks) == 2
+    for track in tracks:
+        assert len(track) > 10
+        assert min(
+            np.linalg.norm(track.state_vector[[0, 2], :]
+                           - truth[[0, 2], :])
+            for truth in truths) < 2
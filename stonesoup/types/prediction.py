@@ -2,7 +2,8 @@
 from ..base import Property
 from .array import CovarianceMatrix
 from .base import Type
-from .state import State, GaussianState, ParticleState
+from .state import State, GaussianState, SqrtGaussianState, \
+    InformationState, ParticleState, ParticleArrayState
 
 
 class Prediction(Type):
@@ -61,6 +62,43 @@ class GaussianMeasurementPrediction(MeasurementPrediction, GaussianState):
                          cross_covar, *args, **kwargs)
 
 
+class SqrtGaussianStatePrediction(Prediction, SqrtGaussianState):
+    """ SqrtGaussianStatePrediction type
+
+    This is a Gaussian state prediction object, with the covariance held in
+    square root form.
+    """
+
+
+class SqrtGaussianMeasurementPrediction(MeasurementPrediction,
+                                        SqrtGaussianState):
+    """ SqrtGaussianMeasurementPrediction type
+
+    This is a Gaussian measurement prediction object, with the innovation
+    covariance held in square root form.
+    """
+
+    cross_covar = Property(CovarianceMatrix,
+                           doc="The state-measurement cross covariance matrix",
+                           default=None)
+
+    def __init__(self, state_vector, sqrt_covar, timestamp=None,
+                 cross_covar=None, *args, **kwargs):
+        if(cross_covar is not None
+           and cross_covar.shape[1] != state_vector.shape[0]):
+            raise ValueError("cross_covar should have the same number of \
+                             columns as the number of rows in state_vector")
+        super().__init__(state_vector, sqrt_covar, timestamp,
+                         cross_covar, *args, **kwargs)
+
+
+class InformationStatePrediction(Prediction, InformationState):
+    """ InformationStatePrediction type
+
+    This is a Gaussian state prediction object, in information form.
+    """
+
+
 class ParticleStatePrediction(Prediction, ParticleState):
     """ParticleStatePrediction type
 
@@ -73,3 +111,18 @@ class ParticleMeasurementPrediction(MeasurementPrediction, ParticleState):
 
     This is a simple Particle measurement prediction object.
     """
+
+
+class ParticleArrayStatePrediction(Prediction, ParticleArrayState):
+    """ParticleArrayStatePrediction type
+
+    This is a simple array backed Particle state prediction object.
+    """
+
+
+class ParticleArrayMeasurementPrediction(MeasurementPrediction,
+                                         ParticleArrayState):
+    """ParticleArrayMeasurementPrediction type
+
+    This is a simple array backed Particle measurement prediction object.
+    """
@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import datetime
+import uuid
 from collections.abc import MutableSequence
 
 import numpy as np
+from scipy.special import logsumexp
 
 from ..base import Property
 from .array import StateVector, CovarianceMatrix
 from .base import Type
+from .numeric import Probability
 from .particle import Particle
 
 
@@ -31,6 +34,328 @@ class State(Type):
         return self.state_vector.shape[0]
 
 
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_NO_TIMESTAMP = np.iinfo(np.int64).min
+
+
+def _timestamp_key(timestamp):
+    """Integer microseconds since epoch, used for sorting and searching"""
+    if timestamp is None:
+        return _NO_TIMESTAMP
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch) // _MICROSECOND
+
+
+class StateColumns(MutableSequence):
+    """Columnar, array backed sequence of :class:`~.State` instances
+
+    Acts like a regular list of states, but in addition holds the timestamps
+    of the states in an :class:`numpy.int64` array (microseconds since
+    epoch), and state vectors and covariances in contiguous arrays, which are
+    grown geometrically as states are added. This allows timestamp lookups
+    and time slices to be made by binary search, and for the whole sequence
+    to be accessed as arrays via :attr:`timestamps`, :attr:`state_vectors`
+    and :attr:`covars`.
+
+    Columns are a copy of each state's values at the time it was added to
+    the sequence; states modified in place after this won't be reflected.
+    As timestamps are compared, they must be either all timezone naive or
+    all timezone aware, and a :class:`TypeError` is raised otherwise, as
+    when comparing :class:`datetime.datetime` objects.
+
+    Parameters
+    ----------
+    states : iterable of :class:`~.State`, optional
+        Initial states.
+    """
+
+    def __init__(self, states=()):
+        self._states = []
+        self._capacity = 0
+        self._times = np.empty((0, ), dtype=np.int64)
+        self._vectors = None
+        self._covars = None
+        self._untimed = 0
+        self._aware = None
+        self._sorted = True
+        self._order = None
+        self.extend(states)
+
+    def __len__(self):
+        return len(self._states)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self._states)
+
+    def __eq__(self, other):
+        if isinstance(other, StateColumns):
+            other = other._states
+        return self._states == other
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._take(range(len(self))[index])
+        return self._states[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            states = list(self._states)
+            states[index] = value
+            self._reset(states)
+            return
+        index = range(len(self))[index]  # Normalise and check bounds
+        old_state = self._states[index]
+        self._check_timestamp(value.timestamp, old_state)
+        self._states[index] = value
+        self._untimed -= old_state.timestamp is None
+        self._write_row(index, value)
+        self._sorted = None
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            states = list(self._states)
+            del states[index]
+            self._reset(states)
+            return
+        index = range(len(self))[index]  # Normalise and check bounds
+        self._untimed -= self._states.pop(index).timestamp is None
+        n = len(self._states)
+        for array in (self._times, self._vectors, self._covars):
+            if array is not None:
+                array[index:n] = array[index+1:n+1]
+        self._order = None
+        if not self._sorted:
+            self._sorted = None
+
+    def insert(self, index, value):
+        self._check_timestamp(value.timestamp)
+        n = len(self._states)
+        index = max(index + n, 0) if index < 0 else min(index, n)
+        self._reserve(n + 1)
+        for array in (self._times, self._vectors, self._covars):
+            if array is not None and index < n:
+                array[index+1:n+1] = array[index:n]
+        self._states.insert(index, value)
+        self._write_row(index, value)
+        if index < n:
+            self._sorted = None
+        elif self._sorted and n and self._times[n] < self._times[n-1]:
+            self._sorted = False
+
+    def _reset(self, states):
+        # Built separately, such that sequence is unchanged on error
+        self.__dict__.update(vars(type(self)(states)))
+
+    def _check_timestamp(self, timestamp, replaced=None):
+        """Raise TypeError if `timestamp` can't be compared with those of
+        the states, other than the `replaced` state"""
+        if timestamp is None:
+            return
+        n_timed = len(self) - self._untimed
+        if replaced is not None and replaced.timestamp is not None:
+            n_timed -= 1
+        if n_timed and (timestamp.utcoffset() is not None) != self._aware:
+            raise TypeError(
+                "can't compare offset-naive and offset-aware datetimes")
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2*self._capacity, 8)
+        times = np.empty((capacity, ), dtype=np.int64)
+        times[:len(self)] = self._times[:len(self)]
+        self._times = times
+        if self._vectors is not None:
+            vectors = np.empty((capacity, ) + self._vectors.shape[1:])
+            vectors[:len(self)] = self._vectors[:len(self)]
+            self._vectors = vectors
+        if self._covars is not None:
+            covars = np.empty((capacity, ) + self._covars.shape[1:])
+            covars[:len(self)] = self._covars[:len(self)]
+            self._covars = covars
+        self._capacity = capacity
+
+    def _write_row(self, index, state):
+        self._order = None
+        timestamp = state.timestamp
+        self._times[index] = _timestamp_key(timestamp)
+        self._untimed += timestamp is None
+        if timestamp is not None:
+            self._aware = timestamp.utcoffset() is not None
+
+        if len(self) == 1:
+            self._vectors = self._covars = None
+        elif self._vectors is None and self._covars is None:
+            return
+        if len(self) == 1 or self._vectors is not None:
+            self._vectors = self._write_value(
+                self._vectors, index, state,
+                'state_vector' if isinstance(state, State) else None)
+        if len(self) == 1 or self._covars is not None:
+            self._covars = self._write_value(
+                self._covars, index, state,
+                'covar' if isinstance(state, GaussianState) else None)
+
+    def _write_value(self, array, index, state, name):
+        # Returns column array, or `None` if state can't be held in it, in
+        # which case column is built on demand from the states instead.
+        if name is None:
+            return None
+        value = np.asarray(getattr(state, name), dtype=np.float_)
+        if name == 'state_vector':
+            value = value[:, 0]
+        if array is None:
+            array = np.empty((self._capacity, ) + value.shape)
+        elif array.shape[1:] != value.shape:
+            return None
+        array[index] = value
+        return array
+
+    def _take(self, indices):
+        """New sequence of states at `indices`, copying column rows"""
+        indices = np.asarray(indices, dtype=np.intp)
+        new = type(self)()
+        new._states = [self._states[index] for index in indices]
+        new._capacity = len(indices)
+        new._times = self._times[indices]
+        if self._vectors is not None:
+            new._vectors = self._vectors[indices]
+        if self._covars is not None:
+            new._covars = self._covars[indices]
+        new._untimed = sum(state.timestamp is None for state in new._states)
+        new._aware = self._aware
+        new._sorted = None
+        return new
+
+    def _search_order(self):
+        """Returns sorted timestamps, and order of states (or `None` if
+        already sorted) for binary search"""
+        times = self._times[:len(self)]
+        if self._sorted is None:
+            self._sorted = bool(np.all(times[1:] >= times[:-1]))
+        if self._sorted:
+            return times, None
+        if self._order is None:
+            order = np.argsort(times, kind='stable')
+            self._order = times[order], order
+        return self._order
+
+    def index_of(self, timestamp):
+        """Index of first state with `timestamp`
+
+        Parameters
+        ----------
+        timestamp : datetime.datetime
+            Timestamp to look up.
+
+        Returns
+        -------
+        int
+            Index of state.
+
+        Raises
+        ------
+        IndexError
+            If no state has `timestamp`.
+        """
+        try:
+            self._check_timestamp(timestamp)
+        except TypeError:
+            # As with datetime equality, naive and aware never match
+            raise IndexError('timestamp not found in states') from None
+        key = _timestamp_key(timestamp)
+        times, order = self._search_order()
+        index = np.searchsorted(times, key, side='left')
+        if index >= len(times) or times[index] != key:
+            raise IndexError('timestamp not found in states')
+        return int(index if order is None else order[index])
+
+    def time_slice_indices(self, start=None, stop=None):
+        """Indices of states with timestamps in interval [`start`, `stop`)
+
+        Parameters
+        ----------
+        start : datetime.datetime, optional
+            Inclusive start time. Default `None`, for no lower bound.
+        stop : datetime.datetime, optional
+            Exclusive stop time. Default `None`, for no upper bound.
+
+        Returns
+        -------
+        numpy.ndarray of int
+            Indices of states, in sequence order.
+        """
+        if any(time is not None and not isinstance(time, datetime.datetime)
+               for time in (start, stop)) \
+                or (self._untimed and (start or stop)):
+            raise TypeError(
+                'both indices must be `datetime.datetime` objects for'
+                'time slice')
+        for time in (start, stop):
+            self._check_timestamp(time)
+        times, order = self._search_order()
+        low = np.searchsorted(times, _timestamp_key(start), side='left') \
+            if start else 0
+        high = np.searchsorted(times, _timestamp_key(stop), side='left') \
+            if stop else len(times)
+        if order is None:
+            return np.arange(low, max(low, high))
+        return np.sort(order[low:high])
+
+    @staticmethod
+    def _read_only(array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self):
+        """Timestamps as a read-only (N, ) :class:`numpy.int64` array of
+        microseconds since epoch (UTC if timezone aware). States with no
+        timestamp have the minimum int64 value."""
+        return self._read_only(self._times[:len(self)])
+
+    @property
+    def datetimes(self):
+        """Timestamps as a (N, ) :class:`numpy.datetime64` array, with
+        `NaT` for states with no timestamp"""
+        # Minimum int64 value is NaT
+        return self._times[:len(self)].astype('datetime64[us]')
+
+    @property
+    def state_vectors(self):
+        """State vectors as a read-only (N, ndim) array"""
+        if self._vectors is None:
+            return self._read_only(self._column('state_vector')[..., 0])
+        return self._read_only(self._vectors[:len(self)])
+
+    @property
+    def covars(self):
+        """Covariances as a read-only (N, ndim, ndim) array"""
+        if self._covars is None:
+            return self._read_only(self._column('covar'))
+        return self._read_only(self._covars[:len(self)])
+
+    def _column(self, name):
+        # Fallback for states which aren't held in columns, e.g. those of
+        # inconsistent dimensions or with derived values (particle states)
+        try:
+            return np.array(
+                [getattr(state, name) for state in self._states],
+                dtype=np.float_)
+        except ValueError as exc:
+            raise ValueError(
+                "states' {} are of inconsistent shape".format(name)) from exc
+
+    def __getstate__(self):
+        return {'states': self._states}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
 class StateMutableSequence(Type, MutableSequence):
     """A mutable sequence for :class:`~.State` instances
 
@@ -38,6 +363,12 @@ class StateMutableSequence(Type, MutableSequence):
     proxying state attributes to the last state in the sequence. This sequence
     can also be indexed/sliced by :class:`datetime.datetime` instances.
 
+    For long sequences, states can be held in a :class:`~.StateColumns`
+    instance, either passed in as `states` or by setting `columnar` to `True`.
+    Timestamp indexing and slicing is then done by binary search, and the
+    states' values are available as arrays via :attr:`states`, e.g.
+    ``sequence.states.state_vectors``.
+
     Example
     -------
     >>> t0 = datetime.datetime(2018, 1, 1, 14, 00)
@@ -58,12 +389,14 @@ class StateMutableSequence(Type, MutableSequence):
         doc="The initial list of states. Default `None` which initialises"
             "with empty list.")
 
-    def __init__(self, states=None, *args, **kwargs):
+    def __init__(self, states=None, *args, columnar=False, **kwargs):
         if states is None:
             states = []
-        elif not isinstance(states, list):
+        elif not isinstance(states, (list, StateColumns)):
             # Ensure states is a list
             states = [states]
+        if columnar and not isinstance(states, StateColumns):
+            states = StateColumns(states)
         super().__init__(states, *args, **kwargs)
 
     def __len__(self):
@@ -76,6 +409,16 @@ class StateMutableSequence(Type, MutableSequence):
         return self.states.__delitem__(index)
 
     def __getitem__(self, index):
+        if isinstance(self.states, StateColumns):
+            if isinstance(index, slice) and (
+                    isinstance(index.start, datetime.datetime)
+                    or isinstance(index.stop, datetime.datetime)):
+                indices = self.states.time_slice_indices(
+                    index.start, index.stop)
+                return StateMutableSequence(
+                    self.states._take(indices[::index.step]))
+            elif isinstance(index, datetime.datetime):
+                return self.states[self.states.index_of(index)]
         if isinstance(index, slice) and (
                 isinstance(index.start, datetime.datetime)
                 or isinstance(index.stop, datetime.datetime)):
@@ -141,6 +484,94 @@ class GaussianState(State):
         return self.state_vector
 
 
+class SqrtGaussianState(State):
+    """Square root Gaussian State type
+
+    Gaussian state where the covariance is held as a lower-triangular square
+    root :math:`L`, such that the covariance is :math:`P = L L^T`. This is
+    used by square root filters, which propagate :math:`L` directly.
+    """
+    sqrt_covar = Property(
+        CovarianceMatrix,
+        doc='Lower-triangular square root of the covariance matrix of state.')
+
+    def __init__(self, state_vector, sqrt_covar, *args, **kwargs):
+        sqrt_covar = CovarianceMatrix(sqrt_covar)
+        super().__init__(state_vector, sqrt_covar, *args, **kwargs)
+        if self.state_vector.shape[0] != self.sqrt_covar.shape[0]:
+            raise ValueError(
+                "state vector and sqrt_covar should have same dimensions")
+
+    @property
+    def mean(self):
+        """The state mean, equivalent to state vector"""
+        return self.state_vector
+
+    @property
+    def covar(self):
+        """Covariance matrix of state, :math:`L L^T`"""
+        return self.sqrt_covar @ self.sqrt_covar.T
+
+
+class InformationState(State):
+    r"""Information State type
+
+    Gaussian state in information (canonical) form, described by the
+    information vector :math:`\mathbf{y} = P^{-1} \mathbf{x}` and the
+    information matrix :math:`Y = P^{-1}`. Information from independent
+    measurements is additive in this form, and a state of no information can
+    be represented with a zero information matrix.
+
+    The information vector is held as :attr:`information_vector`, such that
+    :attr:`state_vector` remains the state mean, as with other states.
+    """
+    information_vector = Property(
+        StateVector,
+        doc='Information vector of state, the information matrix multiplied '
+            'by the state mean.')
+    precision = Property(
+        CovarianceMatrix,
+        doc='Information matrix of state, the inverse of the covariance '
+            'matrix.')
+
+    def __init__(self, information_vector, precision, *args, **kwargs):
+        precision = CovarianceMatrix(precision)
+        super().__init__(information_vector, precision, *args, **kwargs)
+        if self.information_vector.shape[0] != self.precision.shape[0]:
+            raise ValueError(
+                "information vector and precision should have same "
+                "dimensions")
+
+    @property
+    def ndim(self):
+        """The number of dimensions represented by the state."""
+        return self.information_vector.shape[0]
+
+    @property
+    def state_vector(self):
+        """The state mean, :math:`Y^{-1} \\mathbf{y}`"""
+        return StateVector(
+            np.linalg.solve(self.precision, self.information_vector))
+
+    @property
+    def mean(self):
+        """The state mean, :math:`Y^{-1} \\mathbf{y}`"""
+        return self.state_vector
+
+    @property
+    def covar(self):
+        """Covariance matrix of state, :math:`Y^{-1}`"""
+        return CovarianceMatrix(np.linalg.inv(self.precision))
+
+    @property
+    def gaussian_state(self):
+        """The state in moment form, as a :class:`~.GaussianState`. The
+        information matrix is only inverted once."""
+        covar = np.linalg.inv(self.precision)
+        return GaussianState(covar @ np.asfarray(self.information_vector),
+                             covar, timestamp=self.timestamp)
+
+
 class WeightedGaussianState(GaussianState):
     """Weighted Gaussian State Type
 
@@ -150,6 +581,23 @@ class WeightedGaussianState(GaussianState):
     weight = Property(float, default=0, doc="Weight of the Gaussian State.")
 
 
+class TaggedWeightedGaussianState(WeightedGaussianState):
+    """Tagged Weighted Gaussian State Type
+
+    Weighted Gaussian State object with a tag, such that components of a
+    Gaussian mixture can be followed over time, e.g. to form tracks.
+    """
+    tag = Property(
+        str, default=None,
+        doc="Unique tag of the Gaussian State. Default `None`, where a new "
+            "unique tag is generated.")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.tag is None:
+            self.tag = str(uuid.uuid4())
+
+
 class ParticleState(Type):
     """Particle State type
 
@@ -182,3 +630,105 @@ class ParticleState(Type):
         if not cov.shape:
             cov = cov.reshape(1, 1)
         return cov
+
+
+class ParticleArrayState(Type):
+    """Array backed Particle State type
+
+    This is a particle state object which, like :class:`~.ParticleState`,
+    describes the state as a distribution of particles. The particles are
+    held as the columns of a single (ndim, N) array of state vectors, with
+    weights held as a (N, ) array of natural log weights, such that
+    predictors, updaters and resamplers can operate on all particles at once.
+
+    Unlike :class:`~.Particle`, particles held in this state don't record
+    their parent."""
+
+    state_vectors = Property(
+        np.ndarray, doc="Particle state vectors, as a (ndim, N) array.")
+    log_weights = Property(
+        np.ndarray, default=None,
+        doc="Natural log of particle weights, as a (N, ) array. Default "
+            "`None` which gives all particles equal weight.")
+    timestamp = Property(datetime.datetime, default=None,
+                         doc="Timestamp of the state. Default None.")
+
+    def __init__(self, state_vectors, *args, **kwargs):
+        state_vectors = np.asarray(state_vectors, dtype=np.float_)
+        if state_vectors.ndim != 2:
+            raise ValueError("state_vectors should be a (ndim, N) array")
+        super().__init__(state_vectors, *args, **kwargs)
+        num_particles = state_vectors.shape[1]
+        if self.log_weights is None:
+            self.log_weights = np.full(
+                (num_particles, ), -np.log(num_particles))
+        else:
+            self.log_weights = np.asarray(self.log_weights, dtype=np.float_)
+            if self.log_weights.shape != (num_particles, ):
+                raise ValueError(
+                    "log_weights should have one element per particle")
+
+    @classmethod
+    def from_particle_state(cls, particle_state, **kwargs):
+        """Create from a :class:`~.ParticleState`
+
+        Any other keyword arguments are passed to the class, e.g.
+        `hypothesis` for updates.
+
+        Parameters
+        ----------
+        particle_state : :class:`~.ParticleState`
+            Particle state to convert.
+
+        Returns
+        -------
+        : :class:`~.ParticleArrayState`
+        """
+        particles = particle_state.particles
+        state_vectors = np.hstack(
+            [particle.state_vector for particle in particles])
+        log_weights = [Probability(particle.weight).log_value
+                       for particle in particles]
+        kwargs.setdefault('timestamp', particle_state.timestamp)
+        return cls(state_vectors, log_weights=log_weights, **kwargs)
+
+    @property
+    def ndim(self):
+        """The number of dimensions represented by the state."""
+        return self.state_vectors.shape[0]
+
+    @property
+    def num_particles(self):
+        """The number of particles."""
+        return self.state_vectors.shape[1]
+
+    @property
+    def weights(self):
+        """Normalised particle weights, as a (N, ) array."""
+        return np.exp(self.log_weights - logsumexp(self.log_weights))
+
+    @property
+    def mean(self):
+        """The state mean, equivalent to state vector"""
+        return StateVector(self.state_vectors @ self.weights[:, np.newaxis])
+
+    @property
+    def state_vector(self):
+        """The mean value of the particle states"""
+        return self.mean
+
+    @property
+    def covar(self):
+        cov = np.cov(self.state_vectors, ddof=0, aweights=self.weights)
+        # Fix one dimensional covariances being returned with zero dimension
+        if not cov.shape:
+            cov = cov.reshape(1, 1)
+        return cov
+
+    @property
+    def particles(self):
+        """The particles, as a list of :class:`~.Particle`"""
+        return [Particle(StateVector(state_vector[:, np.newaxis]),
+                         Probability(log_weight, log_value=True))
+                for state_vector, log_weight
+                in zip(self.state_vectors.T, self.log_weights)]
@@ -6,8 +6,9 @@ import pytest
 
 from ..numeric import Probability
 from ..particle import Particle
-from ..state import State, GaussianState, ParticleState, \
-    StateMutableSequence, WeightedGaussianState
+from ..state import State, GaussianState, ParticleState, StateColumns, \
+    ParticleArrayState, SqrtGaussianState, InformationState, \
+    StateMutableSequence, WeightedGaussianState, TaggedWeightedGaussianState
 
 
 def test_state():
@@ -65,6 +66,51 @@ def test_gaussianstate_invalid_covar():
         GaussianState(mean, covar)
 
 
+def test_sqrtgaussianstate():
+    mean = np.array([[1], [2], [3]])
+    covar = np.array([[4, 2, 0],
+                      [2, 5, 1],
+                      [0, 1, 3]])
+    sqrt_covar = np.linalg.cholesky(covar)
+    timestamp = datetime.datetime.now()
+
+    state = SqrtGaussianState(mean, sqrt_covar, timestamp)
+    assert np.array_equal(mean, state.mean)
+    assert np.array_equal(sqrt_covar, state.sqrt_covar)
+    assert np.allclose(covar, state.covar)
+    assert state.ndim == 3
+    assert state.timestamp == timestamp
+
+    with pytest.raises(ValueError):
+        SqrtGaussianState(mean, sqrt_covar[:2, :2])
+
+
+def test_informationstate():
+    mean = np.array([[1], [2], [3]])
+    covar = np.array([[4, 2, 0],
+                      [2, 5, 1],
+                      [0, 1, 3]])
+    precision = np.linalg.inv(covar)
+    timestamp = datetime.datetime.now()
+
+    state = InformationState(precision @ mean, precision, timestamp)
+    assert np.allclose(state.information_vector, precision @ mean)
+    assert np.array_equal(state.precision, precision)
+    assert np.allclose(state.state_vector, mean)
+    assert np.allclose(state.mean, mean)
+    assert np.allclose(state.covar, covar)
+    assert state.ndim == 3
+
+    gaussian_state = state.gaussian_state
+    assert isinstance(gaussian_state, GaussianState)
+    assert np.allclose(gaussian_state.mean, mean)
+    assert np.allclose(gaussian_state.covar, covar)
+    assert gaussian_state.timestamp == timestamp
+
+    with pytest.raises(ValueError):
+        InformationState(mean, precision[:2, :2])
+
+
 def test_weighted_gaussian_state():
     mean = np.array([[1], [2], [3], [4]])  # 4D
     covar = np.diag([1, 2, 3])  # 3D
@@ -74,6 +120,18 @@ def test_weighted_gaussian_state():
         assert a.weight == weight
 
 
+def test_tagged_weighted_gaussian_state():
+    mean = np.array([[1], [2]])
+    covar = np.diag([1, 2])
+    a = TaggedWeightedGaussianState(mean, covar, weight=0.3)
+    b = TaggedWeightedGaussianState(mean, covar, weight=0.3)
+    assert a.weight == 0.3
+    assert a.tag is not None
+    assert a.tag != b.tag
+    c = TaggedWeightedGaussianState(mean, covar, weight=0.3, tag=a.tag)
+    assert c.tag == a.tag
+
+
 def test_particlestate():
     with pytest.raises(TypeError):
         ParticleState()
@@ -157,13 +215,15 @@ def test_state_mutable_sequence_state():
     assert sequence.timestamp == timestamp + delta*8
 
 
-def test_state_mutable_sequence_slice():
+@pytest.mark.parametrize('columnar', [False, True])
+def test_state_mutable_sequence_slice(columnar):
     state_vector = np.array([[0]])
     timestamp = datetime.datetime(2018, 1, 1, 14)
     delta = datetime.timedelta(minutes=1)
     sequence = StateMutableSequence(
         [State(state_vector, timestamp=timestamp+delta*n)
-         for n in range(10)])
+         for n in range(10)],
+        columnar=columnar)
 
     assert isinstance(sequence[timestamp:], StateMutableSequence)
     assert isinstance(sequence[5:], StateMutableSequence)
@@ -185,3 +245,125 @@ def test_state_mutable_sequence_slice():
 
     with pytest.raises(IndexError):
         sequence[timestamp-delta]
+
+
+def test_state_columns():
+    timestamp = datetime.datetime(2018, 1, 1, 14)
+    delta = datetime.timedelta(minutes=1)
+    states = [GaussianState([[n], [n*2]], np.eye(2)*n, timestamp+delta*n)
+              for n in range(20)]
+    sequence = StateMutableSequence(states, columnar=True)
+    assert isinstance(sequence.states, StateColumns)
+    assert sequence.states == states
+    assert len(sequence) == 20
+    assert sequence.state is states[-1]
+
+    assert sequence.states.state_vectors.shape == (20, 2)
+    assert np.array_equal(sequence.states.state_vectors[:, 1],
+                          np.arange(20)*2)
+    assert sequence.states.covars.shape == (20, 2, 2)
+    assert np.array_equal(sequence.states.covars[:, 0, 0], np.arange(20))
+    assert np.array_equal(
+        sequence.states.datetimes,
+        np.array([state.timestamp for state in states],
+                 dtype='datetime64[us]'))
+    assert np.all(np.diff(sequence.states.timestamps) == 60*10**6)
+    with pytest.raises(ValueError):
+        sequence.states.state_vectors[0, 0] = 1
+
+    # Mutations keep columns consistent with states
+    del sequence[5]
+    new_state = GaussianState([[100], [200]], np.eye(2), timestamp+delta*5)
+    sequence.insert(0, new_state)
+    sequence[-1] = GaussianState([[-1], [-2]], np.eye(2), timestamp-delta)
+    sequence.append(State([[7], [7]], timestamp+delta*50))
+    sequence.states.extend([State([[8], [8]], timestamp+delta*51)])
+    expected = [state.state_vector[:, 0] for state in sequence.states]
+    assert np.array_equal(sequence.states.state_vectors, expected)
+    with pytest.raises(AttributeError):
+        sequence.states.covars  # Plain states have no covariance
+
+    # Unsorted timestamps still found, in list order
+    assert sequence[timestamp+delta*5] is new_state
+    assert sequence[timestamp-delta] is sequence.states[-3]
+    assert sequence[timestamp+delta*3] is states[3]
+    assert [state.timestamp for state in sequence[:timestamp+delta*2]] \
+        == [timestamp, timestamp+delta, timestamp-delta]
+    with pytest.raises(IndexError):
+        sequence[timestamp+delta*5.5]
+
+    # Slices are columnar too
+    subsequence = sequence[timestamp+delta*10:timestamp+delta*15]
+    assert isinstance(subsequence.states, StateColumns)
+    assert len(subsequence) == 5
+    assert np.array_equal(subsequence.states.state_vectors[:, 0],
+                          np.arange(10, 15))
+    assert isinstance(sequence.states[1:3], StateColumns)
+
+    # Untimed states can't be time sliced
+    sequence.append(State([[0], [0]]))
+    with pytest.raises(TypeError):
+        sequence[timestamp:]
+
+
+def test_state_columns_timezones():
+    naive = datetime.datetime(2018, 1, 1, 14)
+    aware = naive.replace(tzinfo=datetime.timezone.utc)
+    delta = datetime.timedelta(minutes=1)
+    states = StateColumns([State([[1]], naive), State([[2]], naive+delta)])
+
+    # Mixing naive and aware timestamps raises, as comparing them would
+    with pytest.raises(TypeError):
+        states.append(State([[3]], aware))
+    with pytest.raises(TypeError):
+        states[1] = State([[3]], aware)
+    with pytest.raises(TypeError):
+        states[:1] = [State([[3]], aware)]
+    with pytest.raises(TypeError):
+        states.time_slice_indices(aware)
+    assert [state.timestamp for state in states] == [naive, naive+delta]
+    assert np.array_equal(states.state_vectors, [[1], [2]])
+
+    # Naive and aware timestamps are never equal
+    with pytest.raises(IndexError):
+        states.index_of(aware)
+
+    # Untimed states don't restrict timestamps, and once only these
+    # remain, awareness may change
+    del states[1]
+    states.append(State([[3]]))
+    states[0] = State([[4]], aware)
+    states.append(State([[5]], aware+delta))
+    assert states.index_of(aware+delta) == 2
+    with pytest.raises(TypeError):
+        states.insert(0, State([[6]], naive))
+    assert len(states) == 3
+
+
+def test_particlearraystate():
+    # Compare against equivalent particle state
+    particles = [Particle(np.array([[i], [i*2]]), weight=i+1)
+                 for i in range(10)]
+    particle_state = ParticleState(particles)
+    state = ParticleArrayState.from_particle_state(particle_state)
+    assert state.ndim == 2
+    assert state.num_particles == 10
+    assert np.allclose(state.weights, np.arange(1, 11)/55)
+    assert np.allclose(state.mean, particle_state.mean)
+    assert np.allclose(state.state_vector, particle_state.state_vector)
+    assert np.allclose(state.covar, particle_state.covar)
+    assert all(
+        np.array_equal(particle.state_vector, array_particle.state_vector)
+        and np.isclose(float(particle.weight), float(array_particle.weight))
+        for particle, array_particle in zip(particles, state.particles))
+
+    # Default equal weights
+    state = ParticleArrayState(np.arange(5)[np.newaxis, :])
+    assert np.allclose(state.weights, 1/5)
+    assert np.allclose(state.mean, [[2]])
+    assert state.covar.shape == (1, 1)
+
+    with pytest.raises(ValueError):
+        ParticleArrayState(np.arange(5))
+    with pytest.raises(ValueError):
+        ParticleArrayState(np.arange(5)[np.newaxis, :], np.zeros(4))
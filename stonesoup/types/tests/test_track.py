@@ -5,7 +5,7 @@ import numpy as np
 import pytest
 
 from ..particle import Particle
-from ..state import State, GaussianState, ParticleState
+from ..state import State, GaussianState, ParticleState, StateColumns
 from ..track import Track
 
 
@@ -54,3 +54,14 @@ def test_track_id():
     track = Track([state], 'abc')
     assert isinstance(track.id, str)
     assert track.id == 'abc'
+
+
+def test_track_columnar():
+    timestamp = datetime.datetime(2018, 1, 1, 14)
+    states = [State(np.array([[n]]), timestamp + datetime.timedelta(seconds=n))
+              for n in range(5)]
+    track = Track(states, 'abc', columnar=True)
+    assert track.id == 'abc'
+    assert isinstance(track.states, StateColumns)
+    assert track[timestamp + datetime.timedelta(seconds=2)] is states[2]
+    assert np.array_equal(track.states.state_vectors[:, 0], np.arange(5))
@@ -2,7 +2,8 @@
 from ..base import Property
 from .base import Type
 from .hypothesis import Hypothesis
-from .state import State, GaussianState, ParticleState
+from .state import State, GaussianState, SqrtGaussianState, \
+    InformationState, ParticleState, ParticleArrayState
 
 
 class Update(Type):
@@ -32,8 +33,30 @@ class GaussianStateUpdate(Update, GaussianState):
     """
 
 
+class SqrtGaussianStateUpdate(Update, SqrtGaussianState):
+    """ SqrtGaussianStateUpdate type
+
+    This is a Gaussian state update object, with the covariance held in
+    square root form.
+    """
+
+
+class InformationStateUpdate(Update, InformationState):
+    """ InformationStateUpdate type
+
+    This is a Gaussian state update object, in information form.
+    """
+
+
 class ParticleStateUpdate(Update, ParticleState):
     """ParticleStateUpdate type
 
     This is a simple Particle state update object.
     """
+
+
+class ParticleArrayStateUpdate(Update, ParticleArrayState):
+    """ParticleArrayStateUpdate type
+
+    This is a simple array backed Particle state update object.
+    """
@@ -61,3 +61,22 @@ class Updater(Base):
             The state posterior
         """
         raise NotImplementedError
+
+    def update_batch(self, hypotheses, **kwargs):
+        """Update a batch of states using their predictions and measurements.
+
+        The default implementation calls :meth:`update` for each hypothesis;
+        updaters which can vectorise across hypotheses should override this.
+
+        Parameters
+        ----------
+        hypotheses : sequence of :class:`~.Hypothesis`
+            Hypotheses with predicted state and associated detection used for
+            updating.
+
+        Returns
+        -------
+        : list of :class:`~.State`
+            The state posteriors, in the same order as `hypotheses`
+        """
+        return [self.update(hypothesis, **kwargs) for hypothesis in hypotheses]
@@ -1,16 +1,53 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from functools import lru_cache
+from collections import defaultdict
+from functools import partial
+from scipy.linalg import solve_triangular
 
 from ..base import Property
 from .base import Updater
-from ..types.prediction import GaussianMeasurementPrediction
-from ..types.update import GaussianStateUpdate
-from ..models.base import LinearModel
+from ..types.prediction import GaussianMeasurementPrediction, \
+    SqrtGaussianMeasurementPrediction
+from ..types.multihypothesis import MultipleHypothesis
+from ..types.state import InformationState
+from ..types.update import GaussianStateUpdate, SqrtGaussianStateUpdate, \
+    InformationStateUpdate
+from ..models.base import LinearModel, vectorised
 from ..models.measurement.linear import LinearGaussian
 from ..models.measurement import MeasurementModel
-from ..functions import gauss2sigma, unscented_transform
+from ..cache import prediction_cache
+from ..functions import gauss2sigma, unscented_transform, \
+    sqrt_unscented_transform, cholesky_update, lower_sqrt, tria, \
+    state_sqrt_covar, state_information_form
+
+
+def _batch_forward_substitution(lowers, arrays):
+    """Solves :math:`L X = B` for a stack of lower-triangular matrices
+
+    Substitution proceeds row by row, with each row solved across the whole
+    stack at once, so costs no more than a triangular solve per item.
+
+    Parameters
+    ----------
+    lowers : numpy.ndarray
+        Stack of `n` by `n` lower-triangular matrices, of shape (..., n, n)
+    arrays : numpy.ndarray
+        Stack of right hand sides, of shape (..., n, m)
+
+    Returns
+    -------
+    numpy.ndarray
+        Solutions, of shape (..., n, m)
+    """
+    solutions = np.empty_like(arrays)
+    for row in range(lowers.shape[-1]):
+        solutions[..., row, :] = (
+            arrays[..., row, :]
+            - np.einsum('...i,...ij->...j',
+                        lowers[..., row, :row], solutions[..., :row, :])
+        ) / lowers[..., row, row, np.newaxis]
+    return solutions
 
 
 class KalmanUpdater(Updater):
@@ -111,7 +148,7 @@ class KalmanUpdater(Updater):
         """
         return self.measurement_model.matrix(**kwargs)
 
-    @lru_cache()
+    @prediction_cache()
     def predict_measurement(self, predicted_state, measurement_model=None,
                             **kwargs):
         r"""Predict the measurement implied by the predicted state mean
@@ -217,6 +254,221 @@ class KalmanUpdater(Updater):
                                    hypothesis,
                                    hypothesis.measurement.timestamp)
 
+    def _batch_measurement_matrices(self, predicted_states, state_vectors,
+                                    measurement_model, **kwargs):
+        """Return the measurement matrix, or matrices, for a batch of
+        predicted states
+
+        Parameters
+        ----------
+        predicted_states : list of :class:`~.State`
+            The predicted states
+        state_vectors : :class:`numpy.ndarray` of shape (N, n, 1)
+            The stacked predicted state vectors
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model
+        **kwargs : various
+            Passed to :meth:`~.MeasurementModel.matrix`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (m, n)
+            The measurement matrix, :math:`H_k`, shared by all states
+        """
+        return np.asarray(measurement_model.matrix(**kwargs))
+
+    def _batch_measurement_function(self, predicted_states, state_vectors,
+                                    measurement_matrices, measurement_model,
+                                    **kwargs):
+        """Applies the (noiseless) measurement function to a batch of state
+        vectors
+
+        Parameters
+        ----------
+        predicted_states : list of :class:`~.State`
+            The predicted states
+        state_vectors : :class:`numpy.ndarray` of shape (N, n, 1)
+            The stacked predicted state vectors
+        measurement_matrices : :class:`numpy.ndarray`
+            As returned by :meth:`_batch_measurement_matrices`
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model
+        **kwargs : various
+            Passed to the measurement model
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (N, m, 1)
+            The predicted measurements
+        """
+        return measurement_matrices @ state_vectors
+
+    def predict_measurement_batch(self, predicted_states,
+                                  measurement_model=None, **kwargs):
+        """Predict the measurements implied by a batch of predicted states
+
+        Equivalent to calling :meth:`predict_measurement` for each predicted
+        state, with the innovation and cross covariances computed as stacked
+        array operations.
+
+        Parameters
+        ----------
+        predicted_states : sequence of :class:`~.GaussianState`
+            The predicted states
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            These are passed to the measurement model
+
+        Returns
+        -------
+        : list of :class:`~.GaussianMeasurementPrediction`
+            The measurement predictions, in the same order as
+            `predicted_states`
+        """
+        predicted_states = list(predicted_states)
+        if not predicted_states:
+            return []
+
+        measurement_model = self._check_measurement_model(measurement_model)
+
+        state_vectors = np.stack(
+            [np.asarray(state.state_vector, dtype=np.float_)
+             for state in predicted_states])
+        covars = np.stack(
+            [np.asarray(state.covar, dtype=np.float_)
+             for state in predicted_states])
+
+        hh = self._batch_measurement_matrices(
+            predicted_states, state_vectors, measurement_model, **kwargs)
+        pred_meas = self._batch_measurement_function(
+            predicted_states, state_vectors, hh, measurement_model, **kwargs)
+
+        meas_cross_covs = covars @ np.swapaxes(hh, -1, -2)
+        innov_covs = hh @ meas_cross_covs \
+            + np.asarray(measurement_model.covar())
+
+        return [
+            GaussianMeasurementPrediction(
+                state_pred_meas, innov_cov, predicted_state.timestamp,
+                cross_covar=meas_cross_cov)
+            for predicted_state, state_pred_meas, innov_cov, meas_cross_cov
+            in zip(predicted_states, pred_meas, innov_covs, meas_cross_covs)]
+
+    def update_batch(self, hypotheses, force_symmetric_covariance=False,
+                     **kwargs):
+        r"""The Kalman update method for a batch of hypotheses.
+
+        Hypotheses without a measurement prediction have one calculated via
+        :meth:`predict_measurement_batch`, grouped by measurement model. The
+        posteriors are then computed as stacked array operations, using a
+        Cholesky factorisation :math:`S_k = L_k L_k^T` of each innovation
+        covariance in place of an explicit inverse:
+
+        .. math::
+
+            W_k = L_k^{-1} \Upsilon_k^T
+
+            \mathbf{x}_{k|k} = \mathbf{x}_{k|k-1} + W_k^T L_k^{-1}
+            (\mathbf{z}_k - \mathbf{z}_{k|k-1})
+
+            P_{k|k} = P_{k|k-1} - W_k^T W_k
+
+        Parameters
+        ----------
+        hypotheses : sequence of :class:`~.SingleHypothesis`
+            The prediction-measurement association hypotheses. All
+            measurements must have the same dimension.
+        force_symmetric_covariance : :obj:`bool`, optional
+            A flag to force the output covariance matrices to be symmetric by
+            way of a simple geometric combination of the matrix and transpose.
+            Default is `False`
+        **kwargs : various
+            These are passed to :meth:`predict_measurement_batch`
+
+        Returns
+        -------
+        : list of :class:`~.GaussianStateUpdate`
+            The posterior states, in the same order as `hypotheses`
+
+        Raises
+        ------
+        ValueError
+            If the measurements are not all of the same dimension.
+        """
+        hypotheses = list(hypotheses)
+        if not hypotheses:
+            return []
+
+        if len({hypothesis.measurement.state_vector.shape[0]
+                for hypothesis in hypotheses}) > 1:
+            raise ValueError(
+                "All measurements in a batch must have the same dimension")
+
+        # Calculate any missing measurement predictions, grouped by model
+        model_hypotheses = defaultdict(list)
+        for hypothesis in hypotheses:
+            if hypothesis.measurement_prediction is None:
+                measurement_model = self._check_measurement_model(
+                    hypothesis.measurement.measurement_model)
+                model_hypotheses[measurement_model].append(hypothesis)
+        for measurement_model, hypotheses_ in model_hypotheses.items():
+            measurement_predictions = self.predict_measurement_batch(
+                [hypothesis.prediction for hypothesis in hypotheses_],
+                measurement_model=measurement_model, **kwargs)
+            for hypothesis, measurement_prediction in zip(
+                    hypotheses_, measurement_predictions):
+                hypothesis.measurement_prediction = measurement_prediction
+
+        state_vectors = np.stack([
+            np.asarray(hypothesis.prediction.state_vector, dtype=np.float_)
+            for hypothesis in hypotheses])
+        covars = np.stack([
+            np.asarray(hypothesis.prediction.covar, dtype=np.float_)
+            for hypothesis in hypotheses])
+        innovations = np.stack([
+            np.asarray(hypothesis.measurement.state_vector
+                       - hypothesis.measurement_prediction.state_vector,
+                       dtype=np.float_)
+            for hypothesis in hypotheses])
+        innov_covs = np.stack([
+            np.asarray(hypothesis.measurement_prediction.covar,
+                       dtype=np.float_)
+            for hypothesis in hypotheses])
+        m_cross_covs = np.stack([
+            np.asarray(hypothesis.measurement_prediction.cross_covar,
+                       dtype=np.float_)
+            for hypothesis in hypotheses])
+
+        # Forward substitute against the Cholesky factors for both the gain
+        # terms and the whitened innovations in one go
+        chol_factors = np.linalg.cholesky(innov_covs)
+        solutions = _batch_forward_substitution(
+            chol_factors,
+            np.concatenate(
+                (np.swapaxes(m_cross_covs, -1, -2), innovations), axis=-1))
+        weighted_cross_covs = solutions[..., :-1]
+        whitened_innovations = solutions[..., -1:]
+        weighted_cross_covs_t = np.swapaxes(weighted_cross_covs, -1, -2)
+
+        posterior_means = state_vectors \
+            + weighted_cross_covs_t @ whitened_innovations
+        posterior_covariances = covars \
+            - weighted_cross_covs_t @ weighted_cross_covs
+
+        if force_symmetric_covariance:
+            posterior_covariances = (
+                posterior_covariances
+                + np.swapaxes(posterior_covariances, -1, -2))/2
+
+        return [
+            GaussianStateUpdate(posterior_mean, posterior_covariance,
+                                hypothesis,
+                                hypothesis.measurement.timestamp)
+            for hypothesis, posterior_mean, posterior_covariance
+            in zip(hypotheses, posterior_means, posterior_covariances)]
+
 
 class ExtendedKalmanUpdater(KalmanUpdater):
     r"""The Extended Kalman Filter version of the Kalman Updater. Inherits most
@@ -267,6 +519,72 @@ class ExtendedKalmanUpdater(KalmanUpdater):
             return measurement_model.jacobian(predicted_state.state_vector,
                                               **kwargs)
 
+    def _batch_measurement_matrices(self, predicted_states, state_vectors,
+                                    measurement_model, **kwargs):
+        """Return the measurement matrix, or matrices, for a batch of
+        predicted states
+
+        If the measurement model is linear a single matrix is shared by the
+        batch, otherwise the Jacobian is evaluated for each state.
+
+        Parameters
+        ----------
+        predicted_states : list of :class:`~.State`
+            The predicted states
+        state_vectors : :class:`numpy.ndarray` of shape (N, n, 1)
+            The stacked predicted state vectors
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model
+        **kwargs : various
+            Passed to :meth:`~.MeasurementModel.matrix` if linear
+            or :meth:`~.MeasurementModel.jacobian` if not
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (m, n) or (N, m, n)
+            The measurement matrix, or stacked Jacobians
+        """
+        if isinstance(measurement_model, LinearModel):
+            return np.asarray(measurement_model.matrix(**kwargs))
+        else:
+            return np.stack([
+                np.asarray(measurement_model.jacobian(
+                    predicted_state.state_vector, **kwargs))
+                for predicted_state in predicted_states])
+
+    def _batch_measurement_function(self, predicted_states, state_vectors,
+                                    measurement_matrices, measurement_model,
+                                    **kwargs):
+        """Applies the (noiseless) measurement function to a batch of state
+        vectors
+
+        Parameters
+        ----------
+        predicted_states : list of :class:`~.State`
+            The predicted states
+        state_vectors : :class:`numpy.ndarray` of shape (N, n, 1)
+            The stacked predicted state vectors
+        measurement_matrices : :class:`numpy.ndarray`
+            As returned by :meth:`_batch_measurement_matrices`
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model
+        **kwargs : various
+            Passed to :meth:`~.MeasurementModel.function`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray` of shape (N, m, 1)
+            The predicted measurements
+        """
+        if isinstance(measurement_model, LinearModel):
+            return measurement_matrices @ state_vectors
+        else:
+            return np.stack([
+                np.asarray(measurement_model.function(
+                    predicted_state.state_vector, noise=0, **kwargs),
+                    dtype=np.float_)
+                for predicted_state in predicted_states])
+
 
 class UnscentedKalmanUpdater(KalmanUpdater):
     """The Unscented Kalman Filter version of the Kalman Updater. Inherits most
@@ -275,6 +593,8 @@ class UnscentedKalmanUpdater(KalmanUpdater):
     In this case the :meth:`predict_measurement` function uses the
     :func:`unscented_transform` function to estimate a (Gaussian) predicted
     measurement. This is then updated via the standard Kalman update equations.
+    Sigma points are passed through the measurement function at once where
+    the model supports it, otherwise one at a time.
 
     """
     # Can be non-linear and non-differentiable
@@ -301,6 +621,7 @@ class UnscentedKalmanUpdater(KalmanUpdater):
         doc="Secondary spread scaling parameter. Default is calculated as "
             "3-Ns")
 
+    @vectorised
     def _measurement_function_nonoise(self, x, w=0, **kwargs):
         """This to ensure that no noise is added to the measurement in the
         unscented transform (below). (Would resolve if the default was to add
@@ -325,7 +646,7 @@ class UnscentedKalmanUpdater(KalmanUpdater):
 
         return self.measurement_model.function(x, w, **kwargs)
 
-    @lru_cache()
+    @prediction_cache()
     def predict_measurement(self, predicted_state, measurement_model=None):
         """Unscented Kalman Filter measurement prediction step. Uses the
         unscented transform to estimate a Gauss-distributed predicted
@@ -363,3 +684,524 @@ class UnscentedKalmanUpdater(KalmanUpdater):
         return GaussianMeasurementPrediction(meas_pred_mean, meas_pred_covar,
                                              predicted_state.timestamp,
                                              cross_covar)
+
+    def predict_measurement_batch(self, predicted_states,
+                                  measurement_model=None):
+        """Unscented Kalman Filter measurement prediction for a batch of
+        predicted states.
+
+        Sigma points are specific to each predicted state, so this simply
+        calls :meth:`predict_measurement` for each state in turn.
+
+        Parameters
+        ----------
+        predicted_states : sequence of :class:`~.GaussianStatePrediction`
+            The predicted states
+        measurement_model : :class:`~.MeasurementModel`, optional
+            The measurement model used to generate the measurement
+            predictions. Default `None`, in which case the updater will use
+            the measurement model specified on initialisation
+
+        Returns
+        -------
+        : list of :class:`~.GaussianMeasurementPrediction`
+            The measurement predictions, in the same order as
+            `predicted_states`
+        """
+        return [self.predict_measurement(predicted_state, measurement_model)
+                for predicted_state in predicted_states]
+
+
+class SqrtKalmanUpdater(KalmanUpdater):
+    r"""Square root Kalman updater
+
+    As :class:`~.KalmanUpdater`, but the covariance is held as a
+    lower-triangular square root, :math:`L_{k|k-1}` where :math:`P_{k|k-1} =
+    L_{k|k-1} L_{k|k-1}^T`. The measurement prediction holds the square root
+    of the innovation covariance, :math:`S_k^{1/2}`, found by
+    triangularisation (see :func:`~.tria`) of :math:`\begin{bmatrix} H_k
+    L_{k|k-1} & R_k^{1/2} \end{bmatrix}`.
+
+    The update triangularises the array
+
+    .. math::
+
+      \begin{bmatrix}
+          R_k^{1/2} & H_k L_{k|k-1} \\
+          0 & L_{k|k-1}
+      \end{bmatrix}
+      \rightarrow
+      \begin{bmatrix}
+          S_k^{1/2} & 0 \\
+          \bar{K}_k & L_{k|k}
+      \end{bmatrix}
+
+    where :math:`\bar{K}_k = P_{k|k-1} H_k^T S_k^{-T/2}`, such that the
+    posterior mean and square root covariance are
+
+    .. math::
+
+        \mathbf{x}_{k|k} = \mathbf{x}_{k|k-1} + \bar{K}_k S_k^{-1/2}
+        (\mathbf{z}_k - H_k \mathbf{x}_{k|k-1})
+
+    with :math:`L_{k|k}` taken directly from the triangularised array. Only
+    a triangular solve is needed, rather than an inverse of :math:`S_k`, and
+    the posterior covariance remains symmetric positive definite. These are
+    returned as a :class:`~.SqrtGaussianStateUpdate`.
+    """
+
+    def _measurement_matrix(self, predicted_state=None, measurement_model=None,
+                            **kwargs):
+        r"""Return the measurement matrix of the measurement model, or if
+        omitted, that of the updater
+
+        Parameters
+        ----------
+        predicted_state : :class:`~.State`
+            The predicted state :math:`\mathbf{x}_{k|k-1}`
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            Passed to :meth:`~.MeasurementModel.matrix`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray`
+            The measurement matrix, :math:`H_k`
+        """
+        measurement_model = self._check_measurement_model(measurement_model)
+        return measurement_model.matrix(**kwargs)
+
+    @prediction_cache()
+    def predict_measurement(self, predicted_state, measurement_model=None,
+                            **kwargs):
+        r"""Predict the measurement implied by the predicted state mean
+
+        Parameters
+        ----------
+        predicted_state : :class:`~.SqrtGaussianState` or \
+        :class:`~.GaussianState`
+            The predicted state :math:`\mathbf{x}_{k|k-1}`
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            These are passed to :meth:`~.MeasurementModel.function` and
+            :meth:`~.MeasurementModel.matrix`
+
+        Returns
+        -------
+        : :class:`~.SqrtGaussianMeasurementPrediction`
+            The measurement prediction, :math:`\mathbf{z}_{k|k-1}`, with
+            square root innovation covariance :math:`S_k^{1/2}`
+        """
+        measurement_model = self._check_measurement_model(measurement_model)
+
+        pred_meas = measurement_model.function(predicted_state.state_vector,
+                                               noise=0, **kwargs)
+
+        hh = self._measurement_matrix(predicted_state=predicted_state,
+                                      measurement_model=measurement_model,
+                                      **kwargs)
+
+        sqrt_covar = state_sqrt_covar(predicted_state)
+        sqrt_meas_covar = hh @ sqrt_covar
+        sqrt_innov_cov = tria(np.hstack(
+            (sqrt_meas_covar, lower_sqrt(measurement_model.covar()))))
+        meas_cross_cov = sqrt_covar @ sqrt_meas_covar.T
+
+        return SqrtGaussianMeasurementPrediction(
+            pred_meas, sqrt_innov_cov, predicted_state.timestamp,
+            cross_covar=meas_cross_cov)
+
+    def update(self, hypothesis, **kwargs):
+        r"""The square root Kalman update method. Given a hypothesised
+        association between a predicted state or predicted measurement and an
+        actual measurement, calculate the posterior state.
+
+        Parameters
+        ----------
+        hypothesis : :class:`~.SingleHypothesis`
+            the prediction-measurement association hypothesis. This hypothesis
+            may carry a predicted measurement, or a predicted state. In the
+            latter case a predicted measurement will be calculated.
+        **kwargs : various
+            These are passed to :meth:`predict_measurement`
+
+        Returns
+        -------
+        : :class:`~.SqrtGaussianStateUpdate`
+            The posterior state Gaussian with mean :math:`\mathbf{x}_{k|k}` and
+            square root covariance :math:`L_{k|k}`
+        """
+        predicted_state = hypothesis.prediction
+        measurement_model = self._check_measurement_model(
+            hypothesis.measurement.measurement_model)
+
+        if hypothesis.measurement_prediction is None:
+            hypothesis.measurement_prediction = self.predict_measurement(
+                predicted_state, measurement_model=measurement_model, **kwargs)
+        pred_meas = hypothesis.measurement_prediction.state_vector
+
+        hh = np.asfarray(self._measurement_matrix(
+            predicted_state=predicted_state,
+            measurement_model=measurement_model, **kwargs))
+        sqrt_covar = state_sqrt_covar(predicted_state)
+        sqrt_meas_covar = lower_sqrt(measurement_model.covar())
+
+        ndim_meas, ndim_state = hh.shape
+        pre_array = np.zeros((ndim_meas + ndim_state, ndim_meas + ndim_state),
+                             dtype=np.result_type(hh, sqrt_covar))
+        pre_array[:ndim_meas, :ndim_meas] = sqrt_meas_covar
+        pre_array[:ndim_meas, ndim_meas:] = hh @ sqrt_covar
+        pre_array[ndim_meas:, ndim_meas:] = sqrt_covar
+        post_array = tria(pre_array)
+
+        sqrt_innov_cov = post_array[:ndim_meas, :ndim_meas]
+        weighted_gain = post_array[ndim_meas:, :ndim_meas]
+        posterior_sqrt_covar = post_array[ndim_meas:, ndim_meas:]
+
+        whitened_innovation = solve_triangular(
+            sqrt_innov_cov,
+            np.asfarray(hypothesis.measurement.state_vector - pred_meas),
+            lower=True)
+        posterior_mean = \
+            predicted_state.state_vector + weighted_gain @ whitened_innovation
+
+        return SqrtGaussianStateUpdate(posterior_mean, posterior_sqrt_covar,
+                                       hypothesis,
+                                       hypothesis.measurement.timestamp)
+
+    # Measurement predictions and updates are in square root form, so use
+    # predict_measurement and update for each
+    def predict_measurement_batch(self, predicted_states,
+                                  measurement_model=None, **kwargs):
+        """Predict the measurements implied by a batch of predicted states
+
+        Calls :meth:`predict_measurement` for each predicted state in turn.
+
+        Parameters
+        ----------
+        predicted_states : sequence of :class:`~.SqrtGaussianState`
+            The predicted states
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            These are passed to :meth:`predict_measurement`
+
+        Returns
+        -------
+        : list of :class:`~.SqrtGaussianMeasurementPrediction`
+            The measurement predictions, in the same order as
+            `predicted_states`
+        """
+        return [self.predict_measurement(
+                    predicted_state, measurement_model, **kwargs)
+                for predicted_state in predicted_states]
+
+    update_batch = Updater.update_batch
+
+
+class SqrtUnscentedKalmanUpdater(UnscentedKalmanUpdater):
+    r"""Square root unscented Kalman updater
+
+    As :class:`~.UnscentedKalmanUpdater`, but sigma points are drawn
+    directly from the lower-triangular square root of the predicted
+    covariance, :math:`L_{k|k-1}`, and the square root of the innovation
+    covariance, :math:`S_k^{1/2}`, is formed by
+    :func:`~.sqrt_unscented_transform`. The Kalman gain is found by
+    triangular solves, :math:`K_k = \Upsilon_k S_k^{-T/2} S_k^{-1/2}`, and the
+    posterior square root covariance by successive rank one downdates (see
+    :func:`~.cholesky_update`) of :math:`L_{k|k-1}` by the columns of
+    :math:`K_k S_k^{1/2}`. These are returned as a
+    :class:`~.SqrtGaussianStateUpdate`.
+    """
+
+    @prediction_cache()
+    def predict_measurement(self, predicted_state, measurement_model=None):
+        """Square root unscented Kalman Filter measurement prediction step.
+
+        Parameters
+        ----------
+        predicted_state : :class:`~.SqrtGaussianStatePrediction` or \
+        :class:`~.GaussianStatePrediction`
+            A predicted state
+        measurement_model : :class:`~.MeasurementModel`, optional
+            The measurement model used to generate the measurement prediction.
+            This should be used in cases where the measurement model is
+            dependent on the received measurement (the default is `None`, in
+            which case the updater will use the measurement model specified on
+            initialisation)
+
+        Returns
+        -------
+        : :class:`~.SqrtGaussianMeasurementPrediction`
+            The measurement prediction
+        """
+
+        measurement_model = self._check_measurement_model(measurement_model)
+
+        sigma_points, mean_weights, covar_weights = \
+            gauss2sigma(predicted_state.state_vector,
+                        state_sqrt_covar(predicted_state),
+                        self.alpha, self.beta, self.kappa, sqrt=True)
+
+        meas_pred_mean, sqrt_meas_pred_covar, cross_covar, _ = \
+            sqrt_unscented_transform(
+                sigma_points, mean_weights, covar_weights,
+                partial(measurement_model.function, noise=0),
+                sqrt_covar_noise=lower_sqrt(measurement_model.covar()))
+
+        return SqrtGaussianMeasurementPrediction(
+            meas_pred_mean, sqrt_meas_pred_covar, predicted_state.timestamp,
+            cross_covar)
+
+    def update(self, hypothesis, **kwargs):
+        r"""The square root unscented Kalman update method.
+
+        Parameters
+        ----------
+        hypothesis : :class:`~.SingleHypothesis`
+            the prediction-measurement association hypothesis. This hypothesis
+            may carry a predicted measurement, or a predicted state. In the
+            latter case a predicted measurement will be calculated.
+        **kwargs : various
+            These are passed to :meth:`predict_measurement`
+
+        Returns
+        -------
+        : :class:`~.SqrtGaussianStateUpdate`
+            The posterior state Gaussian with mean :math:`\mathbf{x}_{k|k}` and
+            square root covariance :math:`L_{k|k}`
+        """
+        predicted_state = hypothesis.prediction
+
+        if hypothesis.measurement_prediction is None:
+            measurement_model = self._check_measurement_model(
+                hypothesis.measurement.measurement_model)
+            hypothesis.measurement_prediction = self.predict_measurement(
+                predicted_state, measurement_model=measurement_model, **kwargs)
+        measurement_prediction = hypothesis.measurement_prediction
+
+        sqrt_innov_cov = state_sqrt_covar(measurement_prediction)
+        m_cross_cov = np.asfarray(measurement_prediction.cross_covar)
+
+        # Weighted gain, K S^{1/2} = Upsilon S^{-T/2}
+        weighted_gain = solve_triangular(
+            sqrt_innov_cov, m_cross_cov.T, lower=True).T
+        kalman_gain = solve_triangular(
+            sqrt_innov_cov.T, weighted_gain.T, lower=False).T
+
+        innovation = np.asfarray(hypothesis.measurement.state_vector
+                                 - measurement_prediction.state_vector)
+        posterior_mean = \
+            predicted_state.state_vector + kalman_gain @ innovation
+
+        posterior_sqrt_covar = state_sqrt_covar(predicted_state)
+        for column in weighted_gain.T:
+            posterior_sqrt_covar = cholesky_update(
+                posterior_sqrt_covar, column, downdate=True)
+
+        return SqrtGaussianStateUpdate(posterior_mean, posterior_sqrt_covar,
+                                       hypothesis,
+                                       hypothesis.measurement.timestamp)
+
+    # Posteriors are in square root form, so use update for each hypothesis
+    update_batch = Updater.update_batch
+
+
+class InformationKalmanUpdater(KalmanUpdater):
+    r"""Information Kalman updater
+
+    As :class:`~.KalmanUpdater`, but the posterior is in information form,
+    as an :class:`~.InformationStateUpdate`. Each measurement contributes
+    information
+
+    .. math::
+
+        Y_{k|k} = Y_{k|k-1} + H_k^T R_k^{-1} H_k
+
+        \mathbf{y}_{k|k} = \mathbf{y}_{k|k-1} + H_k^T R_k^{-1} \mathbf{z}_k
+
+    found with a Cholesky factor of :math:`R_k`, without forming a Kalman
+    gain or the state covariance. Where a :class:`~.MultipleHypothesis` of
+    measurements of a target at the same time (e.g. from multiple sensors)
+    is passed to :meth:`update`, all contributions are summed into a single
+    posterior, so the cost of fusing measurements is linear in their number.
+    The posterior can then be converted to moment form once, via
+    :attr:`~.InformationState.gaussian_state`.
+
+    Measurement predictions are in moment form, as for
+    :class:`~.KalmanUpdater`, for use with hypothesisers. Predicted states
+    in moment form are converted to information form first.
+    """
+
+    def _measurement_matrix(self, predicted_state=None, measurement_model=None,
+                            **kwargs):
+        r"""Return the measurement matrix of the measurement model, or if
+        omitted, that of the updater
+
+        Parameters
+        ----------
+        predicted_state : :class:`~.State`
+            The predicted state :math:`\mathbf{x}_{k|k-1}`
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            Passed to :meth:`~.MeasurementModel.matrix`
+
+        Returns
+        -------
+        : :class:`numpy.ndarray`
+            The measurement matrix, :math:`H_k`
+        """
+        measurement_model = self._check_measurement_model(measurement_model)
+        return measurement_model.matrix(**kwargs)
+
+    @prediction_cache()
+    def predict_measurement(self, predicted_state, measurement_model=None,
+                            **kwargs):
+        r"""Predict the measurement implied by the predicted state mean
+
+        Parameters
+        ----------
+        predicted_state : :class:`~.InformationState` or \
+        :class:`~.GaussianState`
+            The predicted state
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            These are passed to :meth:`~.MeasurementModel.function` and
+            :meth:`~.MeasurementModel.matrix`
+
+        Returns
+        -------
+        : :class:`~.GaussianMeasurementPrediction`
+            The measurement prediction, :math:`\mathbf{z}_{k|k-1}`, in moment
+            form
+        """
+        measurement_model = self._check_measurement_model(measurement_model)
+
+        timestamp = predicted_state.timestamp
+        if isinstance(predicted_state, InformationState):
+            predicted_state = predicted_state.gaussian_state
+
+        pred_meas = measurement_model.function(predicted_state.state_vector,
+                                               noise=0, **kwargs)
+
+        hh = self._measurement_matrix(predicted_state=predicted_state,
+                                      measurement_model=measurement_model,
+                                      **kwargs)
+
+        meas_cross_cov = predicted_state.covar @ hh.T
+        innov_cov = hh @ meas_cross_cov + measurement_model.covar()
+
+        return GaussianMeasurementPrediction(pred_meas, innov_cov, timestamp,
+                                             cross_covar=meas_cross_cov)
+
+    def update(self, hypothesis, **kwargs):
+        r"""The information form update method
+
+        Parameters
+        ----------
+        hypothesis : :class:`~.SingleHypothesis` or \
+        :class:`~.MultipleHypothesis`
+            The prediction-measurement association hypothesis, or multiple
+            hypotheses, all of the same prediction, whose measurements are
+            all to be fused. Missed detections are ignored.
+        **kwargs : various
+            These are passed to :meth:`~.MeasurementModel.matrix`
+
+        Returns
+        -------
+        : :class:`~.InformationStateUpdate`
+            The posterior information vector :math:`\mathbf{y}_{k|k}` and
+            information matrix :math:`Y_{k|k}`
+
+        Raises
+        ------
+        ValueError
+            If multiple hypotheses are empty, of different predictions, or
+            their measurements are at different times.
+        """
+        if isinstance(hypothesis, MultipleHypothesis):
+            single_hypotheses = hypothesis.single_hypotheses
+        else:
+            single_hypotheses = [hypothesis]
+        if not single_hypotheses:
+            raise ValueError("Hypotheses must contain at least one hypothesis")
+
+        predicted_state = single_hypotheses[0].prediction
+        if any(single_hypothesis.prediction is not predicted_state
+               for single_hypothesis in single_hypotheses):
+            raise ValueError("All hypotheses must be of the same prediction")
+        single_hypotheses = [single_hypothesis
+                             for single_hypothesis in single_hypotheses
+                             if single_hypothesis]
+        timestamps = {single_hypothesis.measurement.timestamp
+                      for single_hypothesis in single_hypotheses}
+        if len(timestamps) > 1:
+            raise ValueError("All measurements must be at the same time")
+        timestamp = timestamps.pop() if timestamps \
+            else predicted_state.timestamp
+
+        info_vector, precision = state_information_form(predicted_state)
+        info_vector, precision = info_vector.copy(), precision.copy()
+
+        for single_hypothesis in single_hypotheses:
+            measurement_model = self._check_measurement_model(
+                single_hypothesis.measurement.measurement_model)
+            hh = np.asfarray(self._measurement_matrix(
+                predicted_state=predicted_state,
+                measurement_model=measurement_model, **kwargs))
+
+            # Whiten measurement matrix and measurement against R = L L^T,
+            # such that H^T R^-1 H = W^T W
+            chol_meas_covar = np.linalg.cholesky(measurement_model.covar())
+            whitened = solve_triangular(
+                chol_meas_covar,
+                np.hstack((hh, np.asfarray(
+                    single_hypothesis.measurement.state_vector))),
+                lower=True)
+            whitened_matrix = whitened[:, :-1]
+            whitened_measurement = whitened[:, -1:]
+
+            precision += whitened_matrix.T @ whitened_matrix
+            info_vector += whitened_matrix.T @ whitened_measurement
+
+        return InformationStateUpdate(info_vector, precision, hypothesis,
+                                      timestamp)
+
+    # Predictions and updates are in information form, so use
+    # predict_measurement and update for each
+    def predict_measurement_batch(self, predicted_states,
+                                  measurement_model=None, **kwargs):
+        """Predict the measurements implied by a batch of predicted states
+
+        Calls :meth:`predict_measurement` for each predicted state in turn.
+
+        Parameters
+        ----------
+        predicted_states : sequence of :class:`~.InformationState`
+            The predicted states
+        measurement_model : :class:`~.MeasurementModel`
+            The measurement model. If omitted, the model in the updater object
+            is used
+        **kwargs : various
+            These are passed to :meth:`predict_measurement`
+
+        Returns
+        -------
+        : list of :class:`~.GaussianMeasurementPrediction`
+            The measurement predictions, in the same order as
+            `predicted_states`
+        """
+        return [self.predict_measurement(
+                    predicted_state, measurement_model, **kwargs)
+                for predicted_state in predicted_states]
+
+    update_batch = Updater.update_batch
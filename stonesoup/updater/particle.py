@@ -1,19 +1,30 @@
 # -*- coding: utf-8 -*-
-from functools import lru_cache
+import numpy as np
+from scipy.special import logsumexp
+from scipy.stats import multivariate_normal
 
 from .base import Updater
 from ..base import Property
+from ..cache import prediction_cache
+from ..models.base import GaussianModel
 from ..resampler import Resampler
+from ..types.array import StateVector
 from ..types.numeric import Probability
 from ..types.particle import Particle
-from ..types.prediction import ParticleMeasurementPrediction
-from ..types.update import ParticleStateUpdate
+from ..types.prediction import ParticleMeasurementPrediction, \
+    ParticleArrayMeasurementPrediction
+from ..types.state import ParticleArrayState
+from ..types.update import ParticleStateUpdate, ParticleArrayStateUpdate
 
 
 class ParticleUpdater(Updater):
     """Simple Particle Updater
 
         Perform measurement update step in the standard Kalman Filter.
+
+        Predictions may be a :class:`~.ParticleState`, or an array backed
+        :class:`~.ParticleArrayState`, in which case all particles are
+        weighted at once, with weights held in log space.
         """
 
     resampler = Property(Resampler,
@@ -30,7 +41,7 @@ class ParticleUpdater(Updater):
 
         Returns
         -------
-        : :class:`~.ParticleState`
+        : :class:`~.ParticleState` or :class:`~.ParticleArrayState`
             The state posterior
         """
         if hypothesis.measurement.measurement_model is None:
@@ -38,10 +49,34 @@ class ParticleUpdater(Updater):
         else:
             measurement_model = hypothesis.measurement.measurement_model
 
-        for particle in hypothesis.prediction.particles:
-            particle.weight *= measurement_model.pdf(
-                hypothesis.measurement.state_vector, particle.state_vector,
-                **kwargs)
+        if isinstance(hypothesis.prediction, ParticleArrayState):
+            prediction = hypothesis.prediction
+            log_weights = prediction.log_weights + self._log_likelihoods(
+                measurement_model, hypothesis.measurement.state_vector,
+                prediction.state_vectors, **kwargs)
+            # Normalise the weights
+            log_weights -= logsumexp(log_weights)
+
+            # Resample
+            new_state = self.resampler.resample(
+                ParticleArrayState(
+                    prediction.state_vectors, log_weights=log_weights))
+
+            return ParticleArrayStateUpdate(
+                new_state.state_vectors, hypothesis,
+                log_weights=new_state.log_weights,
+                timestamp=hypothesis.measurement.timestamp)
+
+        likelihoods = measurement_model.pdf(
+            hypothesis.measurement.state_vector,
+            np.hstack([particle.state_vector
+                       for particle in hypothesis.prediction.particles]),
+            **kwargs)
+        if not isinstance(likelihoods, np.ndarray):
+            likelihoods = [likelihoods]  # Single particle
+        for particle, likelihood in zip(
+                hypothesis.prediction.particles, likelihoods):
+            particle.weight *= likelihood
 
         # Normalise the weights
         sum_w = Probability.sum(
@@ -57,21 +92,55 @@ class ParticleUpdater(Updater):
                                    hypothesis,
                                    timestamp=hypothesis.measurement.timestamp)
 
-    @lru_cache()
+    @prediction_cache()
     def predict_measurement(self, state_prediction, measurement_model=None,
                             **kwargs):
 
         if measurement_model is None:
             measurement_model = self.measurement_model
 
-        new_particles = []
-        for particle in state_prediction.particles:
-            new_state_vector = measurement_model.function(
-                particle.state_vector, noise=0, **kwargs)
-            new_particles.append(
-                Particle(new_state_vector,
-                         weight=particle.weight,
-                         parent=particle.parent))
+        if isinstance(state_prediction, ParticleArrayState):
+            return ParticleArrayMeasurementPrediction(
+                self._measurement_state_vectors(
+                    measurement_model, state_prediction.state_vectors,
+                    **kwargs),
+                log_weights=state_prediction.log_weights,
+                timestamp=state_prediction.timestamp)
+
+        new_state_vectors = self._measurement_state_vectors(
+            measurement_model,
+            np.hstack([particle.state_vector
+                       for particle in state_prediction.particles]),
+            **kwargs)
+        new_particles = [
+            Particle(StateVector(new_state_vectors[:, index:index+1]),
+                     weight=particle.weight,
+                     parent=particle.parent)
+            for index, particle in enumerate(state_prediction.particles)]
 
         return ParticleMeasurementPrediction(
             new_particles, timestamp=state_prediction.timestamp)
+
+    @staticmethod
+    def _measurement_state_vectors(measurement_model, state_vectors,
+                                   **kwargs):
+        """Apply measurement model, without noise, to (ndim, N) state
+        vectors"""
+        return measurement_model.function(state_vectors, noise=0, **kwargs)
+
+    @classmethod
+    def _log_likelihoods(cls, measurement_model, measurement_vector,
+                         state_vectors, **kwargs):
+        """Log likelihood of measurement for each of (ndim, N) state
+        vectors, as (N, ) array"""
+        if not isinstance(measurement_model, GaussianModel):
+            return np.atleast_1d(measurement_model.logpdf(
+                measurement_vector, state_vectors, **kwargs))
+
+        # Differences may be angles, so calculate before converting to float
+        innovations = np.asarray(
+            measurement_vector - cls._measurement_state_vectors(
+                measurement_model, state_vectors, **kwargs),
+            dtype=np.float_)
+        return np.atleast_1d(multivariate_normal.logpdf(
+            innovations.T, cov=measurement_model.covar(**kwargs)))
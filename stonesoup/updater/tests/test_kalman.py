@@ -4,13 +4,20 @@ import pytest
 import numpy as np
 
 from stonesoup.models.measurement.linear import LinearGaussian
-from stonesoup.types.detection import Detection
+from stonesoup.models.measurement.nonlinear import CartesianToBearingRange
+from stonesoup.types.detection import Detection, MissedDetection
 from stonesoup.types.hypothesis import SingleHypothesis
+from stonesoup.types.multihypothesis import MultipleHypothesis
 from stonesoup.types.prediction import (
-    GaussianStatePrediction, GaussianMeasurementPrediction)
+    GaussianStatePrediction, GaussianMeasurementPrediction,
+    SqrtGaussianStatePrediction, SqrtGaussianMeasurementPrediction,
+    InformationStatePrediction)
 from stonesoup.types.state import GaussianState
+from stonesoup.types.update import (
+    SqrtGaussianStateUpdate, InformationStateUpdate)
 from stonesoup.updater.kalman import (
-    KalmanUpdater, ExtendedKalmanUpdater, UnscentedKalmanUpdater)
+    KalmanUpdater, ExtendedKalmanUpdater, UnscentedKalmanUpdater,
+    SqrtKalmanUpdater, SqrtUnscentedKalmanUpdater, InformationKalmanUpdater)
 
 
 @pytest.mark.parametrize(
@@ -109,3 +116,247 @@ def test_kalman(UpdaterClass, measurement_model, prediction, measurement):
                         measurement_prediction.covar, 0, atol=1.e-14))
     assert(np.array_equal(posterior.hypothesis.measurement, measurement))
     assert(posterior.timestamp == prediction.timestamp)
+
+
+@pytest.mark.parametrize(
+    "UpdaterClass, measurement_model",
+    [
+        (   # Standard Kalman
+            KalmanUpdater,
+            LinearGaussian(ndim_state=2, mapping=[0],
+                           noise_covar=np.array([[0.04]]))
+        ),
+        (   # Extended Kalman
+            ExtendedKalmanUpdater,
+            LinearGaussian(ndim_state=2, mapping=[0],
+                           noise_covar=np.array([[0.04]]))
+        ),
+        (   # Extended Kalman, non-linear
+            ExtendedKalmanUpdater,
+            CartesianToBearingRange(ndim_state=2, mapping=[0, 1],
+                                    noise_covar=np.diag([0.001, 0.1]))
+        ),
+        (   # Unscented Kalman
+            UnscentedKalmanUpdater,
+            LinearGaussian(ndim_state=2, mapping=[0],
+                           noise_covar=np.array([[0.04]]))
+        )
+    ],
+    ids=["standard", "extended", "extended_nonlinear", "unscented"]
+)
+def test_kalman_batch(UpdaterClass, measurement_model):
+    updater = UpdaterClass(measurement_model=measurement_model)
+
+    hypotheses = []
+    for i in range(5):
+        prediction = GaussianStatePrediction(
+            np.array([[-6.45 + i], [0.7 + i]]),
+            np.array([[4.1123, 0.0013],
+                      [0.0013, 0.0365]]) * (i + 1))
+        measurement = Detection(measurement_model.function(
+            np.array([[-6.23 + i], [0.5 + i]]), noise=0))
+        hypotheses.append(SingleHypothesis(prediction, measurement))
+    # Existing measurement prediction should be used
+    hypotheses[0].measurement_prediction = updater.predict_measurement(
+        hypotheses[0].prediction)
+
+    posteriors = updater.update_batch(hypotheses)
+
+    assert len(posteriors) == len(hypotheses)
+    for hypothesis, posterior in zip(hypotheses, posteriors):
+        eval_posterior = updater.update(SingleHypothesis(
+            hypothesis.prediction, hypothesis.measurement))
+        # Non-linear models may return angle types, so compare as floats
+        assert np.allclose(posterior.mean.astype(float),
+                           eval_posterior.mean.astype(float), 0, atol=1.e-10)
+        assert np.allclose(posterior.covar.astype(float),
+                           eval_posterior.covar.astype(float), 0, atol=1.e-10)
+        assert posterior.hypothesis is hypothesis
+        assert hypothesis.measurement_prediction is not None
+
+    assert updater.update_batch([]) == []
+
+    measurement_predictions = updater.predict_measurement_batch(
+        [hypothesis.prediction for hypothesis in hypotheses])
+    for hypothesis, measurement_prediction in zip(
+            hypotheses, measurement_predictions):
+        eval_measurement_prediction = updater.predict_measurement(
+            hypothesis.prediction)
+        assert np.allclose(measurement_prediction.mean.astype(float),
+                           eval_measurement_prediction.mean.astype(float),
+                           0, atol=1.e-10)
+        assert np.allclose(measurement_prediction.covar,
+                           eval_measurement_prediction.covar, 0, atol=1.e-10)
+        assert np.allclose(measurement_prediction.cross_covar,
+                           eval_measurement_prediction.cross_covar,
+                           0, atol=1.e-10)
+
+
+def test_kalman_batch_mixed_dimensions():
+    updater = KalmanUpdater()
+    prediction = GaussianStatePrediction(np.array([[-6.45], [0.7]]),
+                                         np.array([[4.1123, 0.0013],
+                                                   [0.0013, 0.0365]]))
+    hypotheses = [
+        SingleHypothesis(prediction, Detection(
+            np.array([[-6.23]]),
+            measurement_model=LinearGaussian(
+                ndim_state=2, mapping=[0], noise_covar=np.array([[0.04]])))),
+        SingleHypothesis(prediction, Detection(
+            np.array([[-6.23], [0.5]]),
+            measurement_model=LinearGaussian(
+                ndim_state=2, mapping=[0, 1], noise_covar=np.eye(2)*0.04)))]
+
+    with pytest.raises(ValueError):
+        updater.update_batch(hypotheses)
+
+
+@pytest.mark.parametrize(
+    "UpdaterClass, SqrtUpdaterClass, measurement_model",
+    [
+        (   # Standard Kalman
+            KalmanUpdater, SqrtKalmanUpdater,
+            LinearGaussian(ndim_state=2, mapping=[0],
+                           noise_covar=np.array([[0.04]]))
+        ),
+        (   # Unscented Kalman
+            UnscentedKalmanUpdater, SqrtUnscentedKalmanUpdater,
+            LinearGaussian(ndim_state=2, mapping=[0],
+                           noise_covar=np.array([[0.04]]))
+        ),
+        (   # Unscented Kalman, non-linear
+            UnscentedKalmanUpdater, SqrtUnscentedKalmanUpdater,
+            CartesianToBearingRange(ndim_state=2, mapping=[0, 1],
+                                    noise_covar=np.diag([0.001, 0.1]))
+        )
+    ],
+    ids=["standard", "unscented", "unscented_nonlinear"]
+)
+def test_sqrt_kalman(UpdaterClass, SqrtUpdaterClass, measurement_model):
+    updater = UpdaterClass(measurement_model=measurement_model)
+    sqrt_updater = SqrtUpdaterClass(measurement_model=measurement_model)
+
+    prediction_mean = np.array([[-6.45], [0.7]])
+    prediction_covar = np.array([[4.1123, 0.0013],
+                                 [0.0013, 0.0365]])
+    prediction = GaussianStatePrediction(prediction_mean, prediction_covar)
+    sqrt_prediction = SqrtGaussianStatePrediction(
+        prediction_mean, np.linalg.cholesky(prediction_covar))
+    measurement = Detection(measurement_model.function(
+        np.array([[-6.23], [0.5]]), noise=0))
+
+    eval_measurement_prediction = updater.predict_measurement(prediction)
+    eval_posterior = updater.update(SingleHypothesis(
+        prediction, measurement))
+
+    for prediction_ in (prediction, sqrt_prediction):
+        measurement_prediction = sqrt_updater.predict_measurement(
+            prediction_)
+        assert isinstance(measurement_prediction,
+                          SqrtGaussianMeasurementPrediction)
+        assert np.allclose(measurement_prediction.mean.astype(float),
+                           eval_measurement_prediction.mean.astype(float),
+                           0, atol=1.e-10)
+        assert np.allclose(measurement_prediction.covar,
+                           eval_measurement_prediction.covar, 0, atol=1.e-10)
+        assert np.allclose(measurement_prediction.cross_covar,
+                           eval_measurement_prediction.cross_covar,
+                           0, atol=1.e-10)
+
+        # With and without measurement prediction
+        for hypothesis in (
+                SingleHypothesis(prediction_, measurement),
+                SingleHypothesis(prediction_, measurement,
+                                 measurement_prediction)):
+            posterior = sqrt_updater.update(hypothesis)
+            assert isinstance(posterior, SqrtGaussianStateUpdate)
+            assert np.allclose(posterior.sqrt_covar,
+                               np.tril(posterior.sqrt_covar))
+            assert np.allclose(posterior.mean.astype(float),
+                               eval_posterior.mean.astype(float),
+                               0, atol=1.e-10)
+            assert np.allclose(posterior.covar, eval_posterior.covar,
+                               0, atol=1.e-10)
+            assert posterior.hypothesis is hypothesis
+            assert hypothesis.measurement_prediction is not None
+
+    posteriors = sqrt_updater.update_batch(
+        [SingleHypothesis(sqrt_prediction, measurement)])
+    assert isinstance(posteriors[0], SqrtGaussianStateUpdate)
+
+
+def test_information_kalman():
+    info_updater = InformationKalmanUpdater()
+
+    prediction_mean = np.array([[-6.45], [0.7], [1.2], [-0.3]])
+    prediction_covar = np.diag([4.1123, 0.0365, 3.5, 0.04])
+    prediction_covar[0, 1] = prediction_covar[1, 0] = 0.0013
+    prediction = GaussianStatePrediction(prediction_mean, prediction_covar)
+    prediction_precision = np.linalg.inv(prediction_covar)
+    info_prediction = InformationStatePrediction(
+        prediction_precision @ prediction_mean, prediction_precision)
+
+    # Measurements of a target from multiple sensors
+    measurement_models = [
+        LinearGaussian(ndim_state=4, mapping=[0, 2],
+                       noise_covar=np.diag([0.04, 0.09])),
+        LinearGaussian(ndim_state=4, mapping=[0],
+                       noise_covar=np.array([[0.01]])),
+        LinearGaussian(ndim_state=4, mapping=[0, 1, 2, 3],
+                       noise_covar=np.diag([0.5, 0.1, 0.5, 0.1])),
+    ]
+    measurements = [
+        Detection(measurement_model.function(
+            np.array([[-6.23], [0.5], [1.], [-0.2]]), noise=0),
+            measurement_model=measurement_model)
+        for measurement_model in measurement_models]
+
+    # Single measurement matches Kalman update
+    updater = KalmanUpdater(measurement_model=measurement_models[0])
+    eval_posterior = updater.update(
+        SingleHypothesis(prediction, measurements[0]))
+    for prediction_ in (prediction, info_prediction):
+        posterior = info_updater.update(
+            SingleHypothesis(prediction_, measurements[0]))
+        assert isinstance(posterior, InformationStateUpdate)
+        assert np.allclose(posterior.mean, eval_posterior.mean,
+                           0, atol=1.e-10)
+        assert np.allclose(posterior.covar, eval_posterior.covar,
+                           0, atol=1.e-10)
+
+        measurement_prediction = info_updater.predict_measurement(
+            prediction_, measurement_model=measurement_models[0])
+        eval_measurement_prediction = updater.predict_measurement(
+            prediction)
+        assert np.allclose(measurement_prediction.mean,
+                           eval_measurement_prediction.mean, 0, atol=1.e-10)
+        assert np.allclose(measurement_prediction.covar,
+                           eval_measurement_prediction.covar, 0, atol=1.e-10)
+
+    # Fused measurements match sequential Kalman updates
+    eval_posterior = prediction
+    for measurement in measurements:
+        updater = KalmanUpdater(
+            measurement_model=measurement.measurement_model)
+        eval_posterior = updater.update(SingleHypothesis(
+            GaussianStatePrediction(eval_posterior.state_vector,
+                                    eval_posterior.covar),
+            measurement))
+    hypothesis = MultipleHypothesis(
+        [SingleHypothesis(info_prediction, measurement)
+         for measurement in measurements]
+        + [SingleHypothesis(info_prediction, MissedDetection())])
+    posterior = info_updater.update(hypothesis)
+    assert posterior.hypothesis is hypothesis
+    gaussian_posterior = posterior.gaussian_state
+    assert np.allclose(gaussian_posterior.mean, eval_posterior.mean,
+                       0, atol=1.e-10)
+    assert np.allclose(gaussian_posterior.covar, eval_posterior.covar,
+                       0, atol=1.e-10)
+
+    with pytest.raises(ValueError):
+        info_updater.update(MultipleHypothesis([
+            SingleHypothesis(info_prediction, measurements[0]),
+            SingleHypothesis(prediction, measurements[1])]))
+    with pytest.raises(ValueError):
+        info_updater.update(MultipleHypothesis([]))
@@ -9,7 +9,9 @@ from ...types.detection import Detection
 from ...types.hypothesis import SingleHypothesis
 from ...types.particle import Particle
 from ...types.prediction import (
-    ParticleStatePrediction, ParticleMeasurementPrediction)
+    ParticleStatePrediction, ParticleMeasurementPrediction,
+    ParticleArrayStatePrediction, ParticleArrayMeasurementPrediction)
+from ...types.update import ParticleArrayStateUpdate
 from ...updater.particle import ParticleUpdater
 
 
@@ -70,3 +72,41 @@ def test_particle():
     assert updated_state.hypothesis.measurement == measurement
     assert np.all(
         np.isclose(updated_state.state_vector, np.array([[20], [20]])))
+
+
+def test_particle_array():
+    lg = LinearGaussian(ndim_state=2, mapping=[0],
+                        noise_covar=np.array([[0.04]]))
+    timestamp = datetime.datetime.now()
+    state_vectors = np.array([[10, 10, 10, 20, 20, 20, 30, 30, 30],
+                              [10, 20, 30, 10, 20, 30, 10, 20, 30]])
+    prediction = ParticleArrayStatePrediction(
+        state_vectors, timestamp=timestamp)
+    measurement = Detection(np.array([[20]]), timestamp=timestamp)
+    updater = ParticleUpdater(lg, SystematicResampler())
+
+    measurement_prediction = updater.predict_measurement(prediction)
+    assert isinstance(measurement_prediction,
+                      ParticleArrayMeasurementPrediction)
+    assert np.array_equal(measurement_prediction.state_vectors,
+                          state_vectors[:1])
+    assert measurement_prediction.timestamp == timestamp
+
+    # Log likelihoods match those of non-array particles
+    log_likelihoods = updater._log_likelihoods(
+        lg, measurement.state_vector, state_vectors)
+    assert np.allclose(
+        log_likelihoods,
+        [lg.pdf(measurement.state_vector, state_vector[:, np.newaxis]
+                ).log_value
+         for state_vector in state_vectors.T])
+
+    updated_state = updater.update(SingleHypothesis(
+        prediction, measurement, measurement_prediction))
+    assert isinstance(updated_state, ParticleArrayStateUpdate)
+    assert updated_state.timestamp == timestamp
+    assert updated_state.hypothesis.prediction is prediction
+    assert np.allclose(updated_state.weights, 1/9)
+    assert np.allclose(updated_state.state_vector, np.array([[20], [20]]))
+    # Prediction unchanged
+    assert np.allclose(prediction.weights, 1/9)